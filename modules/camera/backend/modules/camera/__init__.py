@@ -0,0 +1 @@
+default_app_config = "modules.camera.apps.CameraConfig"
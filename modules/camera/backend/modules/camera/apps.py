@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class CameraConfig(AppConfig):
+    name = "modules.camera"
+    verbose_name = "Camera"
+
+    def ready(self):
+        if self.apps.is_installed("modules.image_derivatives"):
+            from modules.image_derivatives.pipeline import register
+            from .models import Image
+
+            register(Image, "image")
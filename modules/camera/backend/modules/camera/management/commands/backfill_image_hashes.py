@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Image
+from ...utils import hash_file
+
+
+class Command(BaseCommand):
+    help = "Computes the content hash of images uploaded before deduplication"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of images updated per query",
+        )
+        parser.add_argument(
+            "--delete-duplicates",
+            action="store_true",
+            help="Delete images whose owner already has another image with the same content",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        seen = set(
+            Image.objects.exclude(content_hash=None).values_list(
+                "owner_id", "content_hash"
+            )
+        )
+        hashed, duplicates, missing = 0, [], 0
+        batch = []
+
+        images = Image.objects.filter(content_hash=None).only("id", "owner", "image")
+        for image in images.order_by("id").iterator(chunk_size=batch_size):
+            try:
+                with image.image.open("rb") as file:
+                    content_hash = hash_file(file)
+            except (OSError, ValueError):
+                missing += 1
+                self.stderr.write("Image %s: file not found" % image.pk)
+                continue
+            if (image.owner_id, content_hash) in seen:
+                duplicates.append(image)
+                continue
+            seen.add((image.owner_id, content_hash))
+            image.content_hash = content_hash
+            batch.append(image)
+            if len(batch) >= batch_size:
+                Image.objects.bulk_update(batch, ["content_hash"])
+                hashed += len(batch)
+                batch = []
+        Image.objects.bulk_update(batch, ["content_hash"])
+        hashed += len(batch)
+
+        self.stdout.write("Hashed %d images, %d missing files" % (hashed, missing))
+        if not duplicates:
+            return
+        if options["delete_duplicates"]:
+            for image in duplicates:
+                name = image.image.name
+                image.delete()
+                if not Image.objects.filter(image=name).exists():
+                    image.image.storage.delete(name)
+            self.stdout.write("Deleted %d duplicate images" % len(duplicates))
+        else:
+            self.stdout.write(
+                "%d images duplicate another image of the same owner and were left "
+                "unhashed: %s. Run again with --delete-duplicates to remove them."
+                % (len(duplicates), ", ".join(str(image.pk) for image in duplicates))
+            )
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('camera', '0003_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='owner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='camera_images', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='image',
+            constraint=models.UniqueConstraint(fields=('owner', 'content_hash'), name='camera_image_owner_hash_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='camera_image_owner_created_idx'),
+        ),
+    ]
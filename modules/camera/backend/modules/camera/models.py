@@ -1,9 +1,67 @@
+import os
+import uuid
+
 from django.db import models
 from django.conf import settings
+from .options import get_upload_temp_dir
 
 class Image(models.Model):
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="camera_images",
+        null=True,
+        blank=True,
+    )
     image = models.ImageField(upload_to='static/img/')
+    # SHA-256 of the file; identical uploads share a single blob, and a user
+    # uploading the same bytes again gets their existing row back.
+    content_hash = models.CharField(max_length=64, null=True, blank=True, editable=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "content_hash"], name="camera_image_owner_hash_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["owner", "-created_at", "-id"], name="camera_image_owner_created_idx"),
+        ]
+
+    def __str__(self):
+        return "%s"%self.id
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload in progress. Received bytes are appended to a file in
+    the upload temp dir until `offset` reaches `size`.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Sessions started before owners were recorded have none; no one can
+    # resume them, and expire_upload_sessions removes them.
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="camera_upload_sessions",
+        null=True,
+        blank=True,
+    )
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    @property
+    def path(self):
+        return os.path.join(get_upload_temp_dir(), "%s.part" % self.id)
+
+    def delete(self, *args, **kwargs):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        return super().delete(*args, **kwargs)
+
     def __str__(self):
-        return "%s"%self.id
\ No newline at end of file
+        return "%s"%self.id
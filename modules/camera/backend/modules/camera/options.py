@@ -0,0 +1,17 @@
+import os
+import tempfile
+
+from django.conf import settings
+
+# Photo list
+IMAGE_PAGE_SIZE = 30
+
+# Resumable uploads
+UPLOAD_SESSION_TTL = 24 * 60 * 60  # seconds
+UPLOAD_MAX_SIZE = 50 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def get_upload_temp_dir():
+    base = getattr(settings, "FILE_UPLOAD_TEMP_DIR", None) or tempfile.gettempdir()
+    return os.path.join(base, "camera_uploads")
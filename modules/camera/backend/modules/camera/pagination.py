@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+from .options import IMAGE_PAGE_SIZE
+
+
+class ImageCursorPagination(CursorPagination):
+    """
+    Newest photos first. Served by the (owner, created_at, id) index, so every
+    page costs the same no matter how many photos exist.
+    """
+    ordering = ("-created_at", "-id")
+    page_size = IMAGE_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -1,8 +1,33 @@
-from .models import Image
+import os
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from .models import Image, UploadSession
+from .options import UPLOAD_MAX_SIZE
+from .utils import hash_file
 from rest_framework import serializers
 
 
-class ImageSerializer(serializers.HyperlinkedModelSerializer):
+class ImageVariantsMixin:
+    """
+    Adds ``image_variants``, the resized versions of ``image``, after it when
+    the Image Derivatives module is installed.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if apps.is_installed("modules.image_derivatives"):
+            from modules.image_derivatives.fields import ImageVariantsField
+
+            items = list(fields.items())
+            position = list(fields).index("image") + 1
+            variants = ImageVariantsField(source="image")
+            items.insert(position, ("image_variants", variants))
+            fields = dict(items)
+        return fields
+
+
+class ImageSerializer(ImageVariantsMixin, serializers.HyperlinkedModelSerializer):
     image = serializers.SerializerMethodField()
 
     def get_image(self, obj):
@@ -19,6 +44,51 @@ class ImageSerializer(serializers.HyperlinkedModelSerializer):
 class ImageUploadSerializer(serializers.ModelSerializer):
     image = serializers.ImageField()
 
+    def create(self, validated_data):
+        """
+        Stores the upload under its content hash. When the owner uploaded the
+        same bytes before, their existing image is returned. When someone else
+        did, the stored blob is reused and nothing is written.
+        """
+        upload = validated_data["image"]
+        owner = validated_data.get("owner")
+        content_hash = hash_file(upload)
+        stored = Image.objects.filter(content_hash=content_hash)
+        existing = stored.filter(owner=owner).first()
+        if existing is not None:
+            return existing
+
+        blob = stored.values_list("image", flat=True).first()
+        if blob:
+            validated_data["image"] = blob
+        else:
+            upload.name = content_hash + os.path.splitext(upload.name)[1].lower()
+        image = Image(content_hash=content_hash, **validated_data)
+        try:
+            with transaction.atomic():
+                image.save()
+        except IntegrityError:
+            # The same file was uploaded concurrently and won the race.
+            if not blob:
+                image.image.delete(save=False)
+            return Image.objects.get(owner=owner, content_hash=content_hash)
+        return image
+
     class Meta:
         model = Image
         fields = ("image",)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(min_value=1, max_value=UPLOAD_MAX_SIZE)
+
+    class Meta:
+        model = UploadSession
+        fields = (
+            "id",
+            "filename",
+            "size",
+            "offset",
+            "expires_at",
+        )
+        read_only_fields = ("id", "offset", "expires_at")
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from ..models import Image
+
+# Queries of each request, authentication included. They must not depend on
+# the number of rows.
+LIST_BUDGET = 3
+DETAIL_BUDGET = 3
+
+
+@override_settings(ROOT_URLCONF="modules.camera.urls")
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("budget")
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Token %s" % self.token.key)
+
+    def create(self, rows):
+        # Adds images up to ``rows``, returns the pk of the last one.
+        for i in range(Image.objects.count(), rows):
+            Image.objects.create(owner=self.user, image="static/img/%d.png" % i)
+        return Image.objects.latest("pk").pk
+
+    def assertBudget(self, url, budget):
+        # Cached responses are measured at their cost on a miss.
+        for cache in caches.all():
+            cache.clear()
+        with self.assertNumQueries(budget):
+            response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_list(self):
+        for rows in (1, 20):
+            with self.subTest(rows=rows):
+                self.create(rows)
+                self.assertBudget("/photos/user/", LIST_BUDGET)
+
+    def test_detail(self):
+        for rows in (1, 20):
+            with self.subTest(rows=rows):
+                pk = self.create(rows)
+                self.assertBudget("/photos/user/%s/" % pk, DETAIL_BUDGET)
@@ -0,0 +1,175 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image as PILImage
+from rest_framework.test import APIClient
+
+from ..models import Image, UploadSession
+
+
+def png():
+    output = io.BytesIO()
+    PILImage.new("RGB", (64, 48), "red").save(output, format="PNG")
+    return output.getvalue()
+
+
+@override_settings(ROOT_URLCONF="modules.camera.urls")
+class UploadTestCase(TestCase):
+    def setUp(self):
+        # Local filesystem storage and upload temp dir, removed afterwards.
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings = override_settings(
+            MEDIA_ROOT=directory, FILE_UPLOAD_TEMP_DIR=directory
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.user = get_user_model().objects.create_user("owner")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.image = png()
+
+
+class ImageUploadTests(UploadTestCase):
+    def post(self, client):
+        return client.post(
+            "/upload_image/",
+            {"image": SimpleUploadedFile("photo.png", self.image)},
+            format="multipart",
+        )
+
+    def test_upload_is_owned_by_the_user(self):
+        self.assertEqual(self.post(self.client).status_code, 201)
+        self.assertEqual(Image.objects.get().owner, self.user)
+
+    def test_requires_authentication(self):
+        self.assertEqual(self.post(APIClient()).status_code, 401)
+        self.assertFalse(Image.objects.exists())
+
+
+class UploadSessionTests(UploadTestCase):
+    def start(self, size=None):
+        response = self.client.post(
+            "/upload_image/sessions/",
+            {"filename": "photo.png", "size": size or len(self.image)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def put(self, session, data, offset):
+        return self.client.put(
+            "/upload_image/sessions/%s/" % session,
+            data,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def finalize(self, session):
+        return self.client.post("/upload_image/sessions/%s/finalize/" % session)
+
+    def upload(self):
+        session = self.start()
+        half = len(self.image) // 2
+        self.assertEqual(self.put(session, self.image[:half], 0).data["offset"], half)
+        response = self.put(session, self.image[half:], half)
+        self.assertEqual(response.data["offset"], len(self.image))
+        return session
+
+    def test_resumes_from_the_stored_offset(self):
+        session = self.start()
+        self.put(session, self.image[:100], 0)
+        response = self.client.get("/upload_image/sessions/%s/" % session)
+        self.assertEqual(response.data["offset"], 100)
+
+    def test_offset_mismatch(self):
+        session = self.start()
+        self.put(session, self.image[:100], 0)
+        response = self.put(session, self.image[50:], 50)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["offset"], 100)
+
+    def test_chunk_past_the_announced_size(self):
+        session = self.start(size=10)
+        response = self.put(session, self.image[:20], 0)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.data["offset"], 0)
+        self.assertEqual(os.path.getsize(UploadSession.objects.get().path), 0)
+
+    def test_finalize_incomplete_upload(self):
+        session = self.start()
+        self.put(session, self.image[:100], 0)
+        response = self.finalize(session)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Image.objects.exists())
+
+    def test_finalize_creates_the_image(self):
+        session = self.upload()
+        part = UploadSession.objects.get().path
+        response = self.finalize(session)
+        self.assertEqual(response.status_code, 201)
+        image = Image.objects.get()
+        self.assertEqual(image.owner, self.user)
+        with image.image.open("rb") as stored:
+            self.assertEqual(stored.read(), self.image)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(part))
+
+    def test_finalize_twice(self):
+        session = self.upload()
+        self.assertEqual(self.finalize(session).status_code, 201)
+        self.assertEqual(self.finalize(session).status_code, 404)
+        self.assertEqual(Image.objects.count(), 1)
+
+    def test_finalize_after_the_part_was_consumed(self):
+        # What a finalize that waited on the lock of one that won sees when
+        # the database doesn't lock rows.
+        session = self.upload()
+        os.remove(UploadSession.objects.get().path)
+        self.assertEqual(self.finalize(session).status_code, 404)
+        self.assertFalse(Image.objects.exists())
+
+    def test_sessions_of_other_users_are_not_found(self):
+        session = self.upload()
+        other = APIClient()
+        other.force_authenticate(get_user_model().objects.create_user("other"))
+        url = "/upload_image/sessions/%s/" % session
+        self.assertEqual(other.get(url).status_code, 404)
+        response = other.put(
+            url,
+            b"",
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(len(self.image)),
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(other.post(url + "finalize/").status_code, 404)
+        self.assertEqual(other.delete(url).status_code, 404)
+        self.assertEqual(self.finalize(session).status_code, 201)
+        self.assertEqual(Image.objects.get().owner, self.user)
+
+    def test_requires_authentication(self):
+        session = self.start()
+        anonymous = APIClient()
+        response = anonymous.post(
+            "/upload_image/sessions/",
+            {"filename": "photo.png", "size": len(self.image)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 401)
+        url = "/upload_image/sessions/%s/" % session
+        self.assertEqual(anonymous.post(url + "finalize/").status_code, 401)
+        self.assertEqual(UploadSession.objects.get().owner, self.user)
+
+    def test_expired_session(self):
+        session = self.upload()
+        UploadSession.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.put(session, b"", len(self.image)).status_code, 404)
+        self.assertEqual(self.finalize(session).status_code, 404)
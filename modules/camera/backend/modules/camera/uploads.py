@@ -0,0 +1,49 @@
+import os
+
+from django.core.files.uploadedfile import UploadedFile
+
+from .options import UPLOAD_CHUNK_SIZE, get_upload_temp_dir
+
+
+class ChunkTooLarge(Exception):
+    pass
+
+
+class SessionFile(UploadedFile):
+    """
+    The assembled file of an upload session. Exposes its path like Django's
+    TemporaryUploadedFile, so validation and filesystem storage read or move it
+    in place instead of copying it into memory.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def create_part(session):
+    os.makedirs(get_upload_temp_dir(), exist_ok=True)
+    open(session.path, "wb").close()
+
+
+def append_chunk(session, stream):
+    """
+    Copies ``stream`` to the session file at ``session.offset``, one
+    ``UPLOAD_CHUNK_SIZE`` block at a time, and returns the number of bytes
+    written. Raises ChunkTooLarge when the stream goes past ``session.size``.
+    """
+    written = 0
+    remaining = session.size - session.offset
+    with open(session.path, "r+b") as part:
+        # Drop whatever a previously interrupted request left past the offset.
+        part.seek(session.offset)
+        part.truncate()
+        while True:
+            block = stream.read(UPLOAD_CHUNK_SIZE)
+            if not block:
+                break
+            written += len(block)
+            if written > remaining:
+                part.truncate(session.offset)
+                raise ChunkTooLarge()
+            part.write(block)
+    return written
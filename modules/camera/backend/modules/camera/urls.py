@@ -2,11 +2,12 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from .viewsets import ImageViewSet, ImageUploadView
+from .viewsets import ImageViewSet, ImageUploadView, UploadSessionViewSet
 
 
 router = routers.DefaultRouter()
 router.register(r'photos/user', ImageViewSet)
+router.register(r'upload_image/sessions', UploadSessionViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('upload_image/', ImageUploadView.as_view()),
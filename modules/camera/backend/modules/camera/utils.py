@@ -0,0 +1,13 @@
+import hashlib
+
+
+def hash_file(file, chunk_size=64 * 1024):
+    """
+    Returns the SHA-256 hex digest of a Django File, reading it in chunks so
+    large uploads are never held in memory at once.
+    """
+    digest = hashlib.sha256()
+    for chunk in file.chunks(chunk_size):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
@@ -1,30 +1,146 @@
-from .models import Image
-from .serializers import ImageSerializer, ImageUploadSerializer
-from rest_framework import viewsets
+from datetime import timedelta
+
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from .models import Image, UploadSession
+from .options import UPLOAD_SESSION_TTL
+from .pagination import ImageCursorPagination
+from .serializers import ImageSerializer, ImageUploadSerializer, UploadSessionSerializer
+from .uploads import ChunkTooLarge, SessionFile, append_chunk, create_part
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.parsers import FileUploadParser
 from rest_framework.views import APIView
 from rest_framework import permissions, status
 from rest_framework.response import Response
 
+
 class ImageViewSet(viewsets.ModelViewSet):
     """
-    A simple ViewSet for viewing and editing accounts.
+    Lists the photos uploaded by the requesting user, newest first.
     """
     queryset = Image.objects.all()
     serializer_class = ImageSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ImageCursorPagination
     http_method_names = ["get"]
 
+    def get_queryset(self):
+        return super().get_queryset().filter(owner=self.request.user)
+
 
 class ImageUploadView(APIView):
 	parser_class = (FileUploadParser,)
+	permission_classes = [permissions.IsAuthenticated]
 	
 	def post(self, request, *args, **kwargs):
 		image_serializer = ImageUploadSerializer(data=request.data, partial=True)
 		try:
 			if image_serializer.is_valid(raise_exception=True):
-				image_serializer.save()
+				image_serializer.save(owner=request.user)
 				return Response(image_serializer.data, status=status.HTTP_201_CREATED)
 			else:
 				return Response(image_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 		except Exception as e:
 			return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+
+
+class UploadSessionViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Resumable uploads for flaky connections:
+
+    1. POST {"filename", "size"} to start a session.
+    2. PUT raw bytes to the session with an `Upload-Offset` header, as many
+       times as needed. After an interruption, GET the session to find the
+       offset to resume from.
+    3. POST to `finalize/` once every byte is sent to create the image.
+    """
+    queryset = UploadSession.objects.all()
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        # Other users' sessions are not found, whoever knows their id.
+        return (
+            super()
+            .get_queryset()
+            .filter(owner=self.request.user, expires_at__gt=timezone.now())
+        )
+
+    def perform_create(self, serializer):
+        session = serializer.save(
+            owner=self.request.user,
+            expires_at=timezone.now() + timedelta(seconds=UPLOAD_SESSION_TTL),
+        )
+        create_part(session)
+
+    def update(self, request, *args, **kwargs):
+        try:
+            offset = int(request.headers["Upload-Offset"])
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "A numeric Upload-Offset header is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # The row stays locked while the chunk is written, so that concurrent
+        # requests for the same session cannot interleave.
+        with transaction.atomic():
+            session = get_object_or_404(
+                self.get_queryset().select_for_update(), pk=kwargs["pk"]
+            )
+            if offset != session.offset:
+                return Response(
+                    {"detail": "Offset mismatch.", "offset": session.offset},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            stream = request.stream
+            try:
+                written = append_chunk(session, stream) if stream else 0
+            except ChunkTooLarge:
+                return Response(
+                    {
+                        "detail": "Chunk goes past the announced size.",
+                        "offset": session.offset,
+                    },
+                    status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                )
+            session.offset += written
+            session.save(update_fields=["offset"])
+
+        return Response(self.get_serializer(session).data)
+
+    @action(detail=True, methods=["post"])
+    def finalize(self, request, *args, **kwargs):
+        # The row stays locked until the image is saved and the session
+        # deleted: a concurrent finalize then finds no session, and the image
+        # is created once.
+        with transaction.atomic():
+            session = get_object_or_404(
+                self.get_queryset().select_for_update(), pk=kwargs["pk"]
+            )
+            if session.offset != session.size:
+                return Response(
+                    {"detail": "Upload is incomplete.", "offset": session.offset},
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            try:
+                part = open(session.path, "rb")
+            except FileNotFoundError:
+                # Already moved into storage by a finalize that won the race.
+                raise NotFound()
+            with part:
+                upload = SessionFile(part, name=session.filename, size=session.size)
+                image_serializer = ImageUploadSerializer(data={"image": upload})
+                image_serializer.is_valid(raise_exception=True)
+                image_serializer.save(owner=session.owner)
+            session.delete()
+        return Response(image_serializer.data, status=status.HTTP_201_CREATED)
@@ -3,6 +3,7 @@ import { Text, View, TouchableOpacity, FlatList, ImageBackground, } from 'react-
 import ActionSheet from 'react-native-actionsheet'
 import { pickFromCamera, pickFromGallery, uploadImage } from './utils'
 import { OptionsContext, GlobalOptionsContext } from "@options";
+import { useSelector } from "react-redux";
 
 const Camera = () => {
   // More info on all the options is below in the API Reference... just some common use cases shown here
@@ -15,17 +16,42 @@ const Camera = () => {
 
   const { styles, buttonText } = options;
 
+  // code below depends on the existence of any login module - update as needed.
+  const login = useSelector(state => {
+    return state?.login
+  })
+  const token = login?.token;
+
   const fetch_images = () => {
-    fetch(`${gOptions.url}/modules/camera/photos/user/`)
-      .then((response) => response.json())
-      .then((json) => setData(json))
+    if (!token) {
+      setData([]);
+      return;
+    }
+    setLoading(true);
+    fetch(`${gOptions.url}/modules/camera/photos/user/`, {
+      headers: { Authorization: `Token ${token}` }
+    })
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Could not load photos: ${response.status}`);
+        }
+        return response.json();
+      })
+      .then((json) => setData(json.results))
       .catch((error) => console.log(error))
       .finally(() => setLoading(false));
   }
 
+  const upload = (res) => {
+    // Photos are saved to the signed in user, so there is nothing to do without one.
+    res && token && uploadImage(res, gOptions, token).then(() => {
+      fetch_images()
+    })
+  }
+
   useEffect(() => {
     fetch_images()
-  }, []);
+  }, [token]);
 
   const renderItem = ({ item }) => (
     <TouchableOpacity>
@@ -56,15 +82,11 @@ const Camera = () => {
           switch (index) {
             case 0:
               res = await pickFromCamera();
-              res && uploadImage(res, gOptions).then(() => {
-                fetch_images()
-              })
+              upload(res);
               break;
             case 1:
               res = await pickFromGallery();
-              res && uploadImage(res, gOptions).then(() => {
-                fetch_images()
-              })
+              upload(res);
               break;
           }
         }}
@@ -117,9 +117,9 @@ export const request = axios.create({
   }
 });
 
-export async function apiPost(endpoint, data) {
+export async function apiPost(endpoint, data, headers = {}) {
   try {
-    let res = await request.post(endpoint, data)
+    let res = await request.post(endpoint, data, { headers })
     if (res) {
       return res
     }
@@ -128,7 +128,7 @@ export async function apiPost(endpoint, data) {
   }
 }
 
-export const uploadImage = async (response, options) => {
+export const uploadImage = async (response, options, token) => {
   const BASE_URL = options.url;
   let data = new FormData();
   data.append("image", {
@@ -137,5 +137,7 @@ export const uploadImage = async (response, options) => {
     uri: response.path,
     data: response.data
   });
-  let res = await apiPost(BASE_URL + '/modules/camera/upload_image/', data);
+  let res = await apiPost(BASE_URL + '/modules/camera/upload_image/', data, {
+    Authorization: `Token ${token}`
+  });
 }
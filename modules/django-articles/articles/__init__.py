@@ -0,0 +1 @@
+default_app_config = "modules.articles.apps.ArticlesConfig"
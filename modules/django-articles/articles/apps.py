@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class ArticlesConfig(AppConfig):
+    name = "modules.articles"
+    verbose_name = "Articles"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if self.apps.is_installed("modules.image_derivatives"):
+            from modules.image_derivatives.pipeline import register
+            from .models import Article
+
+            register(Article, "image")
@@ -0,0 +1,190 @@
+"""
+Bulk import of articles from JSON lines, one article per line:
+
+    {"title": "...", "body": "...", "author": 1, "image": "data:image/png;base64,..."}
+
+Lines are read as they come, ``ARTICLE_IMPORT_BATCH_SIZE`` at a time. Each
+batch is validated at once (one query for all of its authors), its images are
+decoded and stored by a pool of ``ARTICLE_IMPORT_IMAGE_WORKERS`` threads, and
+its valid articles are inserted with a single ``bulk_create``. A result is
+yielded per line, so neither the input nor the report is ever held in memory
+whole.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from .models import Article
+from .options import ARTICLE_IMPORT_BATCH_SIZE, ARTICLE_IMPORT_IMAGE_WORKERS
+from .search import get_search_backend
+from .serializers import Base64ImageField
+
+
+class ArticleImportSerializer(serializers.Serializer):
+    """
+    Validates the fields of imported rows. ``author`` is a plain id here; the
+    authors of a whole batch are checked with one query instead of one each.
+    """
+
+    title = serializers.CharField(
+        max_length=Article._meta.get_field("title").max_length
+    )
+    body = serializers.CharField(allow_blank=True)
+    author = serializers.IntegerField(required=False)
+    image = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+
+
+def _lines(stream):
+    """
+    Yields (line number, text) for the non-blank lines of ``stream``, text or
+    bytes.
+    """
+    for number, line in enumerate(stream, 1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if line.strip():
+            yield number, line
+
+
+def _parse(number, line):
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        return None, {"line": number, "errors": {"non_field_errors": [str(e)]}}
+    if not isinstance(data, dict):
+        error = "Expected a JSON object."
+        return None, {"line": number, "errors": {"non_field_errors": [error]}}
+    return data, None
+
+
+def _store_image(field, data):
+    """
+    Decodes and validates a base64 image like the API does, then stores it
+    where ``Article.image`` would. Runs in the image pool.
+    """
+    upload = field.run_validation(data)
+    image = Article._meta.get_field("image")
+    try:
+        return image.storage.save(image.generate_filename(None, upload.name), upload)
+    finally:
+        upload.close()
+
+
+def _insert(articles):
+    """
+    Inserts ``articles`` and does what their post_save signals would: index
+    them and queue their image derivatives.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        Article.objects.bulk_create(articles)
+        get_search_backend().index(articles)
+        names = [article.image.name for article in articles if article.image]
+        if names and apps.is_installed("modules.image_derivatives"):
+            from modules.image_derivatives.pipeline import enqueue
+
+            transaction.on_commit(lambda: enqueue(*names))
+    else:
+        # Without the new ids, the rows couldn't be reported or indexed.
+        for article in articles:
+            article.save()
+
+
+def import_batch(rows, executor, default_author=None):
+    """
+    Imports ``rows`` of (line number, text) and returns a result per row:
+    ``{"line": 3, "id": 12}`` or ``{"line": 4, "errors": {...}}``.
+    """
+    results = {}
+    parsed = []
+    for number, line in rows:
+        data, error = _parse(number, line)
+        if error:
+            results[number] = error
+        else:
+            parsed.append((number, data))
+
+    # One serializer validates every row, as a ListSerializer would, but
+    # without discarding the valid rows when some are invalid.
+    serializer = ArticleImportSerializer()
+    valid = []
+    for number, data in parsed:
+        try:
+            data = serializer.run_validation(data)
+        except serializers.ValidationError as e:
+            results[number] = {"line": number, "errors": e.detail}
+            continue
+        data.setdefault("author", default_author)
+        if data["author"] is None:
+            results[number] = {
+                "line": number,
+                "errors": {"author": ["This field is required."]},
+            }
+            continue
+        valid.append((number, data))
+
+    author_ids = {data["author"] for _, data in valid}
+    authors = get_user_model().objects.filter(pk__in=author_ids)
+    existing = set(authors.values_list("pk", flat=True))
+    field = Base64ImageField(max_length=None, required=False)
+    images = {
+        number: executor.submit(_store_image, field, data["image"])
+        for number, data in valid
+        if data.get("image") and data["author"] in existing
+    }
+
+    articles = []
+    for number, data in valid:
+        if data["author"] not in existing:
+            error = "Invalid pk \"%s\" - object does not exist." % data["author"]
+            results[number] = {"line": number, "errors": {"author": [error]}}
+            continue
+        image = None
+        if number in images:
+            try:
+                image = images[number].result()
+            except serializers.ValidationError as e:
+                results[number] = {"line": number, "errors": {"image": e.detail}}
+                continue
+        articles.append(
+            (
+                number,
+                Article(
+                    title=data["title"],
+                    body=data["body"],
+                    author_id=data["author"],
+                    image=image,
+                ),
+            )
+        )
+
+    with transaction.atomic():
+        _insert([article for _, article in articles])
+    for number, article in articles:
+        results[number] = {"line": number, "id": article.pk}
+    return [results[number] for number, _ in rows]
+
+
+def import_articles(
+    stream,
+    default_author=None,
+    batch_size=ARTICLE_IMPORT_BATCH_SIZE,
+    workers=ARTICLE_IMPORT_IMAGE_WORKERS,
+):
+    """
+    Imports the JSON lines of ``stream`` (a file, request or any iterable of
+    lines) and yields a result per non-blank line, in order. Rows without an
+    ``author`` get ``default_author``. Each batch is committed on its own, so
+    an interrupted import keeps the batches yielded so far.
+    """
+    lines = _lines(stream)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            rows = list(islice(lines, batch_size))
+            if not rows:
+                return
+            yield from import_batch(rows, executor, default_author)
@@ -0,0 +1,43 @@
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .options import ARTICLE_HTTP_MAX_AGE
+
+
+def get_validators(articles, *extra):
+    """
+    Returns the ETag and Last-Modified timestamp of a list of articles from
+    their ids and ``updated_at`` only, without serializing them. ``extra``
+    values (query string, pagination state) are folded into the ETag.
+    """
+    digest = hashlib.md5()
+    last_modified = None
+    for value in extra:
+        digest.update(("%s;" % value).encode("utf-8"))
+    for article in articles:
+        digest.update(
+            ("%s:%s;" % (article.pk, article.updated_at.timestamp())).encode("ascii")
+        )
+        if last_modified is None or article.updated_at > last_modified:
+            last_modified = article.updated_at
+    if last_modified is not None:
+        last_modified = timegm(last_modified.utctimetuple())
+    return quote_etag(digest.hexdigest()), last_modified
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Returns a 304 response when the client's copy is current, otherwise None.
+    """
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=ARTICLE_HTTP_MAX_AGE)
+    return response
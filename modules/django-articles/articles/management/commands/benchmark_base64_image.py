@@ -0,0 +1,114 @@
+import base64
+import io
+import os
+import resource
+import secrets
+import sys
+import time
+import tracemalloc
+
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from ...serializers import Base64ImageField
+
+
+def make_data_uri(size):
+    """
+    Returns a PNG of random noise, which does not compress, weighing about
+    ``size`` bytes, as a base64 data URI.
+    """
+    side = max(int((size / 3) ** 0.5), 1)
+    image = Image.frombytes("RGB", (side, side), os.urandom(side * side * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=0)
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return "data:image/png;base64," + encoded, buffer.tell()
+
+
+def legacy_decode(data):
+    # What Base64ImageField used to do: decode everything at once, then
+    # re-read the whole buffer to find the format.
+    header, data = data.split(";base64,")
+    decoded_file = base64.b64decode(data)
+    extension = Image.open(io.BytesIO(decoded_file)).format.lower()
+    file_name = "{0}.{1}".format(secrets.token_urlsafe(12), extension)
+    return ContentFile(decoded_file, name=file_name)
+
+
+def streaming_decode(data):
+    field = Base64ImageField(max_decoded_size=None)
+    return field.decode(data, data.index(";base64,") + len(";base64,"))
+
+
+def measure(decode, data):
+    """
+    Runs ``decode`` in a forked child so that its peak RSS is not shadowed by
+    earlier runs. Returns the seconds taken, the peak of Python allocations and
+    the growth of the peak RSS, both in bytes.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        tracemalloc.start()
+        started = time.perf_counter()
+        decode(data).close()
+        elapsed = time.perf_counter() - started
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+        scale = 1 if sys.platform == "darwin" else 1024
+        os.write(
+            write_fd,
+            "{0} {1} {2}".format(
+                elapsed, traced_peak, (rss_after - rss_before) * scale
+            ).encode("ascii"),
+        )
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        result = pipe.read()
+    os.waitpid(pid, 0)
+    elapsed, traced_peak, rss_growth = result.split()
+    return float(elapsed), int(traced_peak), int(rss_growth)
+
+
+class Command(BaseCommand):
+    help = "Compares time and peak memory of decoding base64 article images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1, 5, 20],
+            help="Image sizes to upload, in megabytes",
+        )
+
+    def handle(self, *args, **options):
+        mb = 1024 * 1024
+        self.stdout.write(
+            "{0:>8} {1:>10} {2:>10} {3:>14} {4:>14}".format(
+                "size", "decoder", "seconds", "python peak", "rss growth"
+            )
+        )
+        for size in options["sizes"]:
+            data, actual_size = make_data_uri(size * mb)
+            for name, decode in (
+                ("legacy", legacy_decode),
+                ("streaming", streaming_decode),
+            ):
+                elapsed, traced_peak, rss_growth = measure(decode, data)
+                self.stdout.write(
+                    "{0:>6.1f}MB {1:>10} {2:>10.3f} {3:>12.1f}MB {4:>12.1f}MB".format(
+                        actual_size / mb,
+                        name,
+                        elapsed,
+                        traced_peak / mb,
+                        rss_growth / mb,
+                    )
+                )
@@ -0,0 +1,65 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+
+from ...bulk_import import import_articles
+from ...options import ARTICLE_IMPORT_BATCH_SIZE, ARTICLE_IMPORT_IMAGE_WORKERS
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports articles from a JSON lines file, one article per line, and "
+        "prints a JSON line per imported line"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin")
+        parser.add_argument(
+            "--author",
+            type=int,
+            default=None,
+            help="Id of the author of the rows that don't have one",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARTICLE_IMPORT_BATCH_SIZE,
+            help="Number of rows validated and inserted at a time",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=ARTICLE_IMPORT_IMAGE_WORKERS,
+            help="Number of threads decoding and storing images",
+        )
+        parser.add_argument(
+            "--errors-only",
+            action="store_true",
+            help="Only print the lines that failed",
+        )
+
+    def handle(self, *args, **options):
+        if options["path"] == "-":
+            stream = sys.stdin
+        else:
+            stream = open(options["path"], encoding="utf-8")
+        created = failed = 0
+        with stream:
+            results = import_articles(
+                stream,
+                default_author=options["author"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+            )
+            for result in results:
+                if "errors" in result:
+                    failed += 1
+                else:
+                    created += 1
+                    if options["errors_only"]:
+                        continue
+                self.stdout.write(json.dumps(result))
+        message = "Imported %d articles, %d lines failed" % (created, failed)
+        style = self.style.WARNING if failed else self.style.SUCCESS
+        self.stderr.write(style(message))
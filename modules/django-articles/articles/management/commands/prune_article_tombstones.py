@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...models import ArticleTombstone
+from ...options import ARTICLE_TOMBSTONE_RETENTION
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the tombstones of articles deleted longer ago than the "
+        "retention; clients that last synced before then sync from scratch"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention",
+            type=int,
+            default=ARTICLE_TOMBSTONE_RETENTION,
+            help="Seconds tombstones are kept for",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options["retention"])
+        count, _ = ArticleTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write("Deleted %d article tombstones" % count)
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import Article
+from ...options import ARTICLE_SEARCH_INDEX_BATCH_SIZE
+from ...search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index of articles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARTICLE_SEARCH_INDEX_BATCH_SIZE,
+            help="Number of articles indexed per statement",
+        )
+        parser.add_argument(
+            "--no-clear",
+            action="store_true",
+            help="Upsert into the existing index instead of rebuilding it",
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        batch_size = options["batch_size"]
+        queryset = Article.objects.only("id", "title", "body").order_by("id")
+        indexed = 0
+
+        with transaction.atomic():
+            if not options["no_clear"]:
+                backend.clear()
+            batch = []
+            for article in queryset.iterator(chunk_size=batch_size):
+                batch.append(article)
+                if len(batch) >= batch_size:
+                    backend.index(batch)
+                    indexed += len(batch)
+                    batch = []
+            backend.index(batch)
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS("Indexed %d articles" % indexed))
@@ -21,3 +21,28 @@ class Article(models.Model):
     updated_at = models.DateTimeField(
         auto_now=True,
     )
+
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination in pagination.KeysetPagination.
+            models.Index(
+                fields=["-created_at", "-id"], name="article_created_id_idx"
+            ),
+            # Backs the delta sync in sync.changes_since.
+            models.Index(fields=["updated_at", "id"], name="article_updated_id_idx"),
+        ]
+
+
+class ArticleTombstone(models.Model):
+    "Records a deleted article so that syncing clients can drop it"
+    article_id = models.IntegerField()
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["deleted_at", "id"], name="article_tombstone_deleted_idx"
+            ),
+        ]
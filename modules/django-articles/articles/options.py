@@ -1 +1,37 @@
 MEDIA_UPLOAD_PATH = "mediafiles/articles/"
+
+# List endpoint
+ARTICLE_PAGE_SIZE = 20
+ARTICLE_MAX_PAGE_SIZE = 100
+ARTICLE_EXCERPT_LENGTH = 280
+
+# Delta sync endpoint
+ARTICLE_SYNC_BATCH_SIZE = 500
+# Seconds of changes re-read behind a watermark, so that an article saved by a
+# transaction that committed after a later one is still returned. Keep it
+# longer than the longest transaction writing articles.
+ARTICLE_SYNC_SAFETY_WINDOW = 60
+# Seconds tombstones of deleted articles are kept for, see the
+# prune_article_tombstones command. Clients that last synced longer ago than
+# this have to sync again from scratch.
+ARTICLE_TOMBSTONE_RETENTION = 30 * 24 * 60 * 60
+
+# Search
+# Text search configuration used for the PostgreSQL index.
+ARTICLE_SEARCH_CONFIG = "english"
+ARTICLE_SEARCH_INDEX_BATCH_SIZE = 1000
+
+# Images
+# Largest decoded size accepted by Base64ImageField, in bytes.
+ARTICLE_IMAGE_MAX_SIZE = 10 * 1024 * 1024
+
+# HTTP caching
+# How long clients and CDNs may reuse a list or detail response without
+# revalidating it.
+ARTICLE_HTTP_MAX_AGE = 60
+
+# Bulk import
+# Rows validated and inserted per batch.
+ARTICLE_IMPORT_BATCH_SIZE = 500
+# Threads decoding and storing the images of a batch.
+ARTICLE_IMPORT_IMAGE_WORKERS = 4
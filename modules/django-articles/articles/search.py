@@ -0,0 +1,171 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Article
+from .options import ARTICLE_SEARCH_CONFIG
+
+SEARCH_TABLE = "articles_article_search"
+
+
+class BaseSearchBackend:
+    """
+    Keeps the full-text index of articles in ``SEARCH_TABLE`` and queries it.
+    ``search`` returns article ids, best match first.
+    """
+
+    def index(self, articles):
+        raise NotImplementedError
+
+    def remove(self, ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, query, limit, offset=0):
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    ``tsvector`` documents with a GIN index. Titles weigh more than bodies
+    and results are ranked with ``ts_rank_cd``.
+    """
+
+    def index(self, articles):
+        rows = [
+            (
+                article.pk,
+                ARTICLE_SEARCH_CONFIG,
+                article.title,
+                ARTICLE_SEARCH_CONFIG,
+                article.body,
+            )
+            for article in articles
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO {0} (article_id, document) VALUES (%s, "
+                "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'B')) "
+                "ON CONFLICT (article_id) DO UPDATE "
+                "SET document = EXCLUDED.document".format(SEARCH_TABLE),
+                rows,
+            )
+
+    def remove(self, ids):
+        ids = list(ids)
+        if not ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {0} WHERE article_id = ANY(%s)".format(SEARCH_TABLE),
+                [ids],
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute("TRUNCATE {0}".format(SEARCH_TABLE))
+
+    def search(self, query, limit, offset=0):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT article_id FROM {0}, plainto_tsquery(%s::regconfig, %s) query "
+                "WHERE document @@ query "
+                "ORDER BY ts_rank_cd(document, query) DESC, article_id DESC "
+                "LIMIT %s OFFSET %s".format(SEARCH_TABLE),
+                [ARTICLE_SEARCH_CONFIG, query, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    FTS5 virtual table keyed by the article id, ranked with ``bm25``.
+    """
+
+    # Column weights for bm25: title, body.
+    weights = (10.0, 1.0)
+
+    def index(self, articles):
+        rows = [(article.pk, article.title, article.body) for article in articles]
+        if not rows:
+            return
+        self.remove(row[0] for row in rows)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO {0} (rowid, title, body) VALUES (%s, %s, %s)".format(
+                    SEARCH_TABLE
+                ),
+                rows,
+            )
+
+    def remove(self, ids):
+        ids = [(pk,) for pk in ids]
+        if not ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "DELETE FROM {0} WHERE rowid = %s".format(SEARCH_TABLE), ids
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM {0}".format(SEARCH_TABLE))
+
+    @staticmethod
+    def to_match_expression(query):
+        # Quote every term so user input can never be parsed as FTS5 syntax.
+        terms = re.findall(r"\w+", query)
+        return " ".join('"{0}"'.format(term) for term in terms)
+
+    def search(self, query, limit, offset=0):
+        expression = self.to_match_expression(query)
+        if not expression:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT rowid FROM {0} WHERE {0} MATCH %s "
+                "ORDER BY bm25({0}, {1}, {2}) LIMIT %s OFFSET %s".format(
+                    SEARCH_TABLE, *self.weights
+                ),
+                [expression, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    """
+    Fallback for databases without a supported full-text engine. Scans the
+    article table and orders matches by recency.
+    """
+
+    def index(self, articles):
+        pass
+
+    def remove(self, ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, query, limit, offset=0):
+        matches = Q()
+        for term in query.split():
+            matches &= Q(title__icontains=term) | Q(body__icontains=term)
+        queryset = Article.objects.filter(matches).order_by("-created_at", "-id")
+        return list(queryset.values_list("id", flat=True)[offset : offset + limit])
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_search_backend(vendor=None):
+    return BACKENDS.get(vendor or connection.vendor, BasicSearchBackend)()
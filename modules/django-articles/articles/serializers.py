@@ -1,54 +1,179 @@
 from rest_framework import serializers
 from .models import Article
+from .options import ARTICLE_IMAGE_MAX_SIZE
 import base64
-import imghdr
+import binascii
 import io
 import secrets
-from django.core.files.base import ContentFile
-from PIL import Image
+from django.apps import apps
+from django.conf import settings
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile,
+    TemporaryUploadedFile,
+)
+
+BASE64_CHUNK_SIZE = 64 * 1024
+# Line breaks and spaces in a payload, e.g. from base64.encodebytes, are skipped.
+BASE64_WHITESPACE = " \t\r\n"
+
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+)
 
 
 class Base64ImageField(serializers.ImageField):
     """
     A Django REST framework field for handling image-uploads through raw post data.
     It uses base64 for encoding and decoding the contents of the file.
+
+    The payload is decoded in chunks straight into an uploaded file, kept in
+    memory or spooled to a temporary file on disk depending on
+    ``FILE_UPLOAD_MAX_MEMORY_SIZE``, the same way Django handles multipart
+    uploads. Payloads that would decode to more than ``max_decoded_size``
+    bytes are rejected before anything is decoded.
     """
 
+    default_error_messages = {
+        "max_decoded_size": "Ensure this image is at most {max_decoded_size} bytes.",
+    }
+
+    def __init__(self, *args, **kwargs):
+        self.max_decoded_size = kwargs.pop("max_decoded_size", ARTICLE_IMAGE_MAX_SIZE)
+        super().__init__(*args, **kwargs)
+
     def to_internal_value(self, data):
         # Check if this is a base64 string
         if isinstance(data, str):
             # Check if the base64 string is in the "data:" format
             if "data:" in data and ";base64," in data:
-                # Break out the header from the base64 content
-                header, data = data.split(";base64,")
-                # Try to decode the file. Return validation error if it fails.
-                try:
-                    decoded_file = base64.b64decode(data)
-                except TypeError:
-                    self.fail("invalid_image")
-
-                # Generate file name:
-                file_name = secrets.token_urlsafe(
-                    12
-                )  # 12 characters are more than enough.
-                # Get the file name extension:
-                file_extension = self.get_file_extension(file_name, decoded_file)
-                complete_file_name = "{0}.{1}".format(file_name, file_extension)
-                data = ContentFile(decoded_file, name=complete_file_name)
+                # Skip the header, the content starts right after it
+                start = data.index(";base64,") + len(";base64,")
+                data = self.decode(data, start)
 
         return super().to_internal_value(data)
 
+    def decode(self, data, start):
+        # Every 4 base64 characters hold 3 bytes, so the decoded size is known
+        # before decoding anything.
+        whitespace = sum(data.count(space, start) for space in BASE64_WHITESPACE)
+        tail = "".join(data[max(start, len(data) - 8) :].split())
+        decoded_size = (len(data) - start - whitespace) * 3 // 4
+        decoded_size -= 2 if tail.endswith("==") else 1 if tail.endswith("=") else 0
+        if self.max_decoded_size and decoded_size > self.max_decoded_size:
+            self.fail("max_decoded_size", max_decoded_size=self.max_decoded_size)
+
+        # Generate file name:
+        file_name = secrets.token_urlsafe(12)  # 12 characters are more than enough.
+        if decoded_size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+            upload = TemporaryUploadedFile(file_name, None, 0, None)
+        else:
+            upload = InMemoryUploadedFile(
+                io.BytesIO(), None, file_name, None, 0, None
+            )
+
+        # Try to decode the file. Return validation error if it fails.
+        header = b""
+        # Characters left over from the previous chunk: only whole groups of
+        # 4 are decoded at a time, whatever whitespace a chunk holds.
+        carry = ""
+        try:
+            for offset in range(start, len(data), BASE64_CHUNK_SIZE):
+                text = data[offset : offset + BASE64_CHUNK_SIZE]
+                text = carry + "".join(text.split())
+                end = len(text) - len(text) % 4
+                carry = text[end:]
+                chunk = base64.b64decode(text[:end])
+                if not header:
+                    header = chunk[:16]
+                upload.file.write(chunk)
+                upload.size += len(chunk)
+            if carry:
+                raise binascii.Error("Incorrect padding")
+            # Get the file name extension:
+            file_extension = self.get_file_extension(header, upload)
+        except (binascii.Error, ValueError, OSError):
+            upload.close()
+            self.fail("invalid_image")
+
+        upload.seek(0)
+        upload.name = "{0}.{1}".format(file_name, file_extension)
+        upload.content_type = "image/{0}".format(
+            "jpeg" if file_extension == "jpg" else file_extension
+        )
+        return upload
+
     @staticmethod
-    def get_file_extension(file_name, decoded_file):
-        extension = imghdr.what(file_name, decoded_file)
+    def get_file_extension(header, file):
+        """
+        Detects the image format from its first bytes. Formats that are not
+        recognised here are left to Pillow, which only reads the header too.
+        """
+        extension = None
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            extension = "webp"
+        for signature, name in IMAGE_SIGNATURES:
+            if header.startswith(signature):
+                extension = name
+                break
         if extension is None:
-            image = Image.open(io.BytesIO(decoded_file))
-            extension = image.format.lower()
+            # Imported here so that Pillow loads only if the signatures fail.
+            from PIL import Image
+
+            file.seek(0)
+            extension = Image.open(file).format.lower()
         extension = "jpg" if extension == "jpeg" else extension
         return extension
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Lets clients pick the fields they need on reads, e.g. ``?fields=id,title``.
+    Unknown field names are ignored.
+    """
+
+    fields_query_param = "fields"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+        requested = request.query_params.get(self.fields_query_param)
+        if not requested:
+            return
+        allowed = {name.strip() for name in requested.split(",")}
+        for name in set(self.fields) - allowed:
+            self.fields.pop(name)
+
+
+class ImageVariantsMixin:
+    """
+    Adds ``image_variants``, the resized versions of ``image``, after it when
+    the Image Derivatives module is installed.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if apps.is_installed("modules.image_derivatives"):
+            from modules.image_derivatives.fields import ImageVariantsField
+
+            items = list(fields.items())
+            position = list(fields).index("image") + 1
+            variants = ImageVariantsField(source="image")
+            items.insert(position, ("image_variants", variants))
+            fields = dict(items)
+        return fields
+
+
+class ArticleSerializer(
+    SparseFieldsMixin, ImageVariantsMixin, serializers.ModelSerializer
+):
     image = Base64ImageField(max_length=None, required=False)
 
     class Meta:
@@ -63,3 +188,28 @@ class ArticleSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id"]
+
+
+class ArticleListSerializer(
+    SparseFieldsMixin, ImageVariantsMixin, serializers.ModelSerializer
+):
+    """
+    Lightweight representation used by the list endpoint. The full ``body`` is
+    replaced by an ``excerpt`` computed in the database, see
+    ``ArticleViewSet.get_queryset``.
+    """
+
+    excerpt = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Article
+        fields = [
+            "id",
+            "title",
+            "excerpt",
+            "author",
+            "image",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
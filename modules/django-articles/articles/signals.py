@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Article, ArticleTombstone
+from .search import get_search_backend
+
+
+@receiver(post_delete, sender=Article, dispatch_uid="articles_record_tombstone")
+def record_tombstone(sender, instance, **kwargs):
+    ArticleTombstone.objects.create(article_id=instance.pk)
+
+
+@receiver(post_save, sender=Article, dispatch_uid="articles_update_search_index")
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Article, dispatch_uid="articles_remove_search_index")
+def remove_search_index(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
@@ -0,0 +1,182 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Article, ArticleTombstone
+from .options import (
+    ARTICLE_SYNC_BATCH_SIZE,
+    ARTICLE_SYNC_SAFETY_WINDOW,
+    ARTICLE_TOMBSTONE_RETENTION,
+)
+
+Changes = namedtuple("Changes", ["articles", "deleted", "watermark", "has_more"])
+Watermark = namedtuple(
+    "Watermark", ["articles_position", "tombstones_position", "issued_at", "has_more"]
+)
+
+
+class InvalidWatermark(ValueError):
+    pass
+
+
+class WatermarkExpired(InvalidWatermark):
+    """
+    The watermark is older than the tombstones kept, so deletions the client
+    hasn't seen may be gone: it has to sync again from scratch.
+    """
+
+
+def encode_watermark(articles_position, tombstones_position, issued_at, has_more):
+    """
+    Packs the last seen ``(updated_at, id)`` of articles and
+    ``(deleted_at, id)`` of tombstones, when the watermark was issued and
+    whether more changes were waiting into an opaque token.
+    """
+
+    def dump(position):
+        if position is None:
+            return None
+        value, pk = position
+        return [value.isoformat(), pk]
+
+    raw = json.dumps(
+        [
+            dump(articles_position),
+            dump(tombstones_position),
+            issued_at.isoformat(),
+            has_more,
+        ]
+    )
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+
+
+def decode_watermark(token):
+    def load(position):
+        if position is None:
+            return None
+        value, pk = position
+        return load_datetime(value), int(pk)
+
+    def load_datetime(value):
+        value = parse_datetime(value)
+        if value is None:
+            raise ValueError(value)
+        return value
+
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii")).decode("ascii")
+        values = json.loads(raw)
+        if len(values) == 2:
+            # Issued before watermarks recorded when they were issued.
+            articles_position, tombstones_position = values
+            issued_at, has_more = None, False
+        else:
+            articles_position, tombstones_position, issued_at, has_more = values
+            issued_at = load_datetime(issued_at)
+        return Watermark(
+            load(articles_position), load(tombstones_position), issued_at, has_more
+        )
+    except (TypeError, ValueError, UnicodeError, binascii.Error):
+        raise InvalidWatermark(token)
+
+
+def _after(queryset, field, position, window=None):
+    """
+    Rows after ``position``, or with ``window``, every row less than
+    ``window`` older than it.
+    """
+    if position is None:
+        return queryset
+    value, pk = position
+    if window is not None:
+        return queryset.filter(**{"{0}__gt".format(field): value - window})
+    return queryset.filter(
+        Q(**{"{0}__gt".format(field): value}) | Q(**{field: value, "id__gt": pk})
+    )
+
+
+def changes_since(
+    watermark=None,
+    limit=ARTICLE_SYNC_BATCH_SIZE,
+    queryset=None,
+    safety_window=ARTICLE_SYNC_SAFETY_WINDOW,
+    retention=ARTICLE_TOMBSTONE_RETENTION,
+):
+    """
+    Returns the articles created or updated and the ids of the articles deleted
+    after ``watermark``, at most ``limit`` of each, together with the watermark
+    to send on the next call. Without a watermark every article is returned
+    and past deletions are skipped, since the client has nothing to drop.
+
+    ``updated_at`` is set when an article is saved, not when its transaction
+    commits, so a change can become visible behind a watermark already handed
+    out. Each sync therefore starts ``safety_window`` seconds behind the
+    watermark and returns those changes again; pages of the same sync (while
+    ``has_more``) follow each other exactly. Raises ``WatermarkExpired`` for a
+    watermark issued more than ``retention`` seconds ago.
+    """
+    if queryset is None:
+        queryset = Article.objects.all()
+    now = timezone.now()
+    window = timedelta(seconds=safety_window)
+
+    if watermark:
+        watermark = decode_watermark(watermark)
+        articles_position = watermark.articles_position
+        tombstones_position = watermark.tombstones_position
+        issued_at = watermark.issued_at
+        if issued_at is None:
+            # At worst as old as the last change it had seen.
+            positions = [articles_position, tombstones_position]
+            issued_at = max(
+                [position[0] for position in positions if position], default=None
+            )
+        if issued_at is not None and issued_at - window < now - timedelta(
+            seconds=retention
+        ):
+            raise WatermarkExpired(watermark)
+        if watermark.has_more:
+            window = None
+    else:
+        articles_position = None
+        latest = (
+            ArticleTombstone.objects.order_by("-deleted_at", "-id")
+            .values_list("deleted_at", "id")
+            .first()
+        )
+        tombstones_position = tuple(latest) if latest else None
+
+    articles = list(
+        _after(queryset, "updated_at", articles_position, window).order_by(
+            "updated_at", "id"
+        )[: limit + 1]
+    )
+    tombstones = list(
+        _after(ArticleTombstone.objects.all(), "deleted_at", tombstones_position, window)
+        .order_by("deleted_at", "id")
+        .values_list("deleted_at", "id", "article_id")[: limit + 1]
+    )
+
+    has_more = len(articles) > limit or len(tombstones) > limit
+    articles = articles[:limit]
+    tombstones = tombstones[:limit]
+
+    if articles:
+        articles_position = (articles[-1].updated_at, articles[-1].pk)
+    if tombstones:
+        tombstones_position = tombstones[-1][:2]
+
+    return Changes(
+        articles=articles,
+        deleted=[article_id for _, _, article_id in tombstones],
+        watermark=encode_watermark(
+            articles_position, tombstones_position, now, has_more
+        ),
+        has_more=has_more,
+    )
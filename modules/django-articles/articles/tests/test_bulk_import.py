@@ -0,0 +1,194 @@
+import base64
+import io
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from modules.image_derivatives.models import ImageDerivative
+
+from ..bulk_import import import_articles
+from ..models import Article
+from ..search import get_search_backend
+
+
+def png_data_uri():
+    output = io.BytesIO()
+    Image.new("RGB", (8, 8), "red").save(output, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(output.getvalue()).decode()
+
+
+class ImportTestMixin:
+    def setUp(self):
+        # Imported images are stored in a temporary MEDIA_ROOT.
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings = override_settings(MEDIA_ROOT=directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.author = get_user_model().objects.create_user("author")
+
+    def row(self, title="Article", **fields):
+        fields.setdefault("body", "Body")
+        fields.setdefault("author", self.author.pk)
+        return json.dumps(dict(title=title, **fields))
+
+    def run_import(self, lines, **kwargs):
+        return list(import_articles(lines, **kwargs))
+
+
+class ImportArticlesTests(ImportTestMixin, TestCase):
+    def test_imports_every_line_in_order(self):
+        lines = [self.row("Article %d" % i) for i in range(5)]
+        results = self.run_import(lines, batch_size=2)
+        self.assertEqual([result["line"] for result in results], [1, 2, 3, 4, 5])
+        articles = Article.objects.in_bulk([result["id"] for result in results])
+        self.assertEqual(
+            [articles[result["id"]].title for result in results],
+            ["Article %d" % i for i in range(5)],
+        )
+
+    # Without the ids of bulk inserted rows, articles are saved one by one.
+    @skipUnlessDBFeature("can_return_rows_from_bulk_insert")
+    def test_inserts_a_batch_at_a_time(self):
+        lines = [self.row("Article %d" % i) for i in range(5)]
+        with mock.patch.object(
+            Article.objects, "bulk_create", wraps=Article.objects.bulk_create
+        ) as bulk_create:
+            self.run_import(lines, batch_size=2)
+        self.assertEqual(
+            [len(call.args[0]) for call in bulk_create.call_args_list], [2, 2, 1]
+        )
+
+    @skipUnlessDBFeature("can_return_rows_from_bulk_insert")
+    def test_queries_dont_grow_with_the_batch(self):
+        counts = []
+        for size in (2, 20):
+            lines = [self.row("Article %d" % i) for i in range(size)]
+            with CaptureQueriesContext(connection) as context:
+                self.run_import(lines, batch_size=size)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_reads_bytes_and_skips_blank_lines(self):
+        lines = [b"\n", self.row("First").encode() + b"\n", b"  \n", self.row()]
+        results = self.run_import(lines)
+        self.assertEqual([result["line"] for result in results], [2, 4])
+        self.assertTrue(all("id" in result for result in results))
+
+    def test_invalid_lines_are_reported(self):
+        lines = [
+            "{not json",
+            "[1, 2]",
+            self.row(title=""),
+            self.row(title="x" * 257),
+            self.row(author=self.author.pk + 100),
+            self.row(image="data:image/png;base64,bm90IGFuIGltYWdl"),
+            self.row("Valid"),
+        ]
+        results = self.run_import(lines)
+        self.assertIn("non_field_errors", results[0]["errors"])
+        self.assertIn("non_field_errors", results[1]["errors"])
+        self.assertIn("title", results[2]["errors"])
+        self.assertIn("title", results[3]["errors"])
+        self.assertIn("author", results[4]["errors"])
+        self.assertIn("image", results[5]["errors"])
+        self.assertEqual(Article.objects.get(pk=results[6]["id"]).title, "Valid")
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_default_author(self):
+        line = json.dumps({"title": "Article", "body": "Body"})
+        [result] = self.run_import([line])
+        self.assertEqual(result["errors"], {"author": ["This field is required."]})
+        [result] = self.run_import([line], default_author=self.author.pk)
+        self.assertEqual(Article.objects.get(pk=result["id"]).author, self.author)
+
+    def test_stores_images(self):
+        [result] = self.run_import([self.row(image=png_data_uri())])
+        article = Article.objects.get(pk=result["id"])
+        self.assertTrue(article.image.name.startswith("mediafiles/articles/"))
+        self.assertTrue(article.image.name.endswith(".png"))
+        self.assertTrue(os.path.exists(article.image.path))
+
+    def test_indexes_for_search(self):
+        [result] = self.run_import([self.row("Imported apple")])
+        self.assertEqual(get_search_backend().search("apple", 10), [result["id"]])
+
+
+# The derivatives are queued when a batch commits, so these imports commit.
+class ImportDerivativesTests(ImportTestMixin, TransactionTestCase):
+    def test_queued_on_commit(self):
+        results = self.run_import(
+            [self.row(image=png_data_uri()), self.row(), self.row(image=png_data_uri())]
+        )
+        names = [
+            Article.objects.get(pk=result["id"]).image.name
+            for result in (results[0], results[2])
+        ]
+        sources = set(ImageDerivative.objects.values_list("source", flat=True))
+        self.assertEqual(sources, set(names))
+
+
+@override_settings(ROOT_URLCONF="modules.articles.urls")
+class ImportEndpointTests(ImportTestMixin, TestCase):
+    def post(self, user, lines):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post(
+            "/article/import/",
+            "\n".join(lines),
+            content_type="application/x-ndjson",
+        )
+
+    def test_streams_a_result_per_line(self):
+        admin = get_user_model().objects.create_user("admin", is_staff=True)
+        line = json.dumps({"title": "Article", "body": "Body"})
+        response = self.post(admin, [line, "{not json"])
+        self.assertEqual(response.status_code, 200)
+        results = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(Article.objects.get(pk=results[0]["id"]).author, admin)
+        self.assertIn("errors", results[1])
+
+    def test_requires_an_admin(self):
+        response = self.post(self.author, [self.row()])
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Article.objects.exists())
+
+
+class ImportCommandTests(ImportTestMixin, TestCase):
+    def test_imports_a_file(self):
+        path = os.path.join(tempfile.mkdtemp(), "articles.jsonl")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, "w") as f:
+            f.write("%s\n{not json\n" % json.dumps({"title": "A", "body": "B"}))
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "import_articles",
+            path,
+            author=self.author.pk,
+            errors_only=True,
+            stdout=stdout,
+            stderr=stderr,
+        )
+        self.assertEqual(Article.objects.get().author, self.author)
+        [line] = stdout.getvalue().splitlines()
+        self.assertEqual(json.loads(line)["line"], 2)
+        self.assertIn("Imported 1 articles, 1 lines failed", stderr.getvalue())
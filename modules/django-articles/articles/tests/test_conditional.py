@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..models import Article
+from ..options import ARTICLE_HTTP_MAX_AGE
+
+
+@override_settings(ROOT_URLCONF="modules.articles.urls")
+class ConditionalRequestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user("author")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.article = Article.objects.create(
+            title="Article", body="Body", author=self.author
+        )
+        # An hour old, so that a save moves Last-Modified to a later second.
+        Article.objects.filter(pk=self.article.pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        self.detail = "/article/%s/" % self.article.pk
+
+    def update(self, **fields):
+        article = Article.objects.get(pk=self.article.pk)
+        for name, value in fields.items():
+            setattr(article, name, value)
+        article.save()
+
+    def test_detail_validators(self):
+        response = self.client.get(self.detail)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("max-age=%d" % ARTICLE_HTTP_MAX_AGE, response["Cache-Control"])
+
+    def test_detail_not_modified(self):
+        response = self.client.get(self.detail)
+        not_modified = self.client.get(self.detail, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+        not_modified = self.client.get(
+            self.detail, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_detail_validators_change_after_an_update(self):
+        response = self.client.get(self.detail)
+        self.update(title="Renamed")
+        for headers in (
+            {"HTTP_IF_NONE_MATCH": response["ETag"]},
+            {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+        ):
+            with self.subTest(headers=headers):
+                changed = self.client.get(self.detail, **headers)
+                self.assertEqual(changed.status_code, 200)
+                self.assertEqual(changed.json()["title"], "Renamed")
+                self.assertNotEqual(changed["ETag"], response["ETag"])
+                self.assertNotEqual(changed["Last-Modified"], response["Last-Modified"])
+
+    def test_list_not_modified(self):
+        response = self.client.get("/article/")
+        self.assertNotIn("Last-Modified", response)
+        not_modified = self.client.get(
+            "/article/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_list_etag_changes_after_an_update_or_delete(self):
+        etag = self.client.get("/article/")["ETag"]
+        self.update(title="Renamed")
+        response = self.client.get("/article/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        Article.objects.get(pk=self.article.pk).delete()
+        deleted = self.client.get("/article/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(deleted.status_code, 200)
+        self.assertEqual(deleted.json()["results"], [])
+
+    def test_list_etag_depends_on_the_query(self):
+        first = self.client.get("/article/")["ETag"]
+        trimmed = self.client.get("/article/", {"fields": "id"})["ETag"]
+        self.assertNotEqual(first, trimmed)
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from modules.image_derivatives.models import ImageDerivative
+
+from ..models import Article
+from ..serializers import ArticleListSerializer, ArticleSerializer
+
+
+class ImageVariantsFieldTests(SimpleTestCase):
+    def test_follows_the_image(self):
+        fields = list(ArticleSerializer().fields)
+        self.assertEqual(fields[fields.index("image") + 1], "image_variants")
+        self.assertIn("image_variants", ArticleListSerializer().fields)
+
+    def test_left_out_without_image_derivatives(self):
+        apps = [
+            app for app in settings.INSTALLED_APPS if app != "modules.image_derivatives"
+        ]
+        with override_settings(INSTALLED_APPS=apps):
+            self.assertNotIn("image_variants", ArticleSerializer().fields)
+            self.assertNotIn("image_variants", ArticleListSerializer().fields)
+
+
+# Saves really commit here, so the derivatives queued on commit are created.
+class DerivativesTests(TransactionTestCase):
+    def setUp(self):
+        self.author = get_user_model().objects.create_user("author")
+
+    def create(self, image):
+        return Article.objects.create(
+            title="Article", body="Body", author=self.author, image=image
+        )
+
+    def sources(self):
+        return set(ImageDerivative.objects.values_list("source", flat=True))
+
+    def test_queued_on_save(self):
+        self.create("articles/a.png")
+        self.assertEqual(self.sources(), {"articles/a.png"})
+
+    def test_discarded_when_the_image_is_replaced(self):
+        article = self.create("articles/a.png")
+        article = Article.objects.get(pk=article.pk)
+        article.image = "articles/b.png"
+        article.save()
+        self.assertEqual(self.sources(), {"articles/b.png"})
+
+    def test_discarded_when_the_article_is_deleted(self):
+        article = self.create("articles/a.png")
+        article.delete()
+        self.assertEqual(self.sources(), set())
+
+    def test_kept_while_another_article_uses_the_image(self):
+        first = self.create("articles/a.png")
+        self.create("articles/a.png")
+        first.image = "articles/b.png"
+        first.save()
+        self.assertEqual(self.sources(), {"articles/a.png", "articles/b.png"})
+
+    def test_deferred_image_is_not_loaded(self):
+        article = self.create("articles/a.png")
+        article = Article.objects.defer("image").get(pk=article.pk)
+        article.title = "Renamed"
+        with CaptureQueriesContext(connection) as context:
+            article.save(update_fields=["title"])
+        self.assertFalse(
+            [query for query in context.captured_queries if "SELECT" in query["sql"]]
+        )
+        self.assertEqual(self.sources(), {"articles/a.png"})
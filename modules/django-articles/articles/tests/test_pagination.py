@@ -0,0 +1,118 @@
+import base64
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..models import Article
+from ..options import ARTICLE_MAX_PAGE_SIZE
+
+
+@override_settings(ROOT_URLCONF="modules.articles.urls")
+class ArticleListTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user("author")
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def create(self, title, created_at=None):
+        article = Article.objects.create(title=title, body="Body", author=self.author)
+        if created_at is not None:
+            Article.objects.filter(pk=article.pk).update(created_at=created_at)
+        return article
+
+    def get(self, url="/article/", **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+
+class KeysetPaginationTests(ArticleListTestCase):
+    def ids(self, **params):
+        ids = []
+        page = self.get(**params)
+        while True:
+            ids += [article["id"] for article in page["results"]]
+            if page["next"] is None:
+                return ids
+            page = self.get(page["next"])
+
+    def test_pages_through_every_article_newest_first(self):
+        created = [self.create("Article %d" % i).pk for i in range(5)]
+        self.assertEqual(self.ids(page_size=2), created[::-1])
+
+    def test_articles_created_at_the_same_time_are_ordered_by_id(self):
+        now = timezone.now()
+        created = [self.create("Article %d" % i, created_at=now).pk for i in range(5)]
+        self.assertEqual(self.ids(page_size=2), created[::-1])
+
+    def test_new_articles_dont_shift_the_next_page(self):
+        created = [self.create("Article %d" % i).pk for i in range(4)]
+        page = self.get(page_size=2)
+        self.create("Newer")
+        page = self.get(page["next"])
+        self.assertEqual(
+            [article["id"] for article in page["results"]], created[1::-1]
+        )
+        self.assertIsNone(page["next"])
+
+    def test_first_link_drops_the_cursor(self):
+        for i in range(3):
+            self.create("Article %d" % i)
+        page = self.get(self.get(page_size=2)["next"])
+        self.assertNotIn("cursor=", page["first"])
+        self.assertIn("page_size=2", page["first"])
+
+    def test_invalid_cursor(self):
+        self.create("Article")
+        for cursor in (
+            "nonsense",
+            base64.urlsafe_b64encode(b"not a cursor").decode("ascii"),
+            base64.urlsafe_b64encode(b"yesterday|1").decode("ascii"),
+            base64.urlsafe_b64encode(b"2020-01-01T00:00:00|one").decode("ascii"),
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/article/", {"cursor": cursor})
+                self.assertEqual(response.status_code, 404)
+
+    def test_page_size_is_capped(self):
+        for i in range(ARTICLE_MAX_PAGE_SIZE + 1):
+            self.create("Article %d" % i)
+        page = self.get(page_size=ARTICLE_MAX_PAGE_SIZE + 1)
+        self.assertEqual(len(page["results"]), ARTICLE_MAX_PAGE_SIZE)
+        self.assertIsNotNone(page["next"])
+
+
+class SparseFieldsTests(ArticleListTestCase):
+    def test_list(self):
+        self.create("Article")
+        page = self.get(fields="id,title")
+        self.assertEqual(set(page["results"][0]), {"id", "title"})
+
+    def test_detail(self):
+        article = self.create("Article")
+        data = self.get("/article/%s/" % article.pk, fields="title,body")
+        self.assertEqual(data, {"title": "Article", "body": "Body"})
+
+    def test_unknown_fields_are_ignored(self):
+        article = self.create("Article")
+        data = self.get("/article/%s/" % article.pk, fields="id,secret")
+        self.assertEqual(data, {"id": article.pk})
+
+    def test_every_field_by_default(self):
+        self.create("Article")
+        page = self.get()
+        self.assertIn("excerpt", page["results"][0])
+        self.assertNotIn("body", page["results"][0])
+
+    def test_writes_are_not_trimmed(self):
+        article = self.create("Article")
+        self.client.force_authenticate(self.author)
+        response = self.client.patch(
+            "/article/%s/?fields=id" % article.pk, {"title": "Renamed"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Renamed")
@@ -0,0 +1,177 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from ..models import Article
+from ..search import (
+    BasicSearchBackend,
+    PostgresSearchBackend,
+    SQLiteSearchBackend,
+    get_search_backend,
+)
+
+# Input that is syntax to FTS5 or tsquery parsers.
+SPECIAL_QUERIES = (
+    'apple"',
+    "apple AND (pear",
+    "title:apple",
+    "apple*",
+    "NEAR(apple pear)",
+    "apple & !pear | 'x':*",
+    "-apple",
+)
+
+
+class SearchTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user("author")
+
+    def create(self, title, body="Body"):
+        return Article.objects.create(title=title, body=body, author=self.author)
+
+    def search(self, query, limit=10, offset=0):
+        return get_search_backend().search(query, limit, offset)
+
+
+class SearchBackendTests:
+    """
+    Behaviour shared by the full-text backends, run on the database each one
+    supports.
+    """
+
+    def test_indexed_on_save(self):
+        article = self.create("Apple pie", "With cinnamon")
+        self.assertEqual(self.search("apple"), [article.pk])
+        self.assertEqual(self.search("cinnamon"), [article.pk])
+
+    def test_reindexed_on_update(self):
+        article = self.create("Apple pie")
+        article.title = "Pear tart"
+        article.save()
+        self.assertEqual(self.search("apple"), [])
+        self.assertEqual(self.search("pear"), [article.pk])
+
+    def test_removed_on_delete(self):
+        self.create("Apple pie").delete()
+        self.assertEqual(self.search("apple"), [])
+
+    def test_titles_weigh_more_than_bodies(self):
+        in_body = self.create("Dessert", "An apple pie")
+        in_title = self.create("Apple pie", "A dessert")
+        self.assertEqual(self.search("apple"), [in_title.pk, in_body.pk])
+
+    def test_every_term_must_match(self):
+        both = self.create("Apple and pear")
+        self.create("Apple")
+        self.assertEqual(self.search("apple pear"), [both.pk])
+
+    def test_limit_and_offset(self):
+        for i in range(3):
+            self.create("Apple %d" % i)
+        found = self.search("apple")
+        self.assertEqual(len(found), 3)
+        self.assertEqual(self.search("apple", limit=2), found[:2])
+        self.assertEqual(self.search("apple", limit=2, offset=2), found[2:])
+
+    def test_query_syntax_is_not_interpreted(self):
+        article = self.create("Apple pear", "title near")
+        for query in SPECIAL_QUERIES:
+            with self.subTest(query=query):
+                self.assertIn(self.search(query), ([], [article.pk]))
+
+    def test_reindex_command(self):
+        article = self.create("Apple pie")
+        get_search_backend().clear()
+        self.assertEqual(self.search("apple"), [])
+        call_command("reindex_articles", stdout=StringIO())
+        self.assertEqual(self.search("apple"), [article.pk])
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5 runs on SQLite")
+class SQLiteSearchBackendTests(SearchBackendTests, SearchTestCase):
+    def test_backend(self):
+        self.assertIsInstance(get_search_backend(), SQLiteSearchBackend)
+
+
+@skipUnless(connection.vendor == "postgresql", "tsvector runs on PostgreSQL")
+class PostgresSearchBackendTests(SearchBackendTests, SearchTestCase):
+    def test_backend(self):
+        self.assertIsInstance(get_search_backend(), PostgresSearchBackend)
+
+
+class GetSearchBackendTests(SimpleTestCase):
+    def test_vendors(self):
+        self.assertIsInstance(get_search_backend("postgresql"), PostgresSearchBackend)
+        self.assertIsInstance(get_search_backend("sqlite"), SQLiteSearchBackend)
+        self.assertIsInstance(get_search_backend("mysql"), BasicSearchBackend)
+
+
+class MatchExpressionTests(SimpleTestCase):
+    def test_terms_are_quoted(self):
+        self.assertEqual(
+            SQLiteSearchBackend.to_match_expression("apple pie"), '"apple" "pie"'
+        )
+
+    def test_syntax_is_dropped(self):
+        for query, expression in (
+            ('apple"', '"apple"'),
+            ("apple AND (pear", '"apple" "AND" "pear"'),
+            ("title:apple", '"title" "apple"'),
+            ("apple*", '"apple"'),
+            ("-apple", '"apple"'),
+            ("\"'*():^", ""),
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    SQLiteSearchBackend.to_match_expression(query), expression
+                )
+
+
+class BasicSearchBackendTests(SearchTestCase):
+    def test_matches_every_term_newest_first(self):
+        older = self.create("Apple and pear")
+        newer = self.create("Pear", "and apple")
+        self.create("Apple")
+        self.assertEqual(
+            BasicSearchBackend().search("apple pear", limit=10), [newer.pk, older.pk]
+        )
+
+
+@override_settings(ROOT_URLCONF="modules.articles.urls")
+class SearchEndpointTests(SearchTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_results_in_rank_order(self):
+        for i in range(3):
+            self.create("Apple %d" % i)
+        response = self.client.get("/article/search/", {"q": "apple"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [article["id"] for article in response.json()["results"]],
+            self.search("apple"),
+        )
+        self.assertNotIn("body", response.json()["results"][0])
+
+    def test_pages(self):
+        for i in range(3):
+            self.create("Apple %d" % i)
+        found = self.search("apple")
+        response = self.client.get("/article/search/", {"q": "apple", "page_size": 2})
+        data = response.json()
+        self.assertEqual([article["id"] for article in data["results"]], found[:2])
+        data = self.client.get(data["next"]).json()
+        self.assertEqual([article["id"] for article in data["results"]], found[2:])
+        self.assertIsNone(data["next"])
+
+    def test_invalid_parameters(self):
+        for params in ({}, {"q": "  "}, {"q": "apple", "page": "one"}):
+            with self.subTest(params=params):
+                response = self.client.get("/article/search/", params)
+                self.assertEqual(response.status_code, 400)
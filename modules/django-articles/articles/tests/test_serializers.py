@@ -0,0 +1,63 @@
+import base64
+import io
+import os
+
+from django.test import SimpleTestCase
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+from ..serializers import BASE64_CHUNK_SIZE, Base64ImageField
+
+
+def png(width, height):
+    """
+    A PNG of random pixels, which barely compresses.
+    """
+    image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+class Base64ImageFieldTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # About 300 KB, so that it spans several chunks.
+        cls.image = png(320, 320)
+
+    def decode(self, encoded, **kwargs):
+        field = Base64ImageField(max_length=None, **kwargs)
+        upload = field.run_validation("data:image/png;base64," + encoded)
+        self.addCleanup(upload.close)
+        return upload
+
+    def test_decodes_in_chunks(self):
+        self.assertGreater(len(self.image), 3 * BASE64_CHUNK_SIZE)
+        upload = self.decode(base64.b64encode(self.image).decode("ascii"))
+        self.assertEqual(upload.read(), self.image)
+        self.assertEqual(upload.size, len(self.image))
+        self.assertTrue(upload.name.endswith(".png"))
+        self.assertEqual(upload.content_type, "image/png")
+
+    def test_decodes_line_wrapped_base64(self):
+        for encoded in (
+            base64.encodebytes(self.image).decode("ascii"),
+            base64.encodebytes(self.image).decode("ascii").replace("\n", "\r\n"),
+        ):
+            upload = self.decode(encoded)
+            self.assertEqual(upload.read(), self.image)
+
+    def test_whitespace_doesnt_count_towards_the_size_limit(self):
+        encoded = base64.encodebytes(self.image).decode("ascii")
+        upload = self.decode(encoded, max_decoded_size=len(self.image))
+        self.assertEqual(upload.size, len(self.image))
+        with self.assertRaises(ValidationError) as context:
+            self.decode(encoded, max_decoded_size=len(self.image) - 1)
+        self.assertEqual(context.exception.detail[0].code, "max_decoded_size")
+
+    def test_rejects_truncated_base64(self):
+        encoded = base64.b64encode(self.image).decode("ascii")
+        with self.assertRaises(ValidationError) as context:
+            self.decode(encoded[:-3])
+        self.assertEqual(context.exception.detail[0].code, "invalid_image")
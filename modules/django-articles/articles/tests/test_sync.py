@@ -0,0 +1,145 @@
+import base64
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..models import Article, ArticleTombstone
+from ..sync import (
+    WatermarkExpired,
+    changes_since,
+    decode_watermark,
+    encode_watermark,
+)
+
+
+class SyncTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user("author")
+
+    def create(self, title, updated_at=None):
+        article = Article.objects.create(title=title, body="Body", author=self.author)
+        if updated_at is not None:
+            # As if saved by a transaction that only committed now.
+            Article.objects.filter(pk=article.pk).update(updated_at=updated_at)
+        return article
+
+    def sync_all(self, watermark=None, **kwargs):
+        """
+        Syncs until nothing more is waiting; returns the article and deleted
+        ids seen and the last watermark.
+        """
+        articles, deleted = [], []
+        while True:
+            changes = changes_since(watermark, **kwargs)
+            articles += [article.pk for article in changes.articles]
+            deleted += changes.deleted
+            watermark = changes.watermark
+            if not changes.has_more:
+                return articles, deleted, watermark
+
+
+class ChangesSinceTests(SyncTestCase):
+    def test_pages_through_every_article(self):
+        created = [self.create("Article %d" % i).pk for i in range(5)]
+        articles, deleted, _ = self.sync_all(limit=2)
+        self.assertEqual(articles, created)
+        self.assertEqual(deleted, [])
+
+    def test_returns_changes_after_the_watermark(self):
+        first = self.create("First")
+        _, _, watermark = self.sync_all()
+        second = self.create("Second")
+        first_pk = first.pk
+        first.delete()
+        articles, deleted, _ = self.sync_all(watermark)
+        self.assertIn(second.pk, articles)
+        self.assertEqual(deleted, [first_pk])
+
+    def test_returns_articles_committed_behind_the_watermark(self):
+        self.create("Seen")
+        _, _, watermark = self.sync_all()
+        late = self.create("Late", timezone.now() - timedelta(seconds=10))
+        articles, _, _ = self.sync_all(watermark)
+        self.assertIn(late.pk, articles)
+
+    def test_safety_window_bounds_the_rereads(self):
+        self.create("Seen")
+        _, _, watermark = self.sync_all()
+        late = self.create("Late", timezone.now() - timedelta(seconds=10))
+        articles, _, _ = self.sync_all(watermark, safety_window=5)
+        self.assertNotIn(late.pk, articles)
+
+    def test_returns_deletions_committed_behind_the_watermark(self):
+        article = self.create("Deleted")
+        article_pk = article.pk
+        _, _, watermark = self.sync_all()
+        article.delete()
+        ArticleTombstone.objects.update(
+            deleted_at=timezone.now() - timedelta(seconds=10)
+        )
+        _, deleted, _ = self.sync_all(watermark)
+        self.assertEqual(deleted, [article_pk])
+
+    def test_progresses_when_the_window_holds_more_than_a_page(self):
+        created = [self.create("Article %d" % i).pk for i in range(5)]
+        _, _, watermark = self.sync_all()
+        articles, _, _ = self.sync_all(watermark, limit=2)
+        self.assertEqual(articles, created)
+
+    def test_expired_watermark(self):
+        self.create("Article")
+        _, _, watermark = self.sync_all()
+        decoded = decode_watermark(watermark)
+        old = encode_watermark(
+            decoded.articles_position,
+            decoded.tombstones_position,
+            timezone.now() - timedelta(days=31),
+            False,
+        )
+        with self.assertRaises(WatermarkExpired):
+            changes_since(old)
+        changes_since(old, retention=32 * 24 * 60 * 60)
+
+    def test_accepts_watermarks_without_issue_time(self):
+        article = self.create("Article")
+        position = [article.updated_at.isoformat(), article.pk]
+        legacy = base64.urlsafe_b64encode(
+            json.dumps([position, None]).encode("ascii")
+        ).decode("ascii")
+        articles, _, _ = self.sync_all(legacy)
+        self.assertEqual(articles, [article.pk])
+
+
+@override_settings(ROOT_URLCONF="modules.articles.urls")
+class SyncEndpointTests(SyncTestCase):
+    def test_expired_watermark_asks_for_a_full_resync(self):
+        self.create("Article")
+        old = encode_watermark(None, None, timezone.now() - timedelta(days=31), False)
+        response = APIClient().get("/article/sync/", {"since": old})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.data["detail"].code, "full_resync_required")
+
+    def test_invalid_watermark(self):
+        response = APIClient().get("/article/sync/", {"since": "nonsense"})
+        self.assertEqual(response.status_code, 400)
+
+
+class PruneTombstonesTests(SyncTestCase):
+    def test_deletes_tombstones_older_than_the_retention(self):
+        old, recent = self.create("Old"), self.create("Recent")
+        recent_pk = recent.pk
+        old.delete()
+        ArticleTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        recent.delete()
+        call_command("prune_article_tombstones", stdout=StringIO())
+        self.assertEqual(
+            list(ArticleTombstone.objects.values_list("article_id", flat=True)),
+            [recent_pk],
+        )
@@ -1,9 +1,29 @@
-from rest_framework import authentication, permissions
+import json
+
+from django.db.models.functions import Substr
+from django.http import StreamingHttpResponse
+from rest_framework import authentication, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from .bulk_import import import_articles
+from .conditional import get_validators, not_modified, set_validators
 from .models import Article
-from .serializers import ArticleSerializer
+from .options import ARTICLE_EXCERPT_LENGTH
+from .pagination import KeysetPagination
+from .search import get_search_backend
+from .serializers import ArticleSerializer, ArticleListSerializer
+from .sync import InvalidWatermark, WatermarkExpired, changes_since
 from rest_framework import viewsets
 
 
+class FullResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "This watermark has expired, sync again without since."
+    default_code = "full_resync_required"
+
+
 class ArticleViewSet(viewsets.ModelViewSet):
     serializer_class = ArticleSerializer
     permission_classes = [permissions.AllowAny]
@@ -11,4 +31,119 @@ class ArticleViewSet(viewsets.ModelViewSet):
         authentication.SessionAuthentication,
         authentication.TokenAuthentication,
     )
+    pagination_class = KeysetPagination
     queryset = Article.objects.all()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "search"):
+            # Never pull full bodies off disk for the list; the excerpt is
+            # truncated by the database.
+            queryset = queryset.defer("body").annotate(
+                excerpt=Substr("body", 1, ARTICLE_EXCERPT_LENGTH)
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in ("list", "search"):
+            return ArticleListSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        # A deletion can change the page without changing any updated_at, so
+        # lists are validated by ETag only.
+        etag, _ = get_validators(
+            page, request.get_full_path(), self.paginator.has_next
+        )
+        response = not_modified(request, etag)
+        if response is None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        return set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = get_validators(
+            [instance], request.get_full_path()
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            serializer = self.get_serializer(instance)
+            response = Response(serializer.data)
+        return set_validators(response, etag, last_modified)
+
+    @action(detail=False, methods=["get"])
+    def sync(self, request):
+        """
+        Returns what changed since the ``since`` watermark of a previous sync.
+        Keep calling with the returned watermark while ``has_more`` is true.
+        Answers 410 Gone when the watermark is too old to sync from.
+        """
+        try:
+            changes = changes_since(
+                request.query_params.get("since"), queryset=self.get_queryset()
+            )
+        except WatermarkExpired:
+            raise FullResyncRequired()
+        except InvalidWatermark:
+            raise ValidationError({"since": "Invalid watermark."})
+        serializer = self.get_serializer(changes.articles, many=True)
+        return Response(
+            {
+                "articles": serializer.data,
+                "deleted": changes.deleted,
+                "watermark": changes.watermark,
+                "has_more": changes.has_more,
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Full-text search over titles and bodies, best match first. Paginated
+        with ``page`` and ``page_size``.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+        try:
+            page = max(int(request.query_params.get("page", 1)), 1)
+        except ValueError:
+            raise ValidationError({"page": "A valid integer is required."})
+        page_size = self.paginator.get_page_size(request)
+
+        ids = get_search_backend().search(
+            query, limit=page_size + 1, offset=(page - 1) * page_size
+        )
+        has_next = len(ids) > page_size
+        ids = ids[:page_size]
+        articles = self.get_queryset().in_bulk(ids)
+        results = [articles[pk] for pk in ids if pk in articles]
+
+        serializer = self.get_serializer(results, many=True)
+        next_link = None
+        if has_next:
+            next_link = replace_query_param(
+                request.build_absolute_uri(), "page", page + 1
+            )
+        return Response({"next": next_link, "results": serializer.data})
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def bulk_import(self, request):
+        """
+        Imports articles from a JSON lines body, one article per line, see
+        ``bulk_import``. Streams back a JSON line per imported line, with the
+        new article's ``id`` or the line's ``errors``.
+        """
+        results = import_articles(request.stream or [], default_author=request.user.pk)
+        return StreamingHttpResponse(
+            (json.dumps(result) + "\n" for result in results),
+            content_type="application/x-ndjson",
+        )
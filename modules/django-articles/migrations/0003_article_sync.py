@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0002_article_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["updated_at", "id"], name="article_updated_id_idx"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ArticleTombstone",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("article_id", models.IntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="articletombstone",
+            index=models.Index(
+                fields=["deleted_at", "id"], name="article_tombstone_deleted_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+SEARCH_TABLE = "articles_article_search"
+# Must match ARTICLE_SEARCH_CONFIG in articles/options.py
+ARTICLE_SEARCH_CONFIG = "english"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    article_table = apps.get_model("articles", "Article")._meta.db_table
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE TABLE {0} ("
+            "article_id integer PRIMARY KEY "
+            "REFERENCES {1} (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)".format(SEARCH_TABLE, article_table)
+        )
+        schema_editor.execute(
+            "CREATE INDEX {0}_document_idx ON {0} USING GIN (document)".format(
+                SEARCH_TABLE
+            )
+        )
+        schema_editor.execute(
+            "INSERT INTO {0} (article_id, document) SELECT id, "
+            "setweight(to_tsvector(%s::regconfig, title), 'A') || "
+            "setweight(to_tsvector(%s::regconfig, body), 'B') "
+            "FROM {1}".format(SEARCH_TABLE, article_table),
+            [ARTICLE_SEARCH_CONFIG, ARTICLE_SEARCH_CONFIG],
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE {0} USING fts5(title, body)".format(SEARCH_TABLE)
+        )
+        schema_editor.execute(
+            "INSERT INTO {0} (rowid, title, body) "
+            "SELECT id, title, body FROM {1}".format(SEARCH_TABLE, article_table)
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("postgresql", "sqlite"):
+        schema_editor.execute("DROP TABLE IF EXISTS {0}".format(SEARCH_TABLE))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0003_article_sync"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1 @@
+default_app_config = "modules.image_derivatives.apps.ImageDerivativesConfig"
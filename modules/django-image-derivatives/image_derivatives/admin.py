@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import ImageDerivative
+
+
+class ImageDerivativeAdmin(admin.ModelAdmin):
+    list_display = ("source", "variant", "status", "width", "height", "updated_at")
+    list_filter = ("status", "variant")
+    search_fields = ("source",)
+
+
+admin.site.register(ImageDerivative, ImageDerivativeAdmin)
@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class ImageDerivativesConfig(AppConfig):
+    name = "modules.image_derivatives"
+    verbose_name = "Image Derivatives"
@@ -0,0 +1,70 @@
+from django.db.models.query import QuerySet
+from rest_framework import serializers
+from rest_framework.fields import get_attribute
+
+from .models import ImageDerivative
+from .options import get_variants
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only mapping of variant name to URL for an image field, e.g.
+    ``image_variants = ImageVariantsField(source="image")``. Variants that are
+    not rendered yet fall back to the URL of the original. When a list is
+    serialized, the derivatives of all its items are fetched in one query.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def build_url(self, url):
+        request = self.context.get("request", None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    def get_ready(self, names):
+        ready = {name: {} for name in names}
+        derivatives = ImageDerivative.objects.filter(
+            source__in=names, status=ImageDerivative.READY
+        ).only("source", "variant", "file")
+        for derivative in derivatives:
+            ready[derivative.source][derivative.variant] = derivative.file.url
+        return ready
+
+    def get_prefetched(self, name):
+        cache = getattr(self.root, "_image_variants_cache", None)
+        if cache is None:
+            cache = {}
+            # Only prefetch when this field belongs to the serializer of the
+            # root instances; otherwise look up one image at a time.
+            if self.parent is self.root or self.parent is getattr(
+                self.root, "child", None
+            ):
+                instances = self.root.instance
+                if instances is None:
+                    instances = []
+                elif not isinstance(instances, (list, tuple, QuerySet)):
+                    instances = [instances]
+                names = set()
+                for instance in instances:
+                    value = get_attribute(instance, self.source_attrs)
+                    if value:
+                        names.add(value.name)
+                cache = self.get_ready(names)
+            self.root._image_variants_cache = cache
+        if name not in cache:
+            cache.update(self.get_ready([name]))
+        return cache.get(name, {})
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        ready = self.get_prefetched(value.name)
+        original = self.build_url(value.url)
+        return {
+            variant: self.build_url(ready[variant]) if variant in ready else original
+            for variant in get_variants()
+        }
+
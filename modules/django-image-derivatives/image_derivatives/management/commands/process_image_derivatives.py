@@ -0,0 +1,54 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ...options import WORKER_BATCH_SIZE, WORKER_POLL_INTERVAL
+from ...pipeline import claim, process
+
+
+class Command(BaseCommand):
+    help = "Renders queued image derivatives in a pool of worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of rendering processes",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=WORKER_BATCH_SIZE,
+            help="Number of derivatives claimed at a time",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=WORKER_POLL_INTERVAL,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of waiting for more work",
+        )
+
+    def handle(self, *args, **options):
+        # Forked pool processes must not share the parent's connections.
+        connections.close_all()
+        processed = 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            while True:
+                derivatives = claim(options["batch_size"])
+                if derivatives:
+                    process(derivatives, executor)
+                    processed += len(derivatives)
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        self.stdout.write(self.style.SUCCESS("Processed %d derivatives" % processed))
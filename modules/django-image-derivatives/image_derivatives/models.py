@@ -0,0 +1,72 @@
+from django.db import models
+from .options import DERIVATIVES_UPLOAD_PATH
+
+
+class ImageDerivative(models.Model):
+    """
+    A resized variant of an uploaded image. Derivatives are keyed by the
+    storage name of the original, so any ImageField can have them. Pending
+    rows double as the work queue of the `process_image_derivatives` worker.
+    """
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (PROCESSING, "Processing"),
+        (READY, "Ready"),
+        (FAILED, "Failed"),
+    )
+
+    source = models.CharField(
+        max_length=255,
+    )
+    variant = models.CharField(
+        max_length=32,
+    )
+    file = models.ImageField(
+        upload_to=DERIVATIVES_UPLOAD_PATH,
+        blank=True,
+        null=True,
+        width_field="width",
+        height_field="height",
+    )
+    width = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+    )
+    height = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "variant"], name="image_derivative_unique_variant"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["status", "updated_at"], name="image_derivative_queue_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return "%s (%s)" % (self.source, self.variant)
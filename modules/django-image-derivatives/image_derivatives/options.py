@@ -0,0 +1,24 @@
+from django.conf import settings
+
+DERIVATIVES_UPLOAD_PATH = "mediafiles/derivatives/"
+
+# Variants rendered for every registered image field. Images are scaled down to
+# fit in `size`, keeping their aspect ratio, and are never scaled up.
+# Override with IMAGE_DERIVATIVES in settings.py.
+DEFAULT_VARIANTS = {
+    "thumbnail": {"size": (200, 200), "format": "WEBP", "quality": 75},
+    "small": {"size": (480, 480), "format": "WEBP", "quality": 80},
+    "medium": {"size": (1080, 1080), "format": "WEBP", "quality": 80},
+}
+
+
+def get_variants():
+    return getattr(settings, "IMAGE_DERIVATIVES", DEFAULT_VARIANTS)
+
+
+# Worker
+WORKER_BATCH_SIZE = 20
+WORKER_POLL_INTERVAL = 2
+# Derivatives claimed by a worker that died are retried after this many seconds.
+WORKER_CLAIM_TIMEOUT = 10 * 60
+WORKER_MAX_ATTEMPTS = 3
@@ -0,0 +1,218 @@
+import logging
+import os
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from .models import ImageDerivative
+from .options import get_variants, WORKER_CLAIM_TIMEOUT, WORKER_MAX_ATTEMPTS
+
+logger = logging.getLogger(__name__)
+
+# (model, field_name) pairs passed to register()
+_registry = []
+
+
+def enqueue(*names):
+    """
+    Queues the derivatives of the stored images ``names``. A single insert, so
+    it is cheap enough to run on the request path.
+    """
+    ImageDerivative.objects.bulk_create(
+        [
+            ImageDerivative(source=name, variant=variant)
+            for name in names
+            for variant in get_variants()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def discard(name):
+    """
+    Deletes the derivatives of the stored image ``name`` and their files.
+    """
+    derivatives = ImageDerivative.objects.filter(source=name)
+    for derivative in derivatives.exclude(file=""):
+        derivative.file.delete(save=False)
+    derivatives.delete()
+
+
+def discard_unused(name):
+    """
+    Discards the derivatives of the stored image ``name`` unless a registered
+    model still uses it: deduplicated uploads share one stored file between
+    rows.
+    """
+    for model, field_name in _registry:
+        if model._default_manager.filter(**{field_name: name}).exists():
+            return
+    discard(name)
+
+
+def register(model, field_name):
+    """
+    Keeps derivatives of ``model.<field_name>`` up to date: they are queued
+    once the instance is saved, and discarded when it is deleted or its image
+    is replaced.
+    """
+    loaded = "_image_derivatives_%s" % field_name
+
+    def remember_image(sender, instance, **kwargs):
+        # Read from __dict__ so that a deferred field isn't loaded: its
+        # previous image is then unknown and kept.
+        value = instance.__dict__.get(field_name)
+        setattr(instance, loaded, getattr(value, "name", value))
+
+    def queue_derivatives(
+        sender, instance, raw=False, update_fields=None, **kwargs
+    ):
+        # Saved without its image, which is then unchanged and maybe deferred.
+        if update_fields is not None and field_name not in update_fields:
+            return
+        name = getattr(instance, field_name).name
+        previous = getattr(instance, loaded, None)
+        setattr(instance, loaded, name)
+        if raw:
+            return
+        if name:
+            transaction.on_commit(lambda: enqueue(name))
+        if previous and previous != name:
+            transaction.on_commit(lambda: discard_unused(previous))
+
+    def discard_derivatives(sender, instance, **kwargs):
+        name = getattr(instance, field_name).name
+        if name:
+            transaction.on_commit(lambda: discard_unused(name))
+
+    _registry.append((model, field_name))
+    uid = "image_derivatives.%s.%s" % (model._meta.label_lower, field_name)
+    post_init.connect(
+        remember_image, sender=model, weak=False, dispatch_uid=uid + ".init"
+    )
+    post_save.connect(
+        queue_derivatives, sender=model, weak=False, dispatch_uid=uid + ".save"
+    )
+    post_delete.connect(
+        discard_derivatives, sender=model, weak=False, dispatch_uid=uid + ".delete"
+    )
+
+
+def touch(name):
+    """
+    Bumps ``updated_at`` of the rows using the image ``name``, on models that
+    have one, so that HTTP validators and delta syncs pick up new variants.
+    """
+    for model, field_name in _registry:
+        if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+            model._default_manager.filter(**{field_name: name}).update(
+                updated_at=timezone.now()
+            )
+
+
+def claim(batch_size):
+    """
+    Marks up to ``batch_size`` pending derivatives as being processed and
+    returns them. Rows locked by other workers are skipped, and rows claimed by
+    a worker that died are claimed again after ``WORKER_CLAIM_TIMEOUT``.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=WORKER_CLAIM_TIMEOUT)
+    with transaction.atomic():
+        ids = list(
+            ImageDerivative.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ImageDerivative.PENDING)
+                | Q(status=ImageDerivative.PROCESSING, updated_at__lt=stale)
+            )
+            .order_by("updated_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        ImageDerivative.objects.filter(id__in=ids).update(
+            status=ImageDerivative.PROCESSING,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+    return list(ImageDerivative.objects.filter(id__in=ids))
+
+
+def _fail(derivatives):
+    for derivative in derivatives:
+        if derivative.attempts >= WORKER_MAX_ATTEMPTS:
+            derivative.status = ImageDerivative.FAILED
+        else:
+            derivative.status = ImageDerivative.PENDING
+        derivative.save(update_fields=["status", "updated_at"])
+
+
+def _save(derivative, content, spec):
+    stem = os.path.splitext(os.path.basename(derivative.source))[0]
+    extension = spec.get("format", "WEBP").lower()
+    derivative.file.save(
+        "%s_%s.%s" % (stem, derivative.variant, extension),
+        ContentFile(content),
+        save=False,
+    )
+    # Not save(): the derivative is discarded when its original is deleted or
+    # replaced while rendering, and mustn't be inserted again.
+    updated = ImageDerivative.objects.filter(pk=derivative.pk).update(
+        file=derivative.file.name,
+        width=derivative.width,
+        height=derivative.height,
+        status=ImageDerivative.READY,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        derivative.file.delete(save=False)
+
+
+def process(derivatives, executor=None):
+    """
+    Renders claimed derivatives. Every original is read once for all of its
+    variants. With an ``executor`` the rendering runs in parallel, otherwise in
+    the current process.
+    """
+    # Pillow is only needed by the worker, not by every process that imports
+    # this module to register the signal handlers.
+    from .render import render_variants
+
+    variants = get_variants()
+    by_source = defaultdict(list)
+    for derivative in derivatives:
+        if derivative.variant in variants:
+            by_source[derivative.source].append(derivative)
+        else:
+            # The variant was removed from the settings after being queued.
+            derivative.delete()
+
+    jobs = []
+    for source, group in by_source.items():
+        specs = {derivative.variant: variants[derivative.variant] for derivative in group}
+        try:
+            with default_storage.open(source) as original:
+                data = original.read()
+        except (OSError, ValueError):
+            logger.exception("Could not read image %s", source)
+            _fail(group)
+            continue
+        if executor is None:
+            jobs.append((group, specs, None, data))
+        else:
+            jobs.append((group, specs, executor.submit(render_variants, data, specs), None))
+
+    for group, specs, future, data in jobs:
+        try:
+            rendered = future.result() if future else render_variants(data, specs)
+        except Exception:
+            logger.exception("Could not render derivatives of %s", group[0].source)
+            _fail(group)
+            continue
+        for derivative in group:
+            _save(derivative, rendered[derivative.variant], specs[derivative.variant])
+        touch(group[0].source)
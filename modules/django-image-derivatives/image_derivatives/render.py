@@ -0,0 +1,34 @@
+"""
+Image processing run in the worker's process pool. Kept free of Django imports
+so that it can be loaded by freshly spawned processes.
+"""
+import io
+
+from PIL import Image, ImageOps
+
+
+def render_variants(data, variants):
+    """
+    Renders every variant of the image in ``data``.
+    :param data: The original image bytes
+    :param variants: Mapping of variant name to its spec (size, format, quality)
+    :return: Mapping of variant name to the encoded bytes
+    """
+    original = Image.open(io.BytesIO(data))
+    largest = max(max(spec["size"]) for spec in variants.values())
+    # Lets the JPEG decoder downscale while decoding, which is much cheaper
+    # than decoding at full size and resizing afterwards.
+    original.draft("RGB", (largest, largest))
+    original = ImageOps.exif_transpose(original)
+
+    rendered = {}
+    for name, spec in variants.items():
+        image = original.copy()
+        image.thumbnail(spec["size"], Image.LANCZOS)
+        image_format = spec.get("format", "WEBP").upper()
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        output = io.BytesIO()
+        image.save(output, format=image_format, quality=spec.get("quality", 80))
+        rendered[name] = output.getvalue()
+    return rendered
@@ -0,0 +1,42 @@
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from ..models import ImageDerivative
+from ..pipeline import claim, discard, enqueue, process
+
+VARIANTS = {"thumbnail": {"size": (20, 20), "format": "WEBP", "quality": 75}}
+
+
+@override_settings(IMAGE_DERIVATIVES=VARIANTS)
+class ProcessTests(TestCase):
+    def setUp(self):
+        output = io.BytesIO()
+        Image.new("RGB", (64, 48)).save(output, format="PNG")
+        self.source = default_storage.save(
+            "tests/original.png", ContentFile(output.getvalue())
+        )
+        self.addCleanup(default_storage.delete, self.source)
+
+    def test_renders_claimed_derivatives(self):
+        enqueue(self.source)
+        process(claim(10))
+        derivative = ImageDerivative.objects.get(source=self.source)
+        self.addCleanup(derivative.file.delete, save=False)
+        self.assertEqual(derivative.status, ImageDerivative.READY)
+        self.assertEqual((derivative.width, derivative.height), (20, 15))
+        self.assertTrue(default_storage.exists(derivative.file.name))
+
+    def test_discarded_while_rendering_is_not_inserted_again(self):
+        enqueue(self.source)
+        claimed = claim(10)
+        discard(self.source)
+        process(claimed)
+        self.assertFalse(ImageDerivative.objects.exists())
+        # Nor is its file left behind.
+        directory = claimed[0].file.field.upload_to
+        if default_storage.exists(directory):
+            self.assertEqual(default_storage.listdir(directory)[1], [])
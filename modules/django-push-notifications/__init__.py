@@ -0,0 +1 @@
+default_app_config = "modules.push_notifications.apps.PushNotificationsConfig"
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import OutboxNotification
+
+
+class OutboxNotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        "external_user_id",
+        "status",
+        "send_after",
+        "attempts",
+        "notification_id",
+        "updated_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("external_user_id", "notification_id")
+
+
+admin.site.register(OutboxNotification, OutboxNotificationAdmin)
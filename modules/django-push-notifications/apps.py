@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class PushNotificationsConfig(AppConfig):
+    name = "modules.push_notifications"
+    verbose_name = "Push Notifications"
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import time
+from typing import Callable, Dict, List
+
+import aiohttp
+
+from .client import BaseClient
+from .constants import (
+    API_ROOT,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_TIMEOUT,
+    get_header,
+)
+from .instrumentation import RequestMetrics
+from .resilience import CircuitBreaker, RetryPolicy, asend_with_retries
+
+
+class AsyncClient(BaseClient):
+    """
+    asyncio OneSignal REST API client with the same methods as ``Client``.
+    Await them to get an ``aiohttp.ClientResponse`` whose body has already
+    been read (``response.status``, ``await response.json()``).
+
+    Connections are pooled by a single ``aiohttp.ClientSession`` and at most
+    ``max_concurrency`` requests are in flight at once, so large fan-outs can
+    be gathered without flooding the API:
+
+        async with AsyncClient(app_id, rest_api_key) as client:
+            await asyncio.gather(
+                *(client.edit_tags(user_id, body) for user_id in user_ids)
+            )
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        rest_api_key: str,
+        user_auth_key: str = "",
+        api_root: str = API_ROOT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        pool_size: int = None,
+        timeout=DEFAULT_TIMEOUT,
+        session: aiohttp.ClientSession = None,
+        retry: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        listeners: List[Callable[[RequestMetrics], None]] = None,
+    ):
+        """
+        :param max_concurrency: Maximum number of requests in flight; the
+        rest wait for a slot
+        :param pool_size: Maximum number of connections kept open to the API.
+        Defaults to ``max_concurrency``
+        :param timeout: Seconds to wait for the API on each attempt, as a
+        number or a (connect, read) tuple. None waits forever.
+        :param session: Optional ``aiohttp.ClientSession`` to use instead of
+        creating one, e.g. to share its pool between several clients. It is
+        left open when the client is closed.
+        :param retry: Optional ``RetryPolicy`` for failed calls; by default
+        each call is attempted once
+        :param circuit_breaker: Optional ``CircuitBreaker`` to fail fast while
+        the API is down
+        :param listeners: Callables given a ``RequestMetrics`` after each call
+        """
+        super().__init__(app_id, rest_api_key, user_auth_key, api_root, listeners)
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size or max_concurrency
+        self.timeout = timeout
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        # The session and semaphore are created on first use so that they
+        # belong to the running event loop. Sessions passed in belong to the
+        # caller, who closes them.
+        self._owns_session = session is None
+        self.session = session
+        self._semaphore = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+            timeout = aiohttp.ClientTimeout(
+                total=None, sock_connect=connect, sock_read=read
+            )
+        else:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.pool_size)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def close(self):
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        auth_key: str = None,
+        path_params: Dict = None,
+        **kwargs
+    ) -> aiohttp.ClientResponse:
+        if self.session is None:
+            self.session = self._create_session()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        url = self._path(path, **(path_params or {}))
+        headers = get_header(auth_key)
+        attempts = 0
+        received = 0
+
+        async def send():
+            nonlocal attempts, received
+            attempts += 1
+            async with self._semaphore:
+                async with self.session.request(
+                    method, url, headers=headers, **kwargs
+                ) as response:
+                    received = len(await response.read())
+                    return response
+
+        if not self.listeners:
+            return await self._send(send, method)
+        started = time.perf_counter()
+        try:
+            response = await self._send(send, method)
+        except Exception as error:
+            self._emit(method, path, started, attempts, error=error)
+            raise
+        body = kwargs.get("json")
+        self._emit(
+            method,
+            path,
+            started,
+            attempts,
+            response,
+            # aiohttp serializes bodies with json.dumps, as here.
+            request_bytes=0 if body is None else len(json.dumps(body).encode()),
+            response_bytes=received,
+        )
+        return response
+
+    async def _send(self, send, method: str) -> aiohttp.ClientResponse:
+        if self.retry is None and self.circuit_breaker is None:
+            return await send()
+        return await asend_with_retries(
+            send, method, self.retry, self.circuit_breaker
+        )
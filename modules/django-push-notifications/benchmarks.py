@@ -0,0 +1,254 @@
+"""
+Benchmarks of the OneSignal client against the local stand-in server.
+Run from the directory containing this module's package, e.g.:
+
+    python -m push_notifications.benchmarks
+    python -m push_notifications.benchmarks --concurrency 1,8,32 --save base.json
+    python -m push_notifications.benchmarks --compare base.json
+
+The default ``throughput`` suite reports requests per second and p50/p99
+latency of several ``Client`` methods at each concurrency level. With
+``--compare``, the exit status is 1 if any of them got slower than the saved
+run by more than ``--tolerance``.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .client import Client
+from .fake_server import FakeOneSignalServer
+
+# Calls measured by the throughput suite, made with a call number i.
+METHODS = {
+    "create_notification": lambda client, i: client.create_notification(
+        {"include_external_user_ids": [str(i)], "contents": {"en": "Hello"}}
+    ),
+    "view_device": lambda client, i: client.view_device(i),
+    "edit_tags": lambda client, i: client.edit_tags(
+        i, {"tags": {"level": str(i % 10)}}
+    ),
+    "view_devices": lambda client, i: client.view_devices(300, 0),
+    "view_notifications": lambda client, i: client.view_notifications(50, 0),
+}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def time_calls(call, calls):
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(name, samples):
+    print(
+        "{0:<24} mean {1:7.3f} ms   p50 {2:7.3f} ms   p99 {3:7.3f} ms".format(
+            name,
+            statistics.mean(samples) * 1000,
+            percentile(samples, 0.50) * 1000,
+            percentile(samples, 0.99) * 1000,
+        )
+    )
+
+
+def bench_connection_reuse(api_root, calls):
+    """
+    Per-call latency of a new connection per call (what module-level
+    ``requests.post`` did) against a pooled, kept-alive session.
+    """
+
+    def fresh_connection():
+        with Client("app", "key", api_root=api_root) as client:
+            client.create_notification({"contents": {"en": "Hello"}})
+
+    with Client("app", "key", api_root=api_root) as client:
+        reused = time_calls(
+            lambda: client.create_notification({"contents": {"en": "Hello"}}), calls
+        )
+    report("new connection per call", time_calls(fresh_connection, calls))
+    report("pooled session", reused)
+
+
+def bench_fan_out(api_root, calls):
+    """
+    Wall time of ``calls`` edit_tags calls made one after another with
+    ``Client`` against the same calls gathered on an ``AsyncClient``.
+    """
+    from .async_client import AsyncClient
+
+    body = {"tags": {"level": "10"}}
+
+    async def fan_out():
+        async with AsyncClient("app", "key", api_root=api_root) as client:
+            await asyncio.gather(
+                *(client.edit_tags(user_id, body) for user_id in range(calls))
+            )
+
+    started = time.perf_counter()
+    with Client("app", "key", api_root=api_root) as client:
+        for user_id in range(calls):
+            client.edit_tags(user_id, body)
+    serial = time.perf_counter() - started
+    started = time.perf_counter()
+    asyncio.run(fan_out())
+    concurrent = time.perf_counter() - started
+    print("{0} edit_tags calls".format(calls))
+    print("{0:<24} {1:9.1f} ms".format("Client, serial", serial * 1000))
+    print("{0:<24} {1:9.1f} ms".format("AsyncClient, gathered", concurrent * 1000))
+
+
+def bench_throughput(api_root, name, concurrency, calls):
+    """
+    Makes ``calls`` calls of ``METHODS[name]`` from ``concurrency`` threads
+    sharing one client and returns their throughput and latencies.
+    """
+    call = METHODS[name]
+
+    with Client("app", "key", api_root=api_root, pool_size=concurrency) as client:
+
+        def timed(i):
+            started = time.perf_counter()
+            response = call(client, i)
+            return time.perf_counter() - started, response.status_code
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            started = time.perf_counter()
+            results = list(executor.map(timed, range(calls)))
+            elapsed = time.perf_counter() - started
+    samples = [duration for duration, _ in results]
+    return {
+        "method": name,
+        "concurrency": concurrency,
+        "calls": calls,
+        "rps": calls / elapsed,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "errors": sum(1 for _, status in results if status >= 400),
+    }
+
+
+def run_throughput(api_root, methods, levels, calls):
+    print(
+        "{0:<20} {1:>6} {2:>10} {3:>10} {4:>10} {5:>7}".format(
+            "method", "conc", "req/s", "p50 ms", "p99 ms", "errors"
+        )
+    )
+    results = []
+    for name in methods:
+        for concurrency in levels:
+            result = bench_throughput(api_root, name, concurrency, calls)
+            results.append(result)
+            print(
+                "{method:<20} {concurrency:>6} {rps:>10.0f} {p50_ms:>10.3f} "
+                "{p99_ms:>10.3f} {errors:>7}".format(**result)
+            )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns a description of each result that is slower than its match in
+    ``baseline``: lower req/s or higher p99 by more than ``tolerance``.
+    """
+    previous = {(r["method"], r["concurrency"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result["method"], result["concurrency"]))
+        if old is None:
+            continue
+        label = "{0} at concurrency {1}".format(result["method"], result["concurrency"])
+        if result["rps"] < old["rps"] * (1 - tolerance):
+            regressions.append(
+                "{0}: {1:.0f} req/s, was {2:.0f}".format(label, result["rps"], old["rps"])
+            )
+        if result["p99_ms"] > old["p99_ms"] * (1 + tolerance):
+            regressions.append(
+                "{0}: p99 {1:.3f} ms, was {2:.3f}".format(
+                    label, result["p99_ms"], old["p99_ms"]
+                )
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "suite",
+        nargs="?",
+        default="throughput",
+        choices=["throughput", "connections", "fan-out", "all"],
+    )
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument(
+        "--concurrency",
+        default="1,4,16,64",
+        help="Comma-separated concurrency levels of the throughput suite",
+    )
+    parser.add_argument(
+        "--methods",
+        default=",".join(METHODS),
+        help="Comma-separated Client methods of the throughput suite",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=None,
+        help="Seconds the stand-in server waits before answering. Defaults to "
+        "0, and to 0.02 for the fan-out suite",
+    )
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--save", metavar="PATH", help="Write results as JSON")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="Compare results with a saved run"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    options = parser.parse_args()
+    server_options = {
+        "latency": options.latency or 0,
+        "error_rate": options.error_rate,
+        "rate_limit": options.rate_limit,
+    }
+
+    if options.suite in ("connections", "all"):
+        with FakeOneSignalServer(**server_options) as server:
+            bench_connection_reuse(server.api_root, options.calls)
+    if options.suite in ("fan-out", "all"):
+        fan_out_options = dict(server_options)
+        if options.latency is None:
+            fan_out_options["latency"] = 0.02
+        with FakeOneSignalServer(**fan_out_options) as server:
+            bench_fan_out(server.api_root, options.calls)
+    if options.suite not in ("throughput", "all"):
+        return
+
+    levels = [int(level) for level in options.concurrency.split(",")]
+    methods = options.methods.split(",")
+    with FakeOneSignalServer(**server_options) as server:
+        results = run_throughput(server.api_root, methods, levels, options.calls)
+    if options.save:
+        with open(options.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if options.compare:
+        with open(options.compare) as f:
+            regressions = compare(results, json.load(f), options.tolerance)
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
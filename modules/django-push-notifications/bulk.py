@@ -0,0 +1,214 @@
+"""
+Fan-out of per-user operations (``edit_tags``, ``edit_device``) over many
+users, with bounded parallelism, a shared rate limit and 429 handling.
+
+    with Client(app_id, rest_api_key) as client:
+        pairs = ((user.pk, {"tags": tags_for(user)}) for user in users.iterator())
+        for result in bulk_edit_tags(client, pairs):
+            if not result.ok:
+                log_failure(result.key, result.response, result.error)
+
+Results are yielded as calls complete (not in input order) and items are read
+from the iterable only as workers free up, so memory stays bounded however
+many pairs are passed.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import count, islice
+from typing import Any, Callable, Iterable, NamedTuple, Tuple
+
+from .constants import (
+    DEFAULT_BULK_MAX_RETRIES,
+    DEFAULT_BULK_RATE,
+    DEFAULT_BULK_WORKERS,
+)
+from .resilience import parse_retry_after, response_status
+
+
+class BulkResult(NamedTuple):
+    key: Any
+    response: Any = None
+    error: Exception = None
+
+    @property
+    def status(self) -> int:
+        return response_status(self.response) if self.response is not None else None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` calls per second on average, with bursts of up to
+    ``capacity`` calls. Thread-safe, and usable from asyncio through
+    ``acquire_async``. ``pause`` holds back every caller, e.g. after a 429.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Takes a token, returning how many seconds the caller must wait before
+        using it. Tokens go negative while callers are queued for them.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            return max(-self.tokens / self.rate, self.paused_until - now, 0)
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def retry_after(response, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a 429 response: its Retry-After, or an
+    exponential backoff without one.
+    """
+    delay = parse_retry_after(response)
+    return min(2 ** attempt, 60) if delay is None else delay
+
+
+def _call(call, key, body, limiter: TokenBucket, max_retries: int) -> BulkResult:
+    for attempt in count():
+        limiter.acquire()
+        try:
+            response = call(key, body)
+        except Exception as error:
+            return BulkResult(key, error=error)
+        if response_status(response) != 429 or attempt >= max_retries:
+            return BulkResult(key, response)
+        limiter.pause(retry_after(response, attempt))
+
+
+def bulk_call(
+    call: Callable,
+    pairs: Iterable[Tuple[Any, Any]],
+    workers: int = DEFAULT_BULK_WORKERS,
+    rate: float = DEFAULT_BULK_RATE,
+    max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+    limiter: TokenBucket = None,
+):
+    """
+    Calls ``call(key, body)`` for every pair on a pool of ``workers`` threads,
+    at most ``rate`` calls per second, and yields a ``BulkResult`` per pair as
+    each completes. A 429 response pauses all workers for its Retry-After and
+    is retried up to ``max_retries`` times.
+    :param limiter: Optional ``TokenBucket`` to share one rate limit between
+    several bulk runs, instead of ``rate``
+    """
+    limiter = limiter or TokenBucket(rate)
+    pairs = iter(pairs)
+    pending = set()
+    with ThreadPoolExecutor(workers) as executor:
+
+        def submit(n):
+            for key, body in islice(pairs, n):
+                pending.add(
+                    executor.submit(_call, call, key, body, limiter, max_retries)
+                )
+
+        try:
+            submit(workers * 2)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+                submit(len(done))
+                for future in done:
+                    yield future.result()
+        finally:
+            # The caller stopped early: don't start the calls still queued.
+            for future in pending:
+                future.cancel()
+
+
+def bulk_edit_tags(client, pairs: Iterable[Tuple[Any, dict]], **options):
+    """
+    ``Client.edit_tags`` for every (external user id, body) pair. See
+    ``bulk_call`` for the options.
+    """
+    return bulk_call(client.edit_tags, pairs, **options)
+
+
+def bulk_edit_devices(client, pairs: Iterable[Tuple[Any, dict]], **options):
+    """
+    ``Client.edit_device`` for every (player id, body) pair. See
+    ``bulk_call`` for the options.
+    """
+    return bulk_call(client.edit_device, pairs, **options)
+
+
+async def _acall(call, key, body, limiter: TokenBucket, max_retries: int):
+    for attempt in count():
+        await limiter.acquire_async()
+        try:
+            response = await call(key, body)
+        except Exception as error:
+            return BulkResult(key, error=error)
+        if response_status(response) != 429 or attempt >= max_retries:
+            return BulkResult(key, response)
+        limiter.pause(retry_after(response, attempt))
+
+
+async def abulk_call(
+    call: Callable,
+    pairs: Iterable[Tuple[Any, Any]],
+    concurrency: int = DEFAULT_BULK_WORKERS,
+    rate: float = DEFAULT_BULK_RATE,
+    max_retries: int = DEFAULT_BULK_MAX_RETRIES,
+    limiter: TokenBucket = None,
+):
+    """
+    ``bulk_call`` for ``AsyncClient`` methods, as an async generator:
+
+        async for result in abulk_call(client.edit_tags, pairs):
+            ...
+
+    ``concurrency`` tasks run at once instead of threads.
+    """
+    limiter = limiter or TokenBucket(rate)
+    pairs = iter(pairs)
+    pending = set()
+
+    def submit(n):
+        for key, body in islice(pairs, n):
+            pending.add(
+                asyncio.ensure_future(_acall(call, key, body, limiter, max_retries))
+            )
+
+    try:
+        submit(concurrency)
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            submit(len(done))
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,218 @@
+"""
+Response cache for read-mostly OneSignal calls (app details, notifications,
+outcomes) made by dashboards:
+
+    client = Client(app_id, rest_api_key, user_auth_key, cache=ResponseCache())
+
+Successful GET responses of the endpoints in ``ttls`` are kept for their TTL,
+in a bounded in-process LRU or, with ``backend``, in a Django cache shared by
+all processes. Calls that change an app, segment or notification through the
+client invalidate the responses they affect.
+"""
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from .constants import (
+    APP_PATH,
+    APPS_PATH,
+    NOTIFICATION_PATH,
+    SEGMENT_PATH,
+    SEGMENTS_PATH,
+    VIEW_OUTCOMES_PATH,
+)
+
+# Seconds responses of each endpoint are cached for; other endpoints aren't.
+DEFAULT_TTLS = {
+    APPS_PATH: 300,
+    APP_PATH: 300,
+    NOTIFICATION_PATH: 30,
+    VIEW_OUTCOMES_PATH: 60,
+}
+DEFAULT_MAX_ENTRIES = 1024
+KEY_PREFIX = "onesignal:"
+
+# (method, endpoint) of a changing call -> the cached endpoints it affects.
+# Those are invalidated for the same path parameters, e.g. the same app_id.
+INVALIDATES = {
+    ("POST", APPS_PATH): [APPS_PATH],
+    ("PUT", APP_PATH): [APPS_PATH, APP_PATH],
+    ("POST", SEGMENTS_PATH): [APPS_PATH, APP_PATH, VIEW_OUTCOMES_PATH],
+    ("DELETE", SEGMENT_PATH): [APPS_PATH, APP_PATH, VIEW_OUTCOMES_PATH],
+    ("DELETE", NOTIFICATION_PATH): [NOTIFICATION_PATH],
+}
+
+
+class LRUStore:
+    """
+    In-process store with the part of Django's cache API used here. Holds at
+    most ``max_entries`` entries, evicting the least recently used.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self.entries[key]
+                return default
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        expires = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self.entries[key] = (expires, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+class ResponseCache:
+    """
+    :param ttls: Seconds to cache each endpoint template's responses for
+    :param max_entries: Size bound of the in-process store
+    :param backend: Optional Django cache (e.g. ``caches["default"]``) to use
+    instead of the in-process store
+    """
+
+    def __init__(
+        self,
+        ttls: Dict[str, float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        backend=None,
+    ):
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.store = backend if backend is not None else LRUStore(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, int]:
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+        if isinstance(self.store, LRUStore):
+            stats["entries"] = len(self.store.entries)
+            stats["evictions"] = self.store.evictions
+        return stats
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @staticmethod
+    def _scope(endpoint: str, path_params: Dict) -> str:
+        """
+        Responses are invalidated by scope: an endpoint with its path
+        parameters, e.g. ``/apps/{app_id}`` for one app_id.
+        """
+        try:
+            return endpoint.format(**path_params)
+        except KeyError:
+            # The invalidating call lacks a parameter of this endpoint.
+            return None
+
+    def _generation(self, scope: str) -> str:
+        """
+        Token that is part of the keys of a scope's responses; invalidating the
+        scope replaces it. A missing token gets a fresh one, so that responses
+        cached before it was lost (evicted, expired) can't be served again.
+        """
+        key = KEY_PREFIX + "gen:" + scope
+        generation = self.store.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            self.store.set(key, generation, None)
+        return generation
+
+    def _key(self, scope: str, auth_key: str, params) -> str:
+        identity = "|".join(
+            [
+                scope,
+                self._generation(scope),
+                auth_key or "",
+                repr(sorted((params or {}).items())),
+            ]
+        )
+        return KEY_PREFIX + hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def invalidate(self, method: str, endpoint: str, path_params: Dict):
+        for cached in INVALIDATES.get((method, endpoint), ()):
+            scope = self._scope(cached, path_params)
+            if scope is not None:
+                self.store.delete(KEY_PREFIX + "gen:" + scope)
+                self._count("invalidations")
+
+    def request(self, send, method: str, endpoint: str, auth_key, path_params, kwargs):
+        """
+        Returns the cached response for a GET of a cached endpoint, otherwise
+        ``send()``'s, caching or invalidating as needed.
+        """
+        path_params = path_params or {}
+        ttl = self.ttls.get(endpoint)
+        if method != "GET" or ttl is None:
+            response = send()
+            if response.status_code < 400:
+                self.invalidate(method, endpoint, path_params)
+            return response
+        key = self._key(
+            self._scope(endpoint, path_params), auth_key, kwargs.get("params")
+        )
+        cached = self.store.get(key)
+        if cached is not None:
+            self._count("hits")
+            return _rebuild(cached)
+        self._count("misses")
+        response = send()
+        if response.status_code == 200:
+            self.store.set(key, _freeze(response), ttl)
+        return response
+
+
+def _freeze(response: Response) -> Tuple:
+    # Only what callers read, without the request and its Authorization header.
+    return (
+        response.status_code,
+        dict(response.headers),
+        response.content,
+        response.url,
+        response.encoding,
+    )
+
+
+def _rebuild(frozen: Tuple) -> Response:
+    response = Response()
+    status_code, headers, content, url, encoding = frozen
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.url = url
+    response.encoding = encoding
+    return response
@@ -1,9 +1,16 @@
+import logging
+import time
+from typing import Callable, Dict, List
+
 import requests
 from requests import Response
-from os.path import join
+from requests.adapters import HTTPAdapter
 
+from .cache import ResponseCache
 from .constants import (
     API_ROOT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
     NOTIFICATIONS_PATH,
     NOTIFICATION_PATH,
     NOTIFICATION_HISTORY_PATH,
@@ -20,23 +27,90 @@ from .constants import (
     APP_PATH,
     get_header,
 )
+from .instrumentation import RequestMetrics
+from .resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    response_status,
+    send_with_retries,
+)
+
+logger = logging.getLogger(__name__)
 
 
-class Client:
+class BaseClient:
+    """
+    The OneSignal endpoints, shared by ``Client`` and ``AsyncClient``. Each
+    method builds its request and returns whatever the subclass's ``_request``
+    returns: a ``Response`` for ``Client``, an awaitable for ``AsyncClient``.
+    """
+
     def __init__(
         self,
         app_id: str,
         rest_api_key: str,
         user_auth_key: str = "",
         api_root: str = API_ROOT,
+        listeners: List[Callable[[RequestMetrics], None]] = None,
     ):
         self.app_id = app_id
         self.rest_api_key = rest_api_key
         self.user_auth_key = user_auth_key
         self.api_root = api_root
+        self.listeners = list(listeners or [])
+
+    def add_listener(self, listener: Callable[[RequestMetrics], None]):
+        """
+        Calls ``listener`` with a ``RequestMetrics`` after every API call,
+        e.g. a ``MetricsCollector``.
+        """
+        self.listeners.append(listener)
+
+    def _emit(
+        self,
+        method: str,
+        endpoint: str,
+        started: float,
+        attempts: int,
+        response=None,
+        error: Exception = None,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+    ):
+        metrics = RequestMetrics(
+            method,
+            endpoint,
+            None if response is None else response_status(response),
+            time.perf_counter() - started,
+            request_bytes,
+            response_bytes,
+            max(attempts - 1, 0),
+            error,
+        )
+        for listener in self.listeners:
+            try:
+                listener(metrics)
+            except Exception:
+                # Metrics must never break the call they describe.
+                logger.exception("OneSignal metrics listener failed")
 
     def _path(self, path: str, **kwargs) -> str:
-        return join(self.api_root, path.format(**kwargs))
+        return self.api_root.rstrip("/") + path.format(**kwargs)
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        auth_key: str = None,
+        path_params: Dict = None,
+        **kwargs
+    ):
+        """
+        Sends a request to ``path`` (an endpoint template from constants,
+        formatted with ``path_params``). ``kwargs`` follow ``requests``:
+        ``params`` for the query string and ``json`` for the body.
+        """
+        raise NotImplementedError
 
     def create_notification(self, body: Dict) -> Response:
         """
@@ -45,10 +119,10 @@ class Client:
         :param body: Notification parameters (Segments, Filters, User ID).
         :return: Response
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(NOTIFICATIONS_PATH)
         payload = {"app_id": self.app_id, **body}
-        return requests.post(path, headers=header, data=payload)
+        return self._request(
+            "POST", NOTIFICATIONS_PATH, self.rest_api_key, json=payload
+        )
 
     def cancel_notification(self, id: int) -> Response:
         """
@@ -57,10 +131,14 @@ class Client:
         :param id: Notification id
         :return: Response
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(NOTIFICATION_PATH, id=id)
         payload = {"app_id": self.app_id}
-        return requests.delete(path, headers=header, params=payload)
+        return self._request(
+            "DELETE",
+            NOTIFICATION_PATH,
+            self.rest_api_key,
+            path_params={"id": id},
+            params=payload,
+        )
 
     def view_apps(self) -> Response:
         """
@@ -68,9 +146,7 @@ class Client:
         https://documentation.onesignal.com/reference/view-apps-apps
         :return: Response
         """
-        header = get_header(self.user_auth_key)
-        path = self._path(APPS_PATH)
-        return requests.get(path, headers=header)
+        return self._request("GET", APPS_PATH, self.user_auth_key)
 
     def view_app(self, app_id: int) -> Response:
         """
@@ -79,9 +155,9 @@ class Client:
         :param app_id: App id
         :return: Response
         """
-        header = get_header(self.user_auth_key)
-        path = self._path(APP_PATH, app_id=app_id)
-        return requests.get(path, headers=header)
+        return self._request(
+            "GET", APP_PATH, self.user_auth_key, path_params={"app_id": app_id}
+        )
 
     def create_app(self, body: Dict) -> Response:
         """
@@ -90,10 +166,8 @@ class Client:
         :param body: App parameters
         :return: Response
         """
-        header = get_header(self.user_auth_key)
-        path = self._path(APPS_PATH)
         payload = body
-        return requests.post(path, headers=header, data=payload)
+        return self._request("POST", APPS_PATH, self.user_auth_key, json=payload)
 
     def update_app(self, app_id: int, body: Dict) -> Response:
         """
@@ -103,10 +177,14 @@ class Client:
         :param body: App parameters
         :return: Response
         """
-        header = get_header(self.user_auth_key)
-        path = self._path(APP_PATH, app_id=app_id)
         payload = body
-        return requests.post(path, headers=header, data=payload)
+        return self._request(
+            "PUT",
+            APP_PATH,
+            self.user_auth_key,
+            path_params={"app_id": app_id},
+            json=payload,
+        )
 
     def view_devices(self, limit: int, offset: int) -> Response:
         """
@@ -116,10 +194,8 @@ class Client:
         :param offset: Result offset. Default is 0. Results are sorted by id;
         :return: Response
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(DEVICES_PATH)
         payload = {"app_id": self.app_id, "limit": limit, "offset": offset}
-        return requests.get(path, headers=header, params=payload)
+        return self._request("GET", DEVICES_PATH, self.rest_api_key, params=payload)
 
     def view_device(self, id: int) -> Response:
         """
@@ -128,9 +204,8 @@ class Client:
         :param id: Player's OneSignal ID
         :return: Response
         """
-        path = self._path(DEVICE_PATH, id=id)
         payload = {"app_id": self.app_id}
-        return requests.get(path, headers=get_header(), params=payload)
+        return self._request("GET", DEVICE_PATH, path_params={"id": id}, params=payload)
 
     def add_device(self, body: Dict) -> Response:
         """
@@ -143,10 +218,8 @@ class Client:
         :param body: Device parameters
         :return: Response
         """
-        path = self._path(DEVICES_PATH)
-        payload = body
-        payload["app_id"] = self.app_id
-        return requests.post(path, headers=get_header(), data=payload)
+        payload = {**body, "app_id": self.app_id}
+        return self._request("POST", DEVICES_PATH, json=payload)
 
     def edit_device(self, id: int, body: Dict) -> Response:
         """
@@ -156,10 +229,8 @@ class Client:
         :param body: Device parameters
         :return: Response
         """
-        path = self._path(DEVICE_PATH, id=id)
-        payload = body
-        payload["app_id"] = self.app_id
-        return requests.put(path, headers=get_header(), data=payload)
+        payload = {**body, "app_id": self.app_id}
+        return self._request("PUT", DEVICE_PATH, path_params={"id": id}, json=payload)
 
     def edit_tags(self, user_id: int, body: Dict) -> Response:
         """
@@ -171,8 +242,12 @@ class Client:
         :param body: Tags
         :return: Response
         """
-        path = self._path(EDIT_TAGS_PATH, app_id=self.app_id, user_id=user_id)
-        return requests.put(path, headers=get_header(), data=body)
+        return self._request(
+            "PUT",
+            EDIT_TAGS_PATH,
+            path_params={"app_id": self.app_id, "user_id": user_id},
+            json=body,
+        )
 
     def new_session(self, id: int, body: Dict) -> Response:
         """
@@ -181,8 +256,9 @@ class Client:
         :param id: Player's OneSignal ID
         :param body: Body parameters
         """
-        path = self._path(NEW_SESSION_PATH, id=id)
-        return requests.post(path, headers=get_header(), data=body)
+        return self._request(
+            "POST", NEW_SESSION_PATH, path_params={"id": id}, json=body
+        )
 
     def new_purchase(self, id: int, body: Dict) -> Response:
         """
@@ -191,8 +267,9 @@ class Client:
         :param id: Player's OneSignal ID
         :param body: Body parameters
         """
-        path = self._path(NEW_PURCHASE_PATH, id=id)
-        return requests.post(path, headers=get_header(), data=body)
+        return self._request(
+            "POST", NEW_PURCHASE_PATH, path_params={"id": id}, json=body
+        )
 
     def csv_export(self, body: Dict) -> Response:
         """
@@ -200,10 +277,10 @@ class Client:
         https://documentation.onesignal.com/reference/csv-export
         :param body: CSV Export parameters
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(CSV_EXPORT_PATH)
         params = {"app_id": self.app_id}
-        return requests.post(path, headers=header, params=params, data=body)
+        return self._request(
+            "POST", CSV_EXPORT_PATH, self.rest_api_key, params=params, json=body
+        )
 
     def view_notification(self, id: int) -> Response:
         """
@@ -211,10 +288,14 @@ class Client:
         https://documentation.onesignal.com/reference/view-notification
         :param id: Required - Notification ID
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(NOTIFICATION_PATH, id=id)
         params = {"app_id": self.app_id}
-        return requests.get(path, headers=header, params=params)
+        return self._request(
+            "GET",
+            NOTIFICATION_PATH,
+            self.rest_api_key,
+            path_params={"id": id},
+            params=params,
+        )
 
     def view_notifications(
         self, limit: int = 50, offset: int = 0, kind: int = None
@@ -233,12 +314,12 @@ class Client:
         1 - API only
         3 - Automated only
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(NOTIFICATIONS_PATH)
         params = {"app_id": self.app_id, "limit": limit, "offset": offset}
-        if kind:
+        if kind is not None:
             params["kind"] = kind
-        return requests.get(path, headers=header, params=params)
+        return self._request(
+            "GET", NOTIFICATIONS_PATH, self.rest_api_key, params=params
+        )
 
     def view_notification_history(self, notification_id: int, body: Dict) -> Response:
         """
@@ -249,11 +330,14 @@ class Client:
         within the Message Report.
         :param body: Body params
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(NOTIFICATION_HISTORY_PATH, id=notification_id)
-        payload = body
-        payload["app_id"] = self.app_id
-        return requests.post(path, headers=header, data=payload)
+        payload = {**body, "app_id": self.app_id}
+        return self._request(
+            "POST",
+            NOTIFICATION_HISTORY_PATH,
+            self.rest_api_key,
+            path_params={"id": notification_id},
+            json=payload,
+        )
 
     def create_segments(self, body: Dict) -> Response:
         """
@@ -262,9 +346,13 @@ class Client:
         https://documentation.onesignal.com/reference/create-segments
         :param body: Body params
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(SEGMENTS_PATH, app_id=self.app_id)
-        return requests.post(path, headers=header, data=body)
+        return self._request(
+            "POST",
+            SEGMENTS_PATH,
+            self.rest_api_key,
+            path_params={"app_id": self.app_id},
+            json=body,
+        )
 
     def delete_segments(self, segment_id: int) -> Response:
         """
@@ -273,9 +361,12 @@ class Client:
         :param segment_id: The segment_id can be found in the URL of the segment
         when viewing it in the dashboard.
         """
-        header = get_header(self.rest_api_key)
-        path = self._path(SEGMENT_PATH, app_id=self.app_id, segment_id=segment_id)
-        return requests.delete(path, headers=header)
+        return self._request(
+            "DELETE",
+            SEGMENT_PATH,
+            self.rest_api_key,
+            path_params={"app_id": self.app_id, "segment_id": segment_id},
+        )
 
     def view_outcomes(
         self,
@@ -319,7 +410,6 @@ class Client:
 
         Default is total (returns direct+influenced+unattributed) if the parameter is omitted.
         """
-        header = get_header(self.rest_api_key)
         params = {"outcome_names": outcome_names}
         if outcome_names_array:
             params["outcome_names_array"] = outcome_names_array
@@ -329,5 +419,142 @@ class Client:
             params["outcome_platforms"] = outcome_platforms
         if outcome_attribution:
             params["outcome_attribution"] = outcome_attribution
-        path = self._path(VIEW_OUTCOMES_PATH, app_id=self.app_id)
-        return requests.get(path, headers=header, params=params)
+        return self._request(
+            "GET",
+            VIEW_OUTCOMES_PATH,
+            self.rest_api_key,
+            path_params={"app_id": self.app_id},
+            params=params,
+        )
+
+
+class Client(BaseClient):
+    """
+    OneSignal REST API client. Requests go through a pooled ``requests.Session``
+    so that connections (and their TLS handshakes) are reused between calls.
+    Close the client when done, or use it as a context manager:
+
+        with Client(app_id, rest_api_key) as client:
+            client.create_notification(body)
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        rest_api_key: str,
+        user_auth_key: str = "",
+        api_root: str = API_ROOT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        session: requests.Session = None,
+        retry: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        listeners: List[Callable[[RequestMetrics], None]] = None,
+        cache: ResponseCache = None,
+    ):
+        """
+        :param pool_size: Maximum number of connections kept open to the API
+        :param timeout: Seconds to wait for the API on each attempt, as a
+        number or a (connect, read) tuple. None waits forever.
+        :param session: Optional session to use instead of creating one, e.g.
+        to share its pool between several clients. It is left open when the
+        client is closed.
+        :param retry: Optional ``RetryPolicy`` for failed calls; by default
+        each call is attempted once
+        :param circuit_breaker: Optional ``CircuitBreaker`` to fail fast while
+        the API is down
+        :param listeners: Callables given a ``RequestMetrics`` after each call
+        :param cache: Optional ``ResponseCache`` for app, notification and
+        outcome details; cached responses are returned without a call
+        """
+        super().__init__(app_id, rest_api_key, user_auth_key, api_root, listeners)
+        self.timeout = timeout
+        self.cache = cache
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        # Sessions passed in belong to the caller, who closes them.
+        self._owns_session = session is None
+        self.session = session or self._create_session(pool_size)
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        auth_key: str = None,
+        path_params: Dict = None,
+        **kwargs
+    ) -> Response:
+        if self.cache is None:
+            return self._call(method, path, auth_key, path_params, **kwargs)
+        return self.cache.request(
+            lambda: self._call(method, path, auth_key, path_params, **kwargs),
+            method,
+            path,
+            auth_key,
+            path_params,
+            kwargs,
+        )
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        auth_key: str = None,
+        path_params: Dict = None,
+        **kwargs
+    ) -> Response:
+        url = self._path(path, **(path_params or {}))
+        headers = get_header(auth_key)
+        timeout = self.timeout
+        attempts = 0
+
+        def send(timeout):
+            nonlocal attempts
+            attempts += 1
+            return self.session.request(
+                method, url, headers=headers, timeout=timeout, **kwargs
+            )
+
+        if not self.listeners:
+            return self._send(send, method, timeout)
+        started = time.perf_counter()
+        try:
+            response = self._send(send, method, timeout)
+        except Exception as error:
+            self._emit(method, path, started, attempts, error=error)
+            raise
+        self._emit(
+            method,
+            path,
+            started,
+            attempts,
+            response,
+            request_bytes=len(response.request.body or b""),
+            response_bytes=len(response.content),
+        )
+        return response
+
+    def _send(self, send, method: str, timeout) -> Response:
+        if self.retry is None and self.circuit_breaker is None:
+            return send(timeout)
+        return send_with_retries(
+            send, method, timeout, self.retry, self.circuit_breaker
+        )
@@ -1,9 +1,34 @@
+from typing import Dict
+
 # Requests config
 JSON_HEADER = {"Content-Type": "application/json; charset=utf-8"}
+# Seconds to wait for a connection and for the response.
+DEFAULT_TIMEOUT = (3.05, 10)
+# Connections kept open to the API by each client.
+DEFAULT_POOL_SIZE = 10
+# Requests an AsyncClient has in flight at once; the rest wait their turn.
+DEFAULT_MAX_CONCURRENCY = 50
+# Retries: attempts after the first, and the base and maximum backoff in seconds.
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30
+# Circuit breaker: failures in a row that open it, seconds before a probe.
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 30
+# Bulk operations: parallel calls, calls per second (OneSignal rate limits
+# per app, so keep this within your plan's limit) and retries of a 429.
+DEFAULT_BULK_WORKERS = 10
+DEFAULT_BULK_RATE = 50
+DEFAULT_BULK_MAX_RETRIES = 5
+# CSV exports: seconds between checks that the file is ready, seconds to wait
+# for it in all, and rows per bulk_create batch or columnar chunk.
+CSV_EXPORT_POLL_INTERVAL = 5
+CSV_EXPORT_WAIT_TIMEOUT = 30 * 60
+CSV_EXPORT_BATCH_SIZE = 1000
 
 
 def get_header(auth_key: str = None) -> Dict:
-    header = JSON_HEADER
+    header = dict(JSON_HEADER)
     if auth_key:
         header["Authorization"] = f"Basic {auth_key}"
     return header
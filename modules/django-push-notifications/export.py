@@ -0,0 +1,186 @@
+"""
+Download and parse a OneSignal CSV export of all of an app's devices in
+constant memory, however large the export is:
+
+    with Client(app_id, rest_api_key) as client:
+        for record in iter_export_records(client):
+            ...
+
+``csv_export`` only starts an export. The gzipped CSV then appears at the
+returned URL once OneSignal has built it, which is polled for, streamed,
+decompressed and parsed a row at a time.
+"""
+import csv
+import gzip
+import io
+import json
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from requests import Response
+
+from .constants import (
+    CSV_EXPORT_BATCH_SIZE,
+    CSV_EXPORT_POLL_INTERVAL,
+    CSV_EXPORT_WAIT_TIMEOUT,
+)
+
+
+def _bool(value: str) -> bool:
+    return value.lower() in ("1", "t", "true", "yes")
+
+
+def _datetime(value: str):
+    """
+    An aware datetime in UTC. Exports write timestamps in UTC, with a
+    " UTC" or "Z" suffix or none at all.
+    """
+    try:
+        parsed = datetime.fromisoformat(
+            value.replace(" UTC", "+00:00").replace("Z", "+00:00")
+        )
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+# Parsers for the typed columns of an export; other columns stay strings.
+COLUMN_TYPES = {
+    "session_count": int,
+    "device_type": int,
+    "timezone": int,
+    "playtime": int,
+    "badge_count": int,
+    "notification_types": int,
+    "amount_spent": float,
+    "lat": float,
+    "long": float,
+    "invalid_identifier": _bool,
+    "tags": json.loads,
+    "created_at": _datetime,
+    "last_active": _datetime,
+}
+
+
+def start_export(client, body: Dict = None) -> str:
+    """
+    Starts an export with ``Client.csv_export`` and returns the URL the
+    gzipped CSV will be available at.
+    """
+    response = client.csv_export(body or {})
+    response.raise_for_status()
+    return response.json()["csv_file_url"]
+
+
+def download_export(
+    client,
+    url: str,
+    poll_interval: float = CSV_EXPORT_POLL_INTERVAL,
+    wait_timeout: float = CSV_EXPORT_WAIT_TIMEOUT,
+) -> Response:
+    """
+    Waits for the export at ``url`` to be ready and returns its streamed
+    response, whose body hasn't been read yet. Close it when done. Raises
+    ``TimeoutError`` if it isn't ready within ``wait_timeout`` seconds.
+    """
+    deadline = time.monotonic() + wait_timeout
+    while True:
+        # The file is on OneSignal's storage, which doesn't take the API key.
+        response = client.session.get(url, stream=True, timeout=client.timeout)
+        if response.status_code == 200:
+            return response
+        response.close()
+        # Not built yet: the storage answers 403 or 404 until it is.
+        if response.status_code not in (403, 404):
+            response.raise_for_status()
+        if time.monotonic() + poll_interval > deadline:
+            raise TimeoutError(
+                "CSV export not ready after %ss: %s" % (wait_timeout, url)
+            )
+        time.sleep(poll_interval)
+
+
+def parse_export(
+    fileobj, types: Dict[str, Callable] = COLUMN_TYPES
+) -> Iterator[Dict]:
+    """
+    Yields the rows of a gzipped CSV export read from the binary ``fileobj``
+    as dicts, with the columns in ``types`` parsed and empty values as None.
+    """
+    text = io.TextIOWrapper(
+        gzip.GzipFile(fileobj=fileobj), encoding="utf-8", newline=""
+    )
+    for row in csv.DictReader(text):
+        for column, value in row.items():
+            if value == "" or value is None:
+                row[column] = None
+            elif column in types:
+                try:
+                    row[column] = types[column](value)
+                except ValueError:
+                    pass
+        yield row
+
+
+def iter_export_records(
+    client, body: Dict = None, types: Dict[str, Callable] = COLUMN_TYPES, **options
+) -> Iterator[Dict]:
+    """
+    Exports the client's app and yields its devices one parsed row at a time.
+    ``options`` are passed to ``download_export``.
+    """
+    url = start_export(client, body)
+    with download_export(client, url, **options) as response:
+        # Read the body as sent, still gzipped, and decompress it ourselves.
+        response.raw.decode_content = False
+        yield from parse_export(response.raw, types)
+
+
+def iter_columns(
+    records: Iterable[Dict], size: int = CSV_EXPORT_BATCH_SIZE
+) -> Iterator[Dict[str, List]]:
+    """
+    Groups records into column-oriented chunks of up to ``size`` rows:
+    ``{"id": [...], "session_count": [...], ...}``.
+    """
+    records = iter(records)
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield {column: [row.get(column) for row in batch] for column in batch[0]}
+
+
+def load_export(
+    client,
+    model,
+    body: Dict = None,
+    to_fields: Callable[[Dict], Dict] = None,
+    batch_size: int = CSV_EXPORT_BATCH_SIZE,
+    ignore_conflicts: bool = False,
+    **options
+) -> int:
+    """
+    Exports the client's app into the Django ``model``'s table with
+    ``bulk_create``, ``batch_size`` rows at a time, and returns the number of
+    rows loaded. ``to_fields(record)`` returns the model's field values for a
+    record; by default, the columns named like one of the model's fields.
+    """
+    if to_fields is None:
+        names = {field.attname for field in model._meta.concrete_fields}
+
+        def to_fields(record):
+            return {name: value for name, value in record.items() if name in names}
+
+    records = iter_export_records(client, body, **options)
+    loaded = 0
+    while True:
+        batch = [model(**to_fields(record)) for record in islice(records, batch_size)]
+        if not batch:
+            return loaded
+        model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+        loaded += len(batch)
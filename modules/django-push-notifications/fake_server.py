@@ -0,0 +1,380 @@
+"""
+A local stand-in for the OneSignal API, for benchmarks and tests that must not
+hit onesignal.com.
+
+    with FakeOneSignalServer() as server:
+        client = Client(app_id, rest_api_key, api_root=server.api_root)
+
+It answers every endpoint in ``constants`` with responses shaped like the real
+API's, over ``devices`` generated devices and ``notifications`` generated
+notifications (paginated like the API), and serves the gzipped CSV of a
+``csv_export``. Unknown paths get a 404.
+
+Its behaviour under load can be tuned with:
+
+- ``latency``: seconds to wait before each response.
+- ``error_rate``: fraction of requests answered with a 500, at random.
+- ``rate_limit``: requests per second allowed. Requests beyond it get a 429
+  with a Retry-After.
+- ``faults``: an iterable giving, for each request in turn, None to answer
+  normally, an HTTP status to answer with (e.g. 503), RESET to drop the
+  connection without answering, or a number of seconds to stall before
+  answering (to trip client timeouts). Requests beyond its end are answered
+  normally, so ``itertools.cycle`` suits a repeating pattern.
+"""
+import csv
+import gzip
+import io
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .constants import (
+    APP_PATH,
+    APPS_PATH,
+    CSV_EXPORT_PATH,
+    DEVICE_PATH,
+    DEVICES_PATH,
+    EDIT_TAGS_PATH,
+    NEW_PURCHASE_PATH,
+    NEW_SESSION_PATH,
+    NOTIFICATION_HISTORY_PATH,
+    NOTIFICATION_PATH,
+    NOTIFICATIONS_PATH,
+    SEGMENT_PATH,
+    SEGMENTS_PATH,
+    VIEW_OUTCOMES_PATH,
+)
+
+RESET = "reset"
+API_PREFIX = "/api/v1"
+EXPORT_PREFIX = "/exports/"
+EXPORT_COLUMNS = (
+    "id",
+    "identifier",
+    "session_count",
+    "language",
+    "timezone",
+    "device_type",
+    "tags",
+    "created_at",
+    "last_active",
+    "amount_spent",
+    "invalid_identifier",
+)
+
+
+def _template_pattern(template: str):
+    """
+    ``/players/{id}`` -> a regex matching ``/api/v1/players/<id>``.
+    """
+    pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(template))
+    return re.compile("^%s%s$" % (re.escape(API_PREFIX), pattern))
+
+
+def _device_id(index: int) -> str:
+    return "%08x-0000-4000-8000-000000000000" % index
+
+
+def _device(index: int) -> dict:
+    return {
+        "id": _device_id(index),
+        "identifier": "%064x" % index,
+        "session_count": index % 100,
+        "language": "en",
+        "timezone": -28800,
+        "device_type": index % 2,
+        "tags": {"level": str(index % 10)},
+        "created_at": 1600000000 + index,
+        "last_active": 1600000000 + index * 2,
+        "amount_spent": 0.0,
+        "invalid_identifier": False,
+    }
+
+
+def _notification(index: int) -> dict:
+    return {
+        "id": "%08x-0000-4000-9000-000000000000" % index,
+        "successful": 10,
+        "failed": 0,
+        "converted": 1,
+        "remaining": 0,
+        "queued_at": 1600000000 - index,
+        "contents": {"en": "Notification %s" % index},
+    }
+
+
+def _app(app_id: str) -> dict:
+    return {"id": app_id, "name": "Fake app", "players": 0, "messageable_players": 0}
+
+
+class _RateLimit:
+    """
+    Token bucket allowing ``rate`` requests per second, in bursts of up to
+    ``rate``. ``take`` returns 0 for an allowed request, else the seconds
+    until the next one would be.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+class FakeOneSignalHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive, like the real API.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    routes = [
+        ("POST", CSV_EXPORT_PATH, "csv_export"),
+        ("GET", NOTIFICATIONS_PATH, "list_notifications"),
+        ("POST", NOTIFICATIONS_PATH, "create_notification"),
+        ("GET", NOTIFICATION_PATH, "view_notification"),
+        ("DELETE", NOTIFICATION_PATH, "success"),
+        ("POST", NOTIFICATION_HISTORY_PATH, "notification_history"),
+        ("GET", DEVICES_PATH, "list_devices"),
+        ("POST", DEVICES_PATH, "created"),
+        ("GET", DEVICE_PATH, "view_device"),
+        ("PUT", DEVICE_PATH, "success"),
+        ("POST", NEW_SESSION_PATH, "success"),
+        ("POST", NEW_PURCHASE_PATH, "success"),
+        ("GET", APPS_PATH, "list_apps"),
+        ("POST", APPS_PATH, "create_app"),
+        ("GET", APP_PATH, "view_app"),
+        ("PUT", APP_PATH, "view_app"),
+        ("PUT", EDIT_TAGS_PATH, "success"),
+        ("POST", SEGMENTS_PATH, "created"),
+        ("DELETE", SEGMENT_PATH, "success"),
+        ("GET", VIEW_OUTCOMES_PATH, "view_outcomes"),
+    ]
+    routes = [
+        (method, _template_pattern(template), name) for method, template, name in routes
+    ]
+
+    def dispatch(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        fault = self.server.next_fault()
+        if fault == RESET:
+            self.close_connection = True
+            return
+        if isinstance(fault, float):
+            time.sleep(fault)
+        elif isinstance(fault, int):
+            return self.send_json(fault, {"errors": ["Injected fault"]})
+        if self.server.should_fail():
+            return self.send_json(500, {"errors": ["Injected error"]})
+        wait = self.server.rate_limit.take() if self.server.rate_limit else 0
+        if wait:
+            return self.send_json(
+                429,
+                {"errors": ["API rate limit exceeded"]},
+                {"Retry-After": "%.3f" % wait},
+            )
+        url = urlsplit(self.path)
+        self.query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        self.json_body = json.loads(body) if body else {}
+        if self.command == "GET" and url.path.startswith(EXPORT_PREFIX):
+            return self.download_export()
+        for method, pattern, name in self.routes:
+            match = pattern.match(url.path)
+            if match and method == self.command:
+                return getattr(self, name)(**match.groupdict())
+        self.send_json(404, {"errors": ["Not found"]})
+
+    do_GET = do_POST = do_PUT = do_DELETE = dispatch
+
+    def page(self, key: str, count: int, make, max_limit: int):
+        limit = min(int(self.query.get("limit", max_limit)), max_limit)
+        offset = int(self.query.get("offset", 0))
+        records = [make(index) for index in range(offset, min(offset + limit, count))]
+        self.send_json(
+            200,
+            {"total_count": count, "offset": offset, "limit": limit, key: records},
+        )
+
+    def success(self, **kwargs):
+        self.send_json(200, {"success": True})
+
+    def created(self, **kwargs):
+        self.send_json(200, {"success": True, "id": str(uuid.uuid4())})
+
+    def create_notification(self):
+        self.send_json(200, {"id": str(uuid.uuid4()), "recipients": 1})
+
+    def list_notifications(self):
+        self.page("notifications", self.server.notifications, _notification, 50)
+
+    def view_notification(self, id):
+        self.send_json(200, dict(_notification(0), id=id))
+
+    def notification_history(self, id):
+        self.send_json(
+            200,
+            {"success": True, "destination_url": self.export_url()},
+        )
+
+    def list_devices(self):
+        self.page("players", self.server.devices, _device, 300)
+
+    def view_device(self, id):
+        self.send_json(200, dict(_device(0), id=id))
+
+    def list_apps(self):
+        self.send_json(200, [_app(str(uuid.UUID(int=0)))])
+
+    def create_app(self):
+        self.send_json(200, dict(_app(str(uuid.uuid4())), **self.json_body))
+
+    def view_app(self, app_id):
+        self.send_json(200, dict(_app(app_id), **self.json_body))
+
+    def view_outcomes(self, app_id):
+        names = self.query.get("outcome_names", "")
+        outcomes = [
+            {"id": name.split(".")[0], "value": 0, "aggregation": name.split(".")[-1]}
+            for name in names.split(",")
+            if name
+        ]
+        self.send_json(200, {"outcomes": outcomes})
+
+    def export_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return "http://%s:%s%s%s.csv.gz" % (host, port, EXPORT_PREFIX, uuid.uuid4())
+
+    def csv_export(self):
+        self.send_json(200, {"csv_file_url": self.export_url()})
+
+    def download_export(self):
+        """
+        Streams a gzipped CSV of the devices without building it in memory;
+        without a Content-Length, the end of the body is the connection's.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/gzip")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        with gzip.GzipFile(fileobj=self.wfile, mode="wb") as compressed:
+            text = io.TextIOWrapper(compressed, encoding="utf-8", newline="")
+            writer = csv.writer(text)
+            writer.writerow(EXPORT_COLUMNS)
+            for index in range(self.server.devices):
+                device = _device(index)
+                device["tags"] = json.dumps(device["tags"])
+                for column in ("created_at", "last_active"):
+                    device[column] = time.strftime(
+                        "%Y-%m-%d %H:%M:%S", time.gmtime(device[column])
+                    )
+                writer.writerow([device[column] for column in EXPORT_COLUMNS])
+            text.flush()
+            text.detach()
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for a burst of concurrent connections from an AsyncClient.
+    request_queue_size = 128
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.faults = iter(())
+        self.faults_lock = threading.Lock()
+        self.random = random.Random(0)
+
+    def handle_error(self, request, client_address):
+        # Clients giving up on stalled responses are expected, not errors.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def next_fault(self):
+        with self.faults_lock:
+            return next(self.faults, None)
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self.faults_lock:
+            return self.random.random() < self.error_rate
+
+
+class FakeOneSignalServer:
+    """
+    Serves ``handler_class`` on a free local port from a background thread.
+    See the module docstring for the options.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        handler_class=None,
+        latency: float = 0,
+        error_rate: float = 0,
+        rate_limit: float = None,
+        faults=(),
+        devices: int = 1000,
+        notifications: int = 200,
+    ):
+        self.httpd = _HTTPServer((host, port), handler_class or FakeOneSignalHandler)
+        self.httpd.latency = latency
+        self.httpd.error_rate = error_rate
+        self.httpd.rate_limit = _RateLimit(rate_limit) if rate_limit else None
+        self.httpd.faults = iter(faults)
+        self.httpd.devices = devices
+        self.httpd.notifications = notifications
+        self.thread = None
+
+    @property
+    def api_root(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return "http://%s:%s%s" % (host, port, API_PREFIX)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,168 @@
+"""
+Metrics for OneSignal API calls. A client calls each of its listeners with a
+``RequestMetrics`` after every call; ``MetricsCollector`` is a listener that
+aggregates them into per-endpoint histograms, which ``prometheus_text``
+renders in the Prometheus exposition format:
+
+    metrics = MetricsCollector()
+    client = Client(app_id, rest_api_key, listeners=[metrics])
+    ...
+    return HttpResponse(prometheus_text(metrics), content_type=CONTENT_TYPE)
+
+Clients without listeners skip the measurements altogether.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Tuple
+
+# Content type of prometheus_text's output.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Upper bounds in seconds of the latency histogram's buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class RequestMetrics(NamedTuple):
+    """
+    One API call, including its retries. ``endpoint`` is the path template
+    from constants (``/players/{id}``), so calls to different ids share it.
+    ``status`` is None when the call raised ``error``.
+    """
+
+    method: str
+    endpoint: str
+    status: int
+    latency: float
+    request_bytes: int
+    response_bytes: int
+    retries: int
+    error: Exception = None
+
+
+class Histogram:
+    """
+    Counts observations into fixed ``buckets`` (upper bounds), plus one for
+    anything larger.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """
+        (upper bound, observations up to it) pairs, ending with infinity.
+        """
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Upper bound of the bucket holding the ``fraction`` percentile.
+        """
+        target = fraction * self.count
+        for bound, total in self.cumulative():
+            if total >= target and total:
+                return bound
+        return 0.0
+
+
+class Series:
+    def __init__(self, buckets):
+        self.latency = Histogram(buckets)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+
+
+class MetricsCollector:
+    """
+    Thread-safe listener aggregating calls by (method, endpoint, status), with
+    status "error" for calls that raised.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.series: Dict[Tuple[str, str, str], Series] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics: RequestMetrics):
+        status = "error" if metrics.status is None else str(metrics.status)
+        key = (metrics.method, metrics.endpoint, status)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = Series(self.buckets)
+            series.latency.observe(metrics.latency)
+            series.request_bytes += metrics.request_bytes
+            series.response_bytes += metrics.response_bytes
+            series.retries += metrics.retries
+
+    def reset(self):
+        with self._lock:
+            self.series = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key, **extra) -> str:
+    method, endpoint, status = key
+    labels = dict(method=method, endpoint=endpoint, status=status, **extra)
+    return ",".join('%s="%s"' % (name, _escape(value)) for name, value in labels.items())
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def prometheus_text(collector: MetricsCollector, prefix: str = "onesignal") -> str:
+    """
+    Renders ``collector``'s metrics in the Prometheus text exposition format.
+    """
+    with collector._lock:
+        series = sorted(collector.series.items())
+        lines = []
+
+        def counter(name, help, attribute):
+            lines.append("# HELP %s_%s %s" % (prefix, name, help))
+            lines.append("# TYPE %s_%s counter" % (prefix, name))
+            for key, value in series:
+                lines.append(
+                    "%s_%s{%s} %s" % (prefix, name, _labels(key), attribute(value))
+                )
+
+        counter("requests_total", "OneSignal API calls.", lambda s: s.latency.count)
+        name = "%s_request_duration_seconds" % prefix
+        lines.append("# HELP %s OneSignal API call latency, retries included." % name)
+        lines.append("# TYPE %s histogram" % name)
+        for key, value in series:
+            for bound, total in value.latency.cumulative():
+                lines.append(
+                    "%s_bucket{%s} %s" % (name, _labels(key, le=_bound(bound)), total)
+                )
+            lines.append("%s_sum{%s} %r" % (name, _labels(key), value.latency.sum))
+            lines.append("%s_count{%s} %s" % (name, _labels(key), value.latency.count))
+        counter(
+            "request_bytes_total",
+            "Bytes of request bodies sent.",
+            lambda s: s.request_bytes,
+        )
+        counter(
+            "response_bytes_total",
+            "Bytes of response bodies received.",
+            lambda s: s.response_bytes,
+        )
+        counter("retries_total", "Retried attempts.", lambda s: s.retries)
+    return "\n".join(lines) + "\n"
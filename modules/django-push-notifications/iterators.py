@@ -0,0 +1,67 @@
+"""
+Generators over every device or notification of an app, walking the API's
+offset pagination for the caller:
+
+    with Client(app_id, rest_api_key) as client:
+        for device in iter_devices(client):
+            ...
+
+The next page is fetched in the background while the caller works through the
+current one, so at most two pages are held in memory at a time.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator
+
+from requests import Response
+
+# Largest pages the API returns for each endpoint.
+DEVICES_PAGE_SIZE = 300
+NOTIFICATIONS_PAGE_SIZE = 50
+
+
+def iter_pages(
+    fetch: Callable[[int], Response], key: str, limit: int, offset: int = 0
+) -> Iterator[Dict]:
+    """
+    Yields the records under ``key`` of each page returned by
+    ``fetch(offset)``, prefetching the following page. Stops at a short page
+    or once ``total_count`` records have been seen, and raises
+    ``requests.HTTPError`` for an error response.
+    """
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(fetch, offset)
+        while future is not None:
+            response = future.result()
+            response.raise_for_status()
+            data = response.json()
+            records = data.get(key) or []
+            offset += len(records)
+            total = data.get("total_count")
+            if len(records) < limit or (total is not None and offset >= total):
+                future = None
+            else:
+                future = executor.submit(fetch, offset)
+            yield from records
+
+
+def iter_devices(client, page_size: int = DEVICES_PAGE_SIZE) -> Iterator[Dict]:
+    """
+    Every device (player) of the client's app, from ``Client.view_devices``.
+    """
+    return iter_pages(
+        lambda offset: client.view_devices(page_size, offset), "players", page_size
+    )
+
+
+def iter_notifications(
+    client, page_size: int = NOTIFICATIONS_PAGE_SIZE, kind: int = None
+) -> Iterator[Dict]:
+    """
+    Every notification of the client's app, newest first, from
+    ``Client.view_notifications``. ``kind`` filters them as there.
+    """
+    return iter_pages(
+        lambda offset: client.view_notifications(page_size, offset, kind),
+        "notifications",
+        page_size,
+    )
@@ -0,0 +1,57 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from ...options import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_CONCURRENCY,
+    OUTBOX_POLL_INTERVAL,
+    get_client,
+)
+from ...outbox import claim, send
+
+
+class Command(BaseCommand):
+    help = "Sends the notifications queued in the push notification outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=OUTBOX_CONCURRENCY,
+            help="Number of OneSignal calls made in parallel",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+            help="Number of queued notifications claimed at a time",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=OUTBOX_POLL_INTERVAL,
+            help="Seconds to wait when nothing is due",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once nothing is due instead of waiting for more work",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        sent = 0
+        with get_client(pool_size=concurrency) as client, ThreadPoolExecutor(
+            max_workers=concurrency
+        ) as executor:
+            while True:
+                notifications = claim(options["batch_size"])
+                if notifications:
+                    sent += send(client, notifications, executor)
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        self.stdout.write(self.style.SUCCESS("Sent %d notifications" % sent))
@@ -0,0 +1,74 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxNotification",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "content",
+                    models.TextField(
+                        help_text="create_notification body as JSON, without recipients"
+                    ),
+                ),
+                ("content_hash", models.CharField(max_length=64)),
+                (
+                    "external_user_id",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "send_after",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "batch_id",
+                    models.UUIDField(
+                        blank=True,
+                        help_text="Idempotency key of the call this notification is sent in",
+                        null=True,
+                    ),
+                ),
+                ("notification_id", models.CharField(blank=True, max_length=64)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sending", "Sending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "send_after"], name="push_outbox_queue_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxNotification(models.Model):
+    """
+    A notification waiting to be sent to one user (or, without an
+    external_user_id, to the audience its content targets). Rows sharing
+    content are sent together by the `send_push_notifications` worker.
+    """
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (SENDING, "Sending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    )
+
+    content = models.TextField(
+        help_text="create_notification body as JSON, without recipients",
+    )
+    content_hash = models.CharField(
+        max_length=64,
+    )
+    external_user_id = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+    )
+    batch_id = models.UUIDField(
+        blank=True,
+        null=True,
+        help_text="Idempotency key of the call this notification is sent in",
+    )
+    notification_id = models.CharField(
+        max_length=64,
+        blank=True,
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+    )
+    error = models.TextField(
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "send_after"], name="push_outbox_queue_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return "%s (%s)" % (self.external_user_id or "audience", self.status)
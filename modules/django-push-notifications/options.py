@@ -0,0 +1,29 @@
+from django.conf import settings
+
+from .client import Client
+from .constants import API_ROOT
+
+
+def get_client(**kwargs) -> Client:
+    """
+    Client for the app set by ONESIGNAL_APP_ID and ONESIGNAL_REST_API_KEY in
+    settings.py. ONESIGNAL_API_ROOT optionally points it at another server,
+    e.g. the local stand-in of fake_server.py.
+    """
+    kwargs.setdefault(
+        "api_root", getattr(settings, "ONESIGNAL_API_ROOT", API_ROOT)
+    )
+    return Client(settings.ONESIGNAL_APP_ID, settings.ONESIGNAL_REST_API_KEY, **kwargs)
+
+
+# Outbox worker
+# Most external user ids OneSignal accepts in one create_notification call.
+OUTBOX_MAX_RECIPIENTS = 2000
+OUTBOX_BATCH_SIZE = 10000
+OUTBOX_CONCURRENCY = 4
+OUTBOX_POLL_INTERVAL = 2
+# Notifications claimed by a worker that died are retried after this many seconds.
+OUTBOX_CLAIM_TIMEOUT = 10 * 60
+OUTBOX_MAX_ATTEMPTS = 5
+# Seconds before the first retry of a failed send, doubled on each attempt.
+OUTBOX_RETRY_DELAY = 30
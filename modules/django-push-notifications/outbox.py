@@ -0,0 +1,204 @@
+"""
+A database outbox for notifications, so that views don't wait on OneSignal:
+
+    enqueue({"contents": {"en": "Your order shipped"}}, [str(user.pk)])
+
+queues the notification in the same transaction as the view's other writes,
+and the `send_push_notifications` worker sends it. Notifications with the same
+content are sent to up to OUTBOX_MAX_RECIPIENTS users per API call.
+"""
+import hashlib
+import json
+import logging
+import uuid
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxNotification
+from .options import (
+    OUTBOX_CLAIM_TIMEOUT,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_RECIPIENTS,
+    OUTBOX_RETRY_DELAY,
+)
+from .resilience import response_status
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(body: Dict, external_user_ids: Iterable[str] = None, send_after=None):
+    """
+    Queues ``body`` (``create_notification`` parameters) for each of
+    ``external_user_ids``, or once for the audience ``body`` targets (e.g.
+    ``included_segments``) without any, with a single insert. It is sent once
+    ``send_after`` has passed, right away by default.
+    """
+    body = dict(body)
+    external_user_ids = list(external_user_ids or []) + list(
+        body.pop("include_external_user_ids", [])
+    )
+    content = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    fields = {
+        "content": content,
+        "content_hash": content_hash,
+        "send_after": send_after or timezone.now(),
+    }
+    return OutboxNotification.objects.bulk_create(
+        [
+            OutboxNotification(external_user_id=external_user_id, **fields)
+            for external_user_id in external_user_ids or [None]
+        ]
+    )
+
+
+def claim(batch_size):
+    """
+    Marks up to ``batch_size`` due notifications as being sent and returns
+    them. Rows locked by other workers are skipped, and rows claimed by a
+    worker that died are claimed again after ``OUTBOX_CLAIM_TIMEOUT``.
+
+    A retried batch is claimed whole, which can take the claim past
+    ``batch_size``: its batch id is OneSignal's idempotency key, so a call
+    with only part of it would be dropped as a duplicate. A batch whose rows
+    can't all be claimed is left for a later claim.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT)
+    due = Q(status=OutboxNotification.PENDING, send_after__lte=now) | Q(
+        status=OutboxNotification.SENDING, updated_at__lt=stale
+    )
+    with transaction.atomic():
+        rows = list(
+            OutboxNotification.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("send_after")
+            .values_list("id", "batch_id")[:batch_size]
+        )
+        ids = [pk for pk, batch_id in rows if batch_id is None]
+        batch_ids = {batch_id for _, batch_id in rows if batch_id is not None}
+        if batch_ids:
+            members = OutboxNotification.objects.filter(batch_id__in=batch_ids).exclude(
+                status__in=(OutboxNotification.SENT, OutboxNotification.FAILED)
+            )
+            unsent = Counter(members.values_list("batch_id", flat=True))
+            claimable = list(
+                members.select_for_update(skip_locked=True)
+                .filter(due)
+                .values_list("id", "batch_id")
+            )
+            counts = Counter(batch_id for _, batch_id in claimable)
+            ids += [
+                pk for pk, batch_id in claimable if counts[batch_id] == unsent[batch_id]
+            ]
+        OutboxNotification.objects.filter(id__in=ids).update(
+            status=OutboxNotification.SENDING,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+    return list(OutboxNotification.objects.filter(id__in=ids))
+
+
+def batch(notifications):
+    """
+    Groups claimed notifications into API calls: same content, at most
+    ``OUTBOX_MAX_RECIPIENTS`` users each. Every call gets a batch id, sent as
+    OneSignal's idempotency key, and a retried call keeps its batch so that
+    OneSignal drops it if the first attempt got through after all.
+    """
+    retried = defaultdict(list)
+    fresh = defaultdict(list)
+    for notification in notifications:
+        if notification.batch_id:
+            retried[notification.batch_id].append(notification)
+        elif notification.external_user_id:
+            fresh[notification.content_hash].append(notification)
+        else:
+            fresh[notification.pk].append(notification)
+    batches = list(retried.values())
+    for group in fresh.values():
+        for start in range(0, len(group), OUTBOX_MAX_RECIPIENTS):
+            chunk = group[start : start + OUTBOX_MAX_RECIPIENTS]
+            batch_id = uuid.uuid4()
+            OutboxNotification.objects.filter(
+                id__in=[notification.pk for notification in chunk]
+            ).update(batch_id=batch_id)
+            for notification in chunk:
+                notification.batch_id = batch_id
+            batches.append(chunk)
+    return batches
+
+
+def payload(notifications) -> Dict:
+    body = json.loads(notifications[0].content)
+    body["external_id"] = str(notifications[0].batch_id)
+    external_user_ids = [n.external_user_id for n in notifications if n.external_user_id]
+    if external_user_ids:
+        body["include_external_user_ids"] = external_user_ids
+    return body
+
+
+def _send(client, notifications):
+    try:
+        return client.create_notification(payload(notifications)), None
+    except Exception as error:
+        return None, error
+
+
+def _record(notifications, response, error):
+    ids = [notification.pk for notification in notifications]
+    queryset = OutboxNotification.objects.filter(id__in=ids)
+    status = None if response is None else response_status(response)
+    if status is not None and status < 300:
+        data = response.json()
+        queryset.update(
+            status=OutboxNotification.SENT,
+            notification_id=data.get("id") or "",
+            # e.g. external user ids that aren't subscribed
+            error=json.dumps(data["errors"]) if data.get("errors") else "",
+            updated_at=timezone.now(),
+        )
+        return True
+    message = str(error) if error is not None else "%s %s" % (status, response.text)
+    attempts = notifications[0].attempts
+    if (status is not None and status < 500 and status != 429) or (
+        attempts >= OUTBOX_MAX_ATTEMPTS
+    ):
+        logger.error("Push notification batch %s failed: %s", ids[0], message)
+        queryset.update(
+            status=OutboxNotification.FAILED, error=message, updated_at=timezone.now()
+        )
+    else:
+        delay = OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+        queryset.update(
+            status=OutboxNotification.PENDING,
+            send_after=timezone.now() + timedelta(seconds=delay),
+            error=message,
+            updated_at=timezone.now(),
+        )
+    return False
+
+
+def send(client, notifications, executor=None):
+    """
+    Sends claimed notifications in as few calls as possible, ``executor``
+    making them in parallel, and records the outcome of each. Failures are
+    retried with an exponential backoff, except for rejected requests (4xx
+    other than 429). Returns the number of notifications sent.
+    """
+    batches = batch(notifications)
+    if executor is None:
+        results = [_send(client, notifications) for notifications in batches]
+    else:
+        results = executor.map(lambda group: _send(client, group), batches)
+    sent = 0
+    # Database writes stay on this thread; the executor only does HTTP.
+    for notifications, (response, error) in zip(batches, results):
+        if _record(notifications, response, error):
+            sent += len(notifications)
+    return sent
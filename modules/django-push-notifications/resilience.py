@@ -0,0 +1,309 @@
+"""
+Retries with jittered exponential backoff and a circuit breaker for the
+OneSignal clients, so that an API incident neither loses idempotent calls to
+transient errors nor ties up every worker waiting on timeouts:
+
+    client = Client(
+        app_id,
+        rest_api_key,
+        retry=RetryPolicy(max_retries=3, deadline=15),
+        circuit_breaker=CircuitBreaker(failure_threshold=5, recovery_timeout=30),
+    )
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from itertools import count
+
+from .constants import (
+    DEFAULT_BACKOFF,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RECOVERY_TIMEOUT,
+)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling the API while the circuit breaker is open.
+    """
+
+
+def response_status(response) -> int:
+    # requests.Response has status_code, aiohttp.ClientResponse has status.
+    return getattr(response, "status_code", None) or response.status
+
+
+def parse_retry_after(response) -> float:
+    """
+    Seconds to wait according to the response's Retry-After header, given in
+    seconds or as an HTTP date, or None without a valid one.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Which failed calls to retry and how long to wait in between.
+
+    Calls with an idempotent ``method`` are retried after a connection error,
+    a timeout or a ``retry_statuses`` response. Other calls (e.g. POST, which
+    would send a notification twice) are only retried when the connection
+    couldn't be made, as the API then never saw the request. Waits are drawn
+    uniformly between 0 and ``backoff * 2 ** attempt`` (capped at
+    ``max_backoff``), or follow the response's Retry-After if longer.
+    ``deadline`` bounds the time a call may take across all its attempts.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        deadline: float = None,
+        retry_statuses=(500, 502, 503, 504),
+        methods=("GET", "HEAD", "PUT", "DELETE", "OPTIONS"),
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.methods = frozenset(methods)
+
+    def delay(self, attempt: int, response=None) -> float:
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        retry_after = response is not None and parse_retry_after(response)
+        return max(delay, retry_after or 0)
+
+    def retries_error(self, method: str, attempt: int, connected: bool) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return method in self.methods or not connected
+
+    def retries_response(self, method: str, attempt: int, response) -> bool:
+        return (
+            attempt < self.max_retries
+            and method in self.methods
+            and response_status(response) in self.retry_statuses
+        )
+
+
+# Makes a single attempt.
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast with ``CircuitOpenError`` once ``failure_threshold``
+    calls in a row have failed (connection errors, timeouts and 5xx
+    responses). After ``recovery_timeout`` seconds a single probe call is let
+    through: its success closes the circuit again, its failure reopens it. A
+    probe that ends without an outcome (cancelled, or an unexpected error)
+    lets the next call probe, and one that hasn't reported back within
+    ``recovery_timeout`` is replaced by another.
+    Thread-safe, so one breaker can be shared by several clients.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0
+        self.probe_started = 0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """
+        Raises ``CircuitOpenError`` unless the call may go through. Returns
+        whether it is the probe of a half-open circuit.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.OPEN:
+                since = self.opened_at
+            else:
+                since = self.probe_started
+            now = time.monotonic()
+            if now - since >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self.probe_started = now
+                return True
+            raise CircuitOpenError(
+                "Not calling OneSignal after %s failures in a row" % self.failures
+            )
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_abandoned(self):
+        """
+        Reports that the probe ended without telling whether the API is back.
+        The circuit opens again as it was, so the next call is the probe.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+
+def _deadline(retry: RetryPolicy) -> float:
+    if retry.deadline is None:
+        return None
+    return time.monotonic() + retry.deadline
+
+
+def _remaining(deadline: float) -> float:
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _cap_timeout(timeout, remaining: float):
+    """
+    Shortens a requests timeout (a number, a (connect, read) tuple or None) so
+    that the attempt ends by the call's deadline.
+    """
+    if remaining is None:
+        return timeout
+    remaining = max(remaining, 0.001)
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
+
+
+def _connected(error) -> bool:
+    """
+    Whether a requests error happened after connecting, so the API may have
+    received the request. Refused and timed out connections never reached it.
+    """
+    from requests.exceptions import ConnectTimeout
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(error, ConnectTimeout):
+        return False
+    reason = getattr(error.args[0] if error.args else None, "reason", None)
+    return not isinstance(reason, NewConnectionError)
+
+
+def _record(breaker: CircuitBreaker, failed: bool):
+    if breaker is not None:
+        if failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+
+def send_with_retries(
+    send,
+    method: str,
+    timeout,
+    retry: RetryPolicy = None,
+    breaker: CircuitBreaker = None,
+):
+    """
+    Calls ``send(timeout)``, which makes one ``requests`` attempt, until it
+    succeeds or ``retry`` gives up, consulting and updating ``breaker``.
+    Returns the last response or raises the last error.
+    """
+    # Imported here so the async client doesn't depend on requests.
+    from requests.exceptions import RequestException
+
+    retry = retry or NO_RETRY
+    deadline = _deadline(retry)
+    for attempt in count():
+        probe = breaker is not None and breaker.before_call()
+        try:
+            response = send(_cap_timeout(timeout, _remaining(deadline)))
+        except RequestException as error:
+            _record(breaker, True)
+            if not retry.retries_error(method, attempt, _connected(error)):
+                raise
+            delay = retry.delay(attempt)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise
+        except BaseException:
+            if probe:
+                breaker.record_abandoned()
+            raise
+        else:
+            _record(breaker, response_status(response) >= 500)
+            if not retry.retries_response(method, attempt, response):
+                return response
+            delay = retry.delay(attempt, response)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                return response
+            response.close()
+        time.sleep(delay)
+
+
+async def asend_with_retries(
+    send,
+    method: str,
+    retry: RetryPolicy = None,
+    breaker: CircuitBreaker = None,
+):
+    """
+    ``send_with_retries`` for ``aiohttp``: awaits ``send()`` for each attempt,
+    cancelling it at the call's deadline.
+    """
+    import aiohttp
+
+    retry = retry or NO_RETRY
+    deadline = _deadline(retry)
+    for attempt in count():
+        probe = breaker is not None and breaker.before_call()
+        try:
+            response = await asyncio.wait_for(send(), _remaining(deadline))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            _record(breaker, True)
+            connected = not isinstance(error, aiohttp.ClientConnectorError)
+            if not retry.retries_error(method, attempt, connected):
+                raise
+            delay = retry.delay(attempt)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise
+        except BaseException:
+            # Cancelled, most likely.
+            if probe:
+                breaker.record_abandoned()
+            raise
+        else:
+            _record(breaker, response_status(response) >= 500)
+            if not retry.retries_response(method, attempt, response):
+                return response
+            delay = retry.delay(attempt, response)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                return response
+        await asyncio.sleep(delay)
@@ -0,0 +1,241 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from .. import bulk
+from ..bulk import (
+    BulkResult,
+    TokenBucket,
+    abulk_call,
+    bulk_call,
+    bulk_edit_tags,
+    retry_after,
+)
+
+
+def response(status, retry_after=None):
+    headers = {} if retry_after is None else {"Retry-After": retry_after}
+    return SimpleNamespace(status_code=status, headers=headers)
+
+
+class Clock:
+    """
+    Stands in for the ``time`` module in ``bulk``: ``sleep`` only records.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch.object(bulk, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bursts_up_to_capacity(self):
+        bucket = TokenBucket(rate=10, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [0.1, 0.2])
+
+    def test_refills_at_the_rate(self):
+        bucket = TokenBucket(rate=10, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+        self.clock.now = 0.2
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+        self.clock.now = 10
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_capacity_defaults_to_the_rate(self):
+        bucket = TokenBucket(rate=5)
+        for _ in range(5):
+            bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_pause_holds_back_every_caller(self):
+        bucket = TokenBucket(rate=10)
+        bucket.pause(2)
+        bucket.pause(1)
+        bucket.acquire()
+        self.clock.now = 1.5
+        bucket.acquire()
+        self.clock.now = 2
+        bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [2, 0.5])
+
+
+class RetryAfterTests(TestCase):
+    def test_retry_after_header(self):
+        self.assertEqual(retry_after(response(429, "3"), 0), 3)
+        self.assertEqual(retry_after(response(429, "-1"), 0), 0)
+
+    def test_backoff_without_header(self):
+        self.assertEqual(
+            [retry_after(response(429), attempt) for attempt in (0, 1, 3, 10)],
+            [1, 2, 8, 60],
+        )
+
+
+class Calls:
+    """
+    A ``call(key, body)`` answering with the queued responses of each key,
+    then 200, while recording the calls and how many ran at once.
+    """
+
+    def __init__(self, responses=None, delay=0):
+        self.responses = responses or {}
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def start(self, key):
+        with self._lock:
+            self.calls.append(key)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            queued = self.responses.get(key)
+            result = queued.pop(0) if queued else response(200)
+        return result
+
+    def end(self):
+        with self._lock:
+            self.running -= 1
+
+    def __call__(self, key, body):
+        result = self.start(key)
+        time.sleep(self.delay)
+        self.end()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def acall(self, key, body):
+        result = self.start(key)
+        await asyncio.sleep(self.delay)
+        self.end()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def pairs(n):
+    return ((key, {"tags": {"n": key}}) for key in range(n))
+
+
+class BulkCallTests(TestCase):
+    def test_a_result_per_pair(self):
+        calls = Calls()
+        results = list(bulk_call(calls, pairs(25), workers=4, rate=1000))
+        self.assertEqual(sorted(result.key for result in results), list(range(25)))
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_parallelism_is_bounded(self):
+        calls = Calls(delay=0.01)
+        list(bulk_call(calls, pairs(20), workers=3, rate=1000))
+        self.assertLessEqual(calls.max_running, 3)
+        self.assertGreater(calls.max_running, 1)
+
+    def test_reads_pairs_as_workers_free_up(self):
+        read = []
+
+        def tracked():
+            for pair in pairs(1000):
+                read.append(pair[0])
+                yield pair
+
+        results = bulk_call(Calls(), tracked(), workers=2, rate=1000)
+        next(results)
+        self.assertLessEqual(len(read), 2 * 4)
+        results.close()
+        self.assertLess(len(read), 1000)
+
+    def test_rate(self):
+        started = time.monotonic()
+        limiter = TokenBucket(rate=50, capacity=1)
+        list(bulk_call(Calls(), pairs(11), workers=4, limiter=limiter))
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+    def test_retries_429_after_retry_after(self):
+        calls = Calls({1: [response(429, "0.05")]})
+        limiter = TokenBucket(rate=1000)
+        limiter.pause = mock.Mock(wraps=limiter.pause)
+        results = {
+            result.key: result
+            for result in bulk_call(calls, pairs(3), workers=2, limiter=limiter)
+        }
+        self.assertTrue(results[1].ok)
+        self.assertEqual(calls.calls.count(1), 2)
+        limiter.pause.assert_called_once_with(0.05)
+
+    def test_gives_up_after_max_retries(self):
+        calls = Calls({0: [response(429, "0")] * 10})
+        [result] = bulk_call(calls, pairs(1), rate=1000, max_retries=2)
+        self.assertEqual(result.status, 429)
+        self.assertFalse(result.ok)
+        self.assertEqual(len(calls.calls), 3)
+
+    def test_errors_are_results(self):
+        error = ConnectionError("reset")
+        calls = Calls({0: [error], 1: [response(400)]})
+        results = {
+            result.key: result for result in bulk_call(calls, pairs(2), rate=1000)
+        }
+        self.assertIs(results[0].error, error)
+        self.assertIsNone(results[0].status)
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[1].status, 400)
+        self.assertFalse(results[1].ok)
+
+    def test_bulk_edit_tags(self):
+        client = mock.Mock()
+        client.edit_tags.return_value = response(200)
+        results = list(bulk_edit_tags(client, [("user", {"tags": {}})], rate=1000))
+        self.assertEqual(results, [BulkResult("user", client.edit_tags.return_value)])
+        client.edit_tags.assert_called_once_with("user", {"tags": {}})
+
+
+class AsyncBulkCallTests(TestCase):
+    def run_bulk(self, calls, pairs, **kwargs):
+        async def collect():
+            return [result async for result in abulk_call(calls, pairs, **kwargs)]
+
+        return asyncio.run(collect())
+
+    def test_a_result_per_pair_with_bounded_concurrency(self):
+        calls = Calls(delay=0.01)
+        results = self.run_bulk(calls.acall, pairs(20), concurrency=3, rate=1000)
+        self.assertEqual(sorted(result.key for result in results), list(range(20)))
+        self.assertLessEqual(calls.max_running, 3)
+
+    def test_retries_429(self):
+        calls = Calls({0: [response(429, "0")], 1: [response(429, "0")] * 10})
+        results = {
+            result.key: result
+            for result in self.run_bulk(
+                calls.acall, pairs(2), rate=1000, max_retries=1
+            )
+        }
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[1].status, 429)
+        self.assertEqual(calls.calls.count(1), 2)
@@ -0,0 +1,199 @@
+import json
+from unittest import TestCase, mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from requests import Response
+
+from .. import cache as response_cache
+from ..cache import LRUStore, ResponseCache
+from ..client import Client
+from ..constants import APP_PATH
+
+
+class Clock:
+    """
+    Stands in for the ``time`` module in ``cache``.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeSession:
+    """
+    Answers every request with ``status`` and a body numbering the requests,
+    so that a cached response can be told apart from a fresh one.
+    """
+
+    def __init__(self, status=200):
+        self.status = status
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        response = Response()
+        response.status_code = self.status
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps({"request": len(self.requests)}).encode()
+        response.url = url
+        return response
+
+    def close(self):
+        pass
+
+
+class CacheTestCase(TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch.object(response_cache, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def client(self, cache, session=None, user_auth_key="user-key"):
+        return Client(
+            "app",
+            "key",
+            user_auth_key,
+            session=session or FakeSession(),
+            cache=cache,
+        )
+
+
+class ResponseCacheTests(CacheTestCase):
+    def test_hit(self):
+        cache = ResponseCache()
+        client = self.client(cache)
+        first = client.view_app("app")
+        second = client.view_app("app")
+        self.assertEqual(len(client.session.requests), 1)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.headers["content-type"], "application/json")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_keyed_by_path_params_query_and_auth_key(self):
+        cache = ResponseCache()
+        client = self.client(cache)
+        client.view_app("app")
+        client.view_app("other")
+        client.view_notification(1)
+        client.view_notification(2)
+        self.client(cache, client.session, "other-key").view_app("app")
+        self.assertEqual(len(client.session.requests), 5)
+
+    def test_expiry(self):
+        client = self.client(ResponseCache(ttls={APP_PATH: 10}))
+        client.view_app("app")
+        self.clock.now = 9
+        client.view_app("app")
+        self.assertEqual(len(client.session.requests), 1)
+        self.clock.now = 10
+        self.assertEqual(client.view_app("app").json(), {"request": 2})
+
+    def test_only_cached_endpoints(self):
+        client = self.client(ResponseCache(ttls={APP_PATH: 10}))
+        client.view_apps()
+        client.view_apps()
+        client.view_devices(10, 0)
+        client.view_devices(10, 0)
+        self.assertEqual(len(client.session.requests), 4)
+
+    def test_errors_are_not_cached(self):
+        client = self.client(ResponseCache(), FakeSession(status=503))
+        client.view_app("app")
+        self.assertEqual(client.view_app("app").status_code, 503)
+        self.assertEqual(len(client.session.requests), 2)
+
+    def test_invalidated_by_changes(self):
+        for change in (
+            lambda client: client.update_app("app", {"name": "Renamed"}),
+            lambda client: client.create_segments({"name": "Segment"}),
+            lambda client: client.delete_segments("segment"),
+        ):
+            with self.subTest(change=change):
+                cache = ResponseCache()
+                client = self.client(cache)
+                client.view_app("app")
+                change(client)
+                self.assertEqual(client.view_app("app").json(), {"request": 3})
+                self.assertGreater(cache.stats()["invalidations"], 0)
+
+    def test_invalidation_is_scoped(self):
+        client = self.client(ResponseCache())
+        client.view_app("other")
+        client.view_notification(2)
+        client.update_app("app", {"name": "Renamed"})
+        client.cancel_notification(1)
+        client.view_app("other")
+        client.view_notification(2)
+        self.assertEqual(len(client.session.requests), 4)
+
+    def test_cancel_invalidates_the_notification(self):
+        client = self.client(ResponseCache())
+        client.view_notification(1)
+        client.cancel_notification(1)
+        self.assertEqual(client.view_notification(1).json(), {"request": 3})
+
+    def test_failed_changes_dont_invalidate(self):
+        session = FakeSession()
+        client = self.client(ResponseCache(), session)
+        client.view_app("app")
+        session.status = 400
+        client.update_app("app", {"name": "Renamed"})
+        session.status = 200
+        self.assertEqual(client.view_app("app").json(), {"request": 1})
+
+    def test_django_cache_backend_is_shared(self):
+        backend = LocMemCache("push-notifications-tests", {})
+        self.addCleanup(backend.clear)
+        first = self.client(ResponseCache(backend=backend))
+        second = self.client(ResponseCache(backend=backend), first.session)
+        first.view_app("app")
+        second.view_app("app")
+        self.assertEqual(len(first.session.requests), 1)
+        second.update_app("app", {"name": "Renamed"})
+        self.assertEqual(first.view_app("app").json(), {"request": 3})
+
+    def test_django_cache_backend_gets_the_ttl(self):
+        backend = LocMemCache("push-notifications-tests", {})
+        self.addCleanup(backend.clear)
+        client = self.client(ResponseCache(ttls={APP_PATH: 10}, backend=backend))
+        with mock.patch.object(backend, "set", wraps=backend.set) as cache_set:
+            client.view_app("app")
+        self.assertIn(mock.call(mock.ANY, mock.ANY, 10), cache_set.call_args_list)
+
+
+class LRUStoreTests(CacheTestCase):
+    def test_evicts_the_least_recently_used(self):
+        store = LRUStore(max_entries=2)
+        store.set("a", 1)
+        store.set("b", 2)
+        store.get("a")
+        store.set("c", 3)
+        self.assertEqual(store.get("a"), 1)
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("c"), 3)
+        self.assertEqual(store.evictions, 1)
+
+    def test_expired_entries_are_dropped(self):
+        store = LRUStore()
+        store.set("a", 1, 5)
+        store.set("b", 2)
+        self.clock.now = 5
+        self.assertEqual(store.get("a", "missing"), "missing")
+        self.assertEqual(store.get("b"), 2)
+        self.assertEqual(list(store.entries), ["b"])
+
+    def test_stats(self):
+        cache = ResponseCache(max_entries=1)
+        client = self.client(cache)
+        client.view_app("app")
+        client.view_app("other")
+        stats = cache.stats()
+        self.assertEqual(stats["misses"], 2)
+        self.assertLessEqual(stats["entries"], 1)
+        self.assertGreater(stats["evictions"], 0)
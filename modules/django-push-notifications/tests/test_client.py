@@ -0,0 +1,47 @@
+import asyncio
+from unittest import TestCase, mock
+
+import aiohttp
+import requests
+
+from ..async_client import AsyncClient
+from ..client import Client
+
+
+class ClientSessionTests(TestCase):
+    def test_closes_its_own_session(self):
+        client = Client("app", "key")
+        with mock.patch.object(client.session, "close") as close:
+            client.close()
+        close.assert_called_once_with()
+
+    def test_leaves_shared_sessions_open(self):
+        session = requests.Session()
+        self.addCleanup(session.close)
+        with mock.patch.object(session, "close") as close:
+            with Client("app", "key", session=session):
+                pass
+            with Client("app", "key", session=session) as client:
+                self.assertIs(client.session, session)
+        close.assert_not_called()
+
+
+class AsyncClientSessionTests(TestCase):
+    def test_closes_its_own_session(self):
+        async def run():
+            async with AsyncClient("app", "key") as client:
+                client.session = client._create_session()
+            return client.session
+
+        self.assertTrue(asyncio.run(run()).closed)
+
+    def test_leaves_shared_sessions_open(self):
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                async with AsyncClient("app", "key", session=session):
+                    pass
+                async with AsyncClient("app", "key", session=session) as client:
+                    self.assertIs(client.session, session)
+                return session.closed
+
+        self.assertFalse(asyncio.run(run()))
@@ -0,0 +1,72 @@
+import csv
+import gzip
+import io
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from ..client import Client
+from ..export import iter_columns, iter_export_records, parse_export
+from ..fake_server import FakeOneSignalServer
+
+
+def gzipped_csv(rows):
+    text = io.StringIO()
+    csv.writer(text).writerows(rows)
+    return io.BytesIO(gzip.compress(text.getvalue().encode("utf-8")))
+
+
+class ParseExportTests(TestCase):
+    def test_parses_typed_columns(self):
+        export = gzipped_csv(
+            [
+                ["id", "session_count", "invalid_identifier", "tags", "language"],
+                ["a", "3", "t", '{"level": "2"}', ""],
+            ]
+        )
+        (row,) = parse_export(export)
+        self.assertEqual(
+            row,
+            {
+                "id": "a",
+                "session_count": 3,
+                "invalid_identifier": True,
+                "tags": {"level": "2"},
+                "language": None,
+            },
+        )
+
+    def test_timestamps_are_aware_utc(self):
+        expected = datetime(2020, 1, 31, 10, 20, 30, tzinfo=timezone.utc)
+        for value in (
+            "2020-01-31 10:20:30",
+            "2020-01-31 10:20:30 UTC",
+            "2020-01-31T10:20:30Z",
+            "2020-01-31T12:20:30+02:00",
+        ):
+            with self.subTest(value=value):
+                (row,) = parse_export(gzipped_csv([["created_at"], [value]]))
+                self.assertEqual(row["created_at"], expected)
+                self.assertEqual(row["created_at"].utcoffset(), timedelta(0))
+
+    def test_unparsable_values_stay_strings(self):
+        (row,) = parse_export(gzipped_csv([["created_at", "lat"], ["soon", "n/a"]]))
+        self.assertEqual(row, {"created_at": "soon", "lat": "n/a"})
+
+
+class IterExportRecordsTests(TestCase):
+    def test_streams_the_export(self):
+        with FakeOneSignalServer(devices=250) as server:
+            with Client("app", "key", api_root=server.api_root) as client:
+                records = list(iter_export_records(client, poll_interval=0))
+        self.assertEqual(len(records), 250)
+        self.assertEqual(len({record["id"] for record in records}), 250)
+        for record in records:
+            self.assertIsInstance(record["session_count"], int)
+            self.assertEqual(record["last_active"].tzinfo, timezone.utc)
+
+    def test_iter_columns(self):
+        records = [{"id": str(i), "session_count": i} for i in range(5)]
+        chunks = list(iter_columns(records, size=2))
+        self.assertEqual(
+            [chunk["session_count"] for chunk in chunks], [[0, 1], [2, 3], [4]]
+        )
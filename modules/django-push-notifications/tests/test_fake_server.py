@@ -0,0 +1,72 @@
+import time
+from unittest import TestCase
+
+from ..benchmarks import percentile
+from ..client import Client
+from ..fake_server import FakeOneSignalServer
+
+
+class FakeServerTests(TestCase):
+    def serve(self, **kwargs):
+        server = FakeOneSignalServer(**kwargs).start()
+        self.addCleanup(server.stop)
+        client = Client("app", "key", api_root=server.api_root)
+        self.addCleanup(client.close)
+        return client
+
+    def test_create_notification(self):
+        response = self.serve().create_notification({"contents": {"en": "Hi"}})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("id", response.json())
+
+    def test_paginates_notifications(self):
+        client = self.serve(notifications=120)
+        page = client.view_notifications(limit=50, offset=100).json()
+        self.assertEqual(page["total_count"], 120)
+        self.assertEqual(len(page["notifications"]), 20)
+
+    def test_caps_device_pages(self):
+        page = self.serve(devices=1000).view_devices(limit=1000, offset=0).json()
+        self.assertEqual(page["limit"], 300)
+        self.assertEqual(len(page["players"]), 300)
+
+    def test_path_parameters(self):
+        client = self.serve()
+        self.assertEqual(client.view_device("abc").json()["id"], "abc")
+        response = client.edit_tags("user", {"tags": {}})
+        self.assertEqual(response.json(), {"success": True})
+
+    def test_unknown_paths(self):
+        client = self.serve()
+        response = client.session.get(client.api_root + "/unknown")
+        self.assertEqual(response.status_code, 404)
+
+    def test_latency(self):
+        client = self.serve(latency=0.1)
+        started = time.monotonic()
+        client.view_apps()
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+    def test_error_rate(self):
+        client = self.serve(error_rate=1)
+        self.assertEqual(client.view_apps().status_code, 500)
+
+    def test_rate_limit(self):
+        client = self.serve(rate_limit=2)
+        statuses = [client.view_apps().status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+        response = client.view_apps()
+        self.assertGreater(float(response.headers["Retry-After"]), 0)
+
+    def test_faults(self):
+        client = self.serve(faults=[None, 503])
+        statuses = [client.view_apps().status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 503, 200])
+
+
+class PercentileTests(TestCase):
+    def test_percentile(self):
+        samples = list(range(100, 0, -1))
+        self.assertEqual(percentile(samples, 0.5), 51)
+        self.assertEqual(percentile(samples, 0.99), 100)
+        self.assertEqual(percentile([3], 0.99), 3)
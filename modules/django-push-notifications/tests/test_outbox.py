@@ -0,0 +1,96 @@
+import uuid
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..client import Client
+from ..fake_server import FakeOneSignalHandler, FakeOneSignalServer
+from ..models import OutboxNotification
+from ..outbox import claim, enqueue, send
+
+BODY = {"contents": {"en": "Your order shipped"}}
+
+
+class RecordingHandler(FakeOneSignalHandler):
+    bodies = []
+
+    def create_notification(self):
+        self.bodies.append(self.json_body)
+        super().create_notification()
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        RecordingHandler.bodies = []
+        self.server = FakeOneSignalServer(handler_class=RecordingHandler).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client("app", "key", api_root=self.server.api_root)
+        self.addCleanup(self.client.close)
+
+    def retried_batch(self, users):
+        """
+        Rows of a batch whose first call failed, due again.
+        """
+        batch_id = uuid.uuid4()
+        rows = enqueue(BODY, users)
+        OutboxNotification.objects.filter(id__in=[row.pk for row in rows]).update(
+            batch_id=batch_id, attempts=1, send_after=timezone.now()
+        )
+        return batch_id
+
+    def test_coalesces_recipients(self):
+        enqueue(BODY, ["1", "2"])
+        enqueue(BODY, ["3"])
+        self.assertEqual(send(self.client, claim(10)), 3)
+        (body,) = RecordingHandler.bodies
+        self.assertEqual(body["include_external_user_ids"], ["1", "2", "3"])
+        self.assertEqual(
+            OutboxNotification.objects.filter(status=OutboxNotification.SENT).count(),
+            3,
+        )
+
+    def test_claims_retried_batches_whole(self):
+        enqueue(BODY, ["early"], send_after=timezone.now() - timedelta(minutes=1))
+        batch_id = self.retried_batch(["1", "2", "3"])
+        claimed = claim(batch_size=2)
+        self.assertEqual(
+            sorted(notification.external_user_id for notification in claimed),
+            ["1", "2", "3", "early"],
+        )
+        self.assertEqual(
+            {n.batch_id for n in claimed if n.external_user_id != "early"}, {batch_id}
+        )
+
+    def test_leaves_batches_partly_claimed_elsewhere(self):
+        batch_id = self.retried_batch(["1", "2"])
+        # Being sent by another worker.
+        OutboxNotification.objects.filter(external_user_id="2").update(
+            status=OutboxNotification.SENDING
+        )
+        self.assertEqual(claim(10), [])
+        self.assertEqual(
+            OutboxNotification.objects.get(external_user_id="1").status,
+            OutboxNotification.PENDING,
+        )
+        self.assertTrue(OutboxNotification.objects.filter(batch_id=batch_id).exists())
+
+    def test_retried_batch_is_sent_once_to_everyone(self):
+        enqueue(BODY, ["early"], send_after=timezone.now() - timedelta(minutes=1))
+        batch_id = self.retried_batch(["1", "2", "3"])
+        while True:
+            notifications = claim(batch_size=2)
+            if not notifications:
+                break
+            send(self.client, notifications)
+        external_ids = [body["external_id"] for body in RecordingHandler.bodies]
+        self.assertEqual(len(external_ids), len(set(external_ids)))
+        (retried,) = [
+            body
+            for body in RecordingHandler.bodies
+            if body["external_id"] == str(batch_id)
+        ]
+        self.assertEqual(sorted(retried["include_external_user_ids"]), ["1", "2", "3"])
+        self.assertFalse(
+            OutboxNotification.objects.exclude(status=OutboxNotification.SENT).exists()
+        )
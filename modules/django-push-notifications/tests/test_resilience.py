@@ -0,0 +1,143 @@
+import asyncio
+import time
+from unittest import TestCase
+
+from requests.exceptions import ConnectionError, Timeout
+
+from ..async_client import AsyncClient
+from ..client import Client
+from ..fake_server import RESET, FakeOneSignalServer
+from ..resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    send_with_retries,
+)
+
+RETRY = RetryPolicy(max_retries=2, backoff=0.01)
+
+
+class RetryTests(TestCase):
+    def client(self, server, **kwargs):
+        client = Client("app", "key", api_root=server.api_root, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_retries_idempotent_calls_on_5xx(self):
+        with FakeOneSignalServer(faults=[503, 502]) as server:
+            response = self.client(server, retry=RETRY).view_apps()
+        self.assertEqual(response.status_code, 200)
+
+    def test_gives_up_after_max_retries(self):
+        with FakeOneSignalServer(faults=[503, 503, 503, None]) as server:
+            response = self.client(server, retry=RETRY).view_apps()
+        self.assertEqual(response.status_code, 503)
+
+    def test_does_not_resend_notifications(self):
+        with FakeOneSignalServer(faults=[503]) as server:
+            client = self.client(server, retry=RETRY)
+            self.assertEqual(client.create_notification({}).status_code, 503)
+
+    def test_retries_dropped_connections(self):
+        with FakeOneSignalServer(faults=[RESET]) as server:
+            response = self.client(server, retry=RETRY).view_apps()
+        self.assertEqual(response.status_code, 200)
+
+    def test_does_not_resend_notifications_after_dropped_connections(self):
+        # The API may have received the request before dropping it.
+        with FakeOneSignalServer(faults=[RESET]) as server:
+            with self.assertRaises(ConnectionError):
+                self.client(server, retry=RETRY).create_notification({})
+
+    def test_retries_timeouts(self):
+        with FakeOneSignalServer(faults=[1.0]) as server:
+            response = self.client(server, retry=RETRY, timeout=0.2).view_apps()
+        self.assertEqual(response.status_code, 200)
+
+    def test_deadline(self):
+        retry = RetryPolicy(max_retries=10, backoff=0.01, deadline=0.5)
+        with FakeOneSignalServer(faults=[1.0] * 10) as server:
+            started = time.monotonic()
+            with self.assertRaises(Timeout):
+                self.client(server, retry=retry, timeout=0.2).view_apps()
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+class CircuitBreakerTests(TestCase):
+    def open_breaker(self, recovery_timeout=0.2):
+        breaker = CircuitBreaker(
+            failure_threshold=2, recovery_timeout=recovery_timeout
+        )
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        return breaker
+
+    def test_opens_after_failures_and_recovers(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.2)
+        with FakeOneSignalServer(faults=[500, 500]) as server:
+            client = Client(
+                "app", "key", api_root=server.api_root, circuit_breaker=breaker
+            )
+            with client:
+                client.view_apps()
+                client.view_apps()
+                with self.assertRaises(CircuitOpenError):
+                    client.view_apps()
+                time.sleep(0.25)
+                self.assertEqual(client.view_apps().status_code, 200)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        breaker = self.open_breaker(recovery_timeout=0)
+        with FakeOneSignalServer(faults=[503]) as server:
+            with Client(
+                "app", "key", api_root=server.api_root, circuit_breaker=breaker
+            ) as client:
+                client.view_apps()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    def test_probe_raising_an_unexpected_error(self):
+        breaker = self.open_breaker()
+        time.sleep(0.25)
+
+        def send(timeout):
+            raise KeyError("unexpected")
+
+        with self.assertRaises(KeyError):
+            send_with_retries(send, "GET", None, breaker=breaker)
+        # The next call is the probe, rather than failing until a restart.
+        self.assertTrue(breaker.before_call())
+
+    def test_cancelled_probe(self):
+        breaker = self.open_breaker()
+        time.sleep(0.25)
+
+        async def cancel_probe(client):
+            probe = asyncio.ensure_future(client.view_apps())
+            await asyncio.sleep(0.1)
+            probe.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await probe
+            return await client.view_apps()
+
+        async def run(api_root):
+            async with AsyncClient(
+                "app", "key", api_root=api_root, circuit_breaker=breaker
+            ) as client:
+                return await cancel_probe(client)
+
+        with FakeOneSignalServer(faults=[1.0]) as server:
+            response = asyncio.run(run(server.api_root))
+        self.assertEqual(response.status, 200)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_hung_probe_is_replaced(self):
+        breaker = self.open_breaker()
+        time.sleep(0.25)
+        self.assertTrue(breaker.before_call())
+        # The probe never reports back.
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        time.sleep(0.25)
+        self.assertTrue(breaker.before_call())
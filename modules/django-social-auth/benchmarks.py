@@ -0,0 +1,105 @@
+"""
+Benchmark of id_token verification against the local JWKS stand-in. Run from
+the directory containing this module's package, e.g.:
+
+    python -m social_auth.benchmarks
+    python -m social_auth.benchmarks --logins 5000 --threads 1,8 --latency 0.05
+
+Reports logins per second verified with the cached keys (``IdTokenVerifier``)
+and, for comparison, with the keys fetched on every login as allauth's Apple
+adapter does. ``--latency`` adds a delay to each key fetch, standing in for
+the round trip to the provider.
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import requests
+
+from .jwks import IdTokenVerifier, JWKSCache
+from .jwks_server import FakeJWKSServer
+
+AUDIENCE = "com.example.app"
+
+
+def verify_fetching_keys(server, latency):
+    """
+    Verifies like allauth's AppleOAuth2Adapter: keys fetched for every token.
+    """
+    session = requests.Session()
+
+    def verify(token):
+        time.sleep(latency)
+        kid = jwt.get_unverified_header(token)["kid"]
+        keys = session.get(server.url).json()["keys"]
+        key = next(key for key in keys if key["kid"] == kid)
+        public_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
+        return jwt.decode(
+            token,
+            public_key,
+            algorithms=["RS256"],
+            audience=[AUDIENCE],
+            issuer=server.issuer,
+        )
+
+    return verify
+
+
+def verify_cached(server, latency):
+    verifier = IdTokenVerifier(JWKSCache(server.url), [server.issuer])
+    # The first login pays for the fetch, latency included.
+    time.sleep(latency)
+    verifier.jwks.refresh()
+    return lambda token: verifier.verify(token, [AUDIENCE])
+
+
+def run(verify, tokens, threads):
+    started = time.perf_counter()
+    if threads == 1:
+        for token in tokens:
+            verify(token)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(verify, tokens))
+    return len(tokens) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--logins", type=int, default=2000)
+    parser.add_argument(
+        "--threads",
+        default="1,8",
+        help="Comma-separated numbers of threads verifying at once",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.02,
+        help="Seconds added to each key fetch",
+    )
+    options = parser.parse_args()
+    with FakeJWKSServer() as server:
+        tokens = [
+            server.id_token(sub=str(i), aud=AUDIENCE, kid=server.kids[i % 2])
+            for i in range(options.logins)
+        ]
+        print("%-16s %8s %14s" % ("verification", "threads", "logins/s"))
+        for threads in [int(n) for n in options.threads.split(",")]:
+            for name, make in [
+                ("fetching keys", verify_fetching_keys),
+                ("cached keys", verify_cached),
+            ]:
+                verify = make(server, options.latency)
+                # Fetching keys every time is slow; fewer logins do.
+                sample = tokens if name == "cached keys" else tokens[:200]
+                rate = run(verify, sample, threads)
+                print("%-16s %8d %14.0f" % (name, threads, rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import threading
+import time
+
+from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.models import SocialApp
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.contrib.sites.shortcuts import get_current_site
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+# Seconds a SocialApp is reused for. Changes made in this process invalidate it
+# right away; other processes see them once it expires.
+CACHE_TIMEOUT = getattr(settings, "SOCIAL_AUTH_APP_CACHE_TIMEOUT", 5 * 60)
+
+_apps = {}
+_app_domain = None
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _count(outcome):
+    with _lock:
+        _stats[outcome] += 1
+
+
+def _site_key(request):
+    # allauth looks the app up by the current site: SITE_ID when set, else
+    # the request's host.
+    site_id = getattr(settings, "SITE_ID", None)
+    if site_id is not None or request is None:
+        return site_id
+    return request.get_host()
+
+
+def get_social_app(provider, request):
+    """
+    Returns ``provider.get_app(request)``, the provider's SocialApp for the
+    current site, without its SocialApp and Site queries while it is cached.
+    """
+    key = (provider.id, _site_key(request))
+    now = time.monotonic()
+    with _lock:
+        entry = _apps.get(key)
+    if entry is not None and entry[0] > now:
+        _count("hits")
+        return entry[1]
+    _count("misses")
+    app = get_adapter(request).get_app(request, provider.id)
+    with _lock:
+        _apps[key] = (now + CACHE_TIMEOUT, app)
+    return app
+
+
+def get_app_domain():
+    """
+    ``https://`` and the current site's domain, looked up on first use rather
+    than when the views are imported. Empty if there's no current site yet,
+    e.g. before the first migration.
+    """
+    global _app_domain
+    if _app_domain is None:
+        try:
+            _app_domain = "https://%s" % get_current_site(None)
+        except Exception:
+            return ""
+    return _app_domain
+
+
+def invalidate():
+    global _app_domain
+    with _lock:
+        _apps.clear()
+        _app_domain = None
+
+
+def cache_stats():
+    """
+    Hit and miss counts of this process since it started.
+    """
+    with _lock:
+        return dict(_stats)
+
+
+class CachedAppAdapterMixin:
+    """
+    Makes an OAuth2 adapter's provider look its SocialApp up through
+    ``get_social_app``, including in rest_auth's SocialLoginSerializer.
+    """
+
+    def get_provider(self):
+        provider = super().get_provider()
+        # Providers are created per request, so this doesn't leak.
+        provider.get_app = lambda request: get_social_app(provider, request)
+        return provider
+
+
+@receiver(post_save, sender=SocialApp, dispatch_uid="social_auth_app_save")
+@receiver(post_delete, sender=SocialApp, dispatch_uid="social_auth_app_delete")
+@receiver(
+    m2m_changed, sender=SocialApp.sites.through, dispatch_uid="social_auth_app_sites"
+)
+@receiver(post_save, sender=Site, dispatch_uid="social_auth_site_save")
+@receiver(post_delete, sender=Site, dispatch_uid="social_auth_site_delete")
+def invalidate_apps(sender, **kwargs):
+    # Wait for the commit, or a concurrent login could cache the old app.
+    transaction.on_commit(invalidate)
@@ -0,0 +1,154 @@
+"""
+Local verification of Apple and Google id_tokens. Each provider's signing keys
+(its JWKS) are fetched once and cached, so checking a token's signature and
+claims doesn't need a network call:
+
+    claims = APPLE.verify(id_token, audiences=["com.example.app"])
+
+Cached keys are used until they expire, then refreshed in the background while
+the old ones keep serving. A token signed with a key that isn't cached (the
+provider rotated its keys) triggers a refresh right away, at most once per
+JWKS_MIN_REFRESH_INTERVAL.
+"""
+import logging
+import re
+import threading
+import time
+
+import jwt
+import requests
+from allauth.socialaccount.providers.oauth2.client import OAuth2Error
+
+logger = logging.getLogger(__name__)
+
+APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
+APPLE_ISSUERS = ["https://appleid.apple.com"]
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["https://accounts.google.com", "accounts.google.com"]
+
+# Seconds keys are cached for, unless the provider's Cache-Control says otherwise.
+JWKS_CACHE_TIMEOUT = 60 * 60
+# Minimum seconds between fetches caused by unknown key ids, so that tokens
+# with made-up kids can't make us hammer the provider.
+JWKS_MIN_REFRESH_INTERVAL = 60
+JWKS_REQUEST_TIMEOUT = 5
+# Seconds of clock skew tolerated on exp, iat and nbf.
+ID_TOKEN_LEEWAY = 60
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """
+    The signing keys published at ``url``, by key id.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = JWKS_CACHE_TIMEOUT,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_INTERVAL,
+        session: requests.Session = None,
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.min_refresh_interval = min_refresh_interval
+        self.session = session or requests.Session()
+        self.keys = {}
+        self.expires = 0
+        self.fetched = None
+        self.fetches = 0
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._refreshing = False
+
+    def refresh(self):
+        """
+        Fetches the keys, replacing the cached ones.
+        """
+        response = self.session.get(self.url, timeout=JWKS_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        keys = {}
+        for data in response.json().get("keys", []):
+            try:
+                key = jwt.PyJWK(data)
+            except jwt.PyJWTError:
+                # e.g. an algorithm we don't support; the others are usable.
+                logger.warning("Skipping signing key %s from %s", data.get("kid"), self.url)
+                continue
+            keys[data.get("kid")] = key
+        match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        timeout = int(match.group(1)) if match else self.timeout
+        now = time.monotonic()
+        with self._lock:
+            self.keys = keys
+            self.expires = now + timeout
+            self.fetched = now
+            self.fetches += 1
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh():
+            try:
+                self.refresh()
+            except Exception:
+                # The current keys keep serving; the next call retries.
+                logger.exception("Refreshing signing keys from %s failed", self.url)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get_key(self, kid: str) -> jwt.PyJWK:
+        key = self.keys.get(kid)
+        if key is None:
+            # One fetch for all the logins waiting on the same missing key.
+            with self._fetch_lock:
+                key = self.keys.get(kid)
+                if key is None and (
+                    self.fetched is None
+                    or time.monotonic() - self.fetched >= self.min_refresh_interval
+                ):
+                    self.refresh()
+                    key = self.keys.get(kid)
+        elif time.monotonic() >= self.expires:
+            self._refresh_in_background()
+        if key is None:
+            raise OAuth2Error("Unknown id_token signing key %s" % kid)
+        return key
+
+
+class IdTokenVerifier:
+    def __init__(self, jwks: JWKSCache, issuers, leeway: float = ID_TOKEN_LEEWAY):
+        self.jwks = jwks
+        self.issuers = issuers
+        self.leeway = leeway
+
+    def verify(self, id_token: str, audiences) -> dict:
+        """
+        Returns the claims of ``id_token`` if it is signed by one of the
+        provider's keys, issued by the provider for one of ``audiences`` and
+        not expired; raises OAuth2Error otherwise.
+        """
+        try:
+            key = self.jwks.get_key(jwt.get_unverified_header(id_token).get("kid"))
+            return jwt.decode(
+                id_token,
+                key,
+                algorithms=[key.algorithm_name],
+                audience=audiences,
+                issuer=self.issuers,
+                leeway=self.leeway,
+                options={"require": ["exp", "iat", "iss", "aud", "sub"]},
+            )
+        except (jwt.PyJWTError, requests.RequestException) as e:
+            raise OAuth2Error("Invalid id_token") from e
+
+
+APPLE = IdTokenVerifier(JWKSCache(APPLE_JWKS_URL), APPLE_ISSUERS)
+GOOGLE = IdTokenVerifier(JWKSCache(GOOGLE_JWKS_URL), GOOGLE_ISSUERS)
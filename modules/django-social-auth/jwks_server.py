@@ -0,0 +1,123 @@
+"""
+A local stand-in for Apple's and Google's JWKS endpoints, for tests and
+benchmarks that must run offline. It holds RSA keys, publishes their public
+halves at ``url`` and signs id_tokens with them:
+
+    with FakeJWKSServer() as server:
+        verifier = IdTokenVerifier(JWKSCache(server.url), [server.issuer])
+        token = server.id_token(sub="001", aud="com.example.app")
+        verifier.verify(token, audiences=["com.example.app"])
+
+``rotate()`` replaces the oldest key with a new one, as providers do.
+"""
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+ISSUER = "https://appleid.apple.com"
+
+
+def _generate_key():
+    return str(uuid.uuid4()), rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+class FakeJWKSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.fetches += 1
+        jwks = {"keys": []}
+        for kid, private_key in list(self.server.keys):
+            key = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+            key.update(kid=kid, alg="RS256", use="sig")
+            jwks["keys"].append(key)
+        body = json.dumps(jwks).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.max_age is not None:
+            self.send_header("Cache-Control", "public, max-age=%d" % self.server.max_age)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeJWKSServer:
+    """
+    Serves ``keys`` RSA keys from a background thread on a free local port.
+    ``max_age``, when set, is sent as the response's Cache-Control max-age.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        keys: int = 2,
+        issuer: str = ISSUER,
+        max_age: int = None,
+    ):
+        self.httpd = ThreadingHTTPServer((host, port), FakeJWKSHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.keys = [_generate_key() for _ in range(keys)]
+        self.httpd.fetches = 0
+        self.httpd.max_age = max_age
+        self.issuer = issuer
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return "http://%s:%s/auth/keys" % (host, port)
+
+    @property
+    def fetches(self) -> int:
+        return self.httpd.fetches
+
+    @property
+    def kids(self):
+        return [kid for kid, _ in self.httpd.keys]
+
+    def rotate(self) -> str:
+        """
+        Replaces the oldest key with a new one and returns the new key's id.
+        """
+        key = _generate_key()
+        self.httpd.keys = self.httpd.keys[1:] + [key]
+        return key[0]
+
+    def id_token(self, kid: str = None, lifetime: int = 600, **claims) -> str:
+        """
+        An id_token signed with key ``kid`` (the newest by default), issued
+        now by ``issuer`` and valid for ``lifetime`` seconds. ``claims`` (e.g.
+        ``sub``, ``aud``, ``email``) are added or override those.
+        """
+        kid = kid or self.kids[-1]
+        private_key = dict(self.httpd.keys)[kid]
+        now = int(time.time())
+        payload = {"iss": self.issuer, "iat": now, "exp": now + lifetime}
+        payload.update(claims)
+        return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
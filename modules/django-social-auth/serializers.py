@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 from allauth.socialaccount.providers.oauth2.client import OAuth2Error
 from allauth.socialaccount.helpers import complete_social_login
 from allauth.account import app_settings as allauth_settings
+from requests.exceptions import HTTPError
 
 
 class CustomAppleSocialLoginSerializer(SocialLoginSerializer):
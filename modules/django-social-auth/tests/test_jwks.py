@@ -0,0 +1,92 @@
+import time
+
+from allauth.socialaccount.providers.oauth2.client import OAuth2Error
+from django.test import SimpleTestCase
+
+from ..jwks import IdTokenVerifier, JWKSCache
+from ..jwks_server import FakeJWKSServer
+
+AUDIENCE = "com.example.app"
+
+
+class IdTokenVerifierTests(SimpleTestCase):
+    def serve(self, **kwargs):
+        server = FakeJWKSServer(**kwargs).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def verifier(self, server, **kwargs):
+        return IdTokenVerifier(JWKSCache(server.url, **kwargs), [server.issuer])
+
+    def test_verifies_locally(self):
+        server = self.serve()
+        verifier = self.verifier(server)
+        for _ in range(3):
+            claims = verifier.verify(
+                server.id_token(sub="001", aud=AUDIENCE), audiences=[AUDIENCE]
+            )
+            self.assertEqual(claims["sub"], "001")
+        self.assertEqual(server.fetches, 1)
+
+    def test_rejects_invalid_tokens(self):
+        server = self.serve()
+        verifier = self.verifier(server)
+        tokens = {
+            "wrong audience": server.id_token(sub="001", aud="com.example.other"),
+            "expired": server.id_token(sub="001", aud=AUDIENCE, lifetime=-120),
+            "wrong issuer": server.id_token(
+                sub="001", aud=AUDIENCE, iss="https://example.com"
+            ),
+            "no subject": server.id_token(aud=AUDIENCE),
+            "malformed": "not.a.token",
+        }
+        for reason, token in tokens.items():
+            with self.subTest(reason), self.assertRaises(OAuth2Error):
+                verifier.verify(token, audiences=[AUDIENCE])
+
+    def test_rejects_tokens_signed_by_other_keys(self):
+        server = self.serve()
+        other = self.serve()
+        token = other.id_token(sub="001", aud=AUDIENCE)
+        with self.assertRaises(OAuth2Error):
+            self.verifier(server).verify(token, audiences=[AUDIENCE])
+
+    def test_picks_up_rotated_keys(self):
+        server = self.serve()
+        verifier = self.verifier(server, min_refresh_interval=0)
+        verifier.verify(server.id_token(sub="001", aud=AUDIENCE), audiences=[AUDIENCE])
+        kid = server.rotate()
+        claims = verifier.verify(
+            server.id_token(kid=kid, sub="001", aud=AUDIENCE), audiences=[AUDIENCE]
+        )
+        self.assertEqual(claims["sub"], "001")
+        self.assertEqual(server.fetches, 2)
+
+    def test_throttles_fetches_for_unknown_keys(self):
+        server = self.serve()
+        verifier = self.verifier(server, min_refresh_interval=60)
+        verifier.verify(server.id_token(sub="001", aud=AUDIENCE), audiences=[AUDIENCE])
+        kid = server.rotate()
+        token = server.id_token(kid=kid, sub="001", aud=AUDIENCE)
+        for _ in range(5):
+            with self.assertRaises(OAuth2Error):
+                verifier.verify(token, audiences=[AUDIENCE])
+        self.assertEqual(server.fetches, 1)
+
+    def test_refreshes_expired_keys_in_the_background(self):
+        server = self.serve(max_age=0)
+        verifier = self.verifier(server)
+        token = server.id_token(sub="001", aud=AUDIENCE)
+        verifier.verify(token, audiences=[AUDIENCE])
+        # The expired keys keep serving while they are fetched again.
+        verifier.verify(token, audiences=[AUDIENCE])
+        deadline = time.monotonic() + 5
+        while server.fetches < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(server.fetches, 2)
+
+    def test_keeps_keys_for_the_providers_max_age(self):
+        server = self.serve(max_age=3600)
+        cache = JWKSCache(server.url, timeout=0)
+        cache.refresh()
+        self.assertGreater(cache.expires - time.monotonic(), 3500)
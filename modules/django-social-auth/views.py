@@ -5,45 +5,100 @@ from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from allauth.socialaccount.providers.apple.views import AppleOAuth2Adapter
 from allauth.socialaccount.providers.apple.client import AppleOAuth2Client
 from rest_auth.registration.views import SocialLoginView, SocialConnectView
+from .cache import CachedAppAdapterMixin, get_app_domain, get_social_app
+from .jwks import APPLE, GOOGLE
 from .serializers import CustomAppleSocialLoginSerializer, CustomAppleConnectSerializer
-from django.contrib.sites.shortcuts import get_current_site
 
-try:
-    APP_DOMAIN = f"https://{get_current_site(None)}"
-except Exception:
-    APP_DOMAIN = ""
+APPLE_CALLBACK_PATH = "/accounts/apple/login/callback/"
+
+
+def __getattr__(name):
+    # APP_DOMAIN used to be computed on import, which queried the database
+    # while the URLconf loaded.
+    if name == "APP_DOMAIN":
+        return get_app_domain()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+class FacebookAdapter(CachedAppAdapterMixin, FacebookOAuth2Adapter):
+    pass
+
+
+def _client_ids(adapter):
+    app = get_social_app(adapter.get_provider(), adapter.request)
+    return [aud.strip() for aud in app.client_id.split(",")]
+
+
+class GoogleAdapter(CachedAppAdapterMixin, GoogleOAuth2Adapter):
+    def parse_token(self, data):
+        token = super().parse_token(data)
+        token.user_data = None
+        if data.get("id_token"):
+            claims = GOOGLE.verify(data["id_token"], _client_ids(self))
+            # In the shape of the userinfo endpoint's response.
+            token.user_data = {
+                "id": claims["sub"],
+                "email": claims.get("email"),
+                "verified_email": claims.get("email_verified", False),
+                "name": claims.get("name"),
+                "given_name": claims.get("given_name"),
+                "family_name": claims.get("family_name"),
+                "picture": claims.get("picture"),
+                "locale": claims.get("locale"),
+            }
+        return token
+
+    def complete_login(self, request, app, token, **kwargs):
+        # A verified id_token already identifies the user; without one, ask
+        # Google's userinfo endpoint.
+        if not getattr(token, "user_data", None):
+            return super().complete_login(request, app, token, **kwargs)
+        return self.get_provider().sociallogin_from_response(request, token.user_data)
+
+
+class AppleAdapter(CachedAppAdapterMixin, AppleOAuth2Adapter):
+    def get_client_id(self, provider):
+        return _client_ids(self)
+
+    def get_verified_identity_data(self, id_token):
+        return APPLE.verify(id_token, _client_ids(self))
 
 
 class FacebookLogin(SocialLoginView):
     permission_classes = (AllowAny,)
-    adapter_class = FacebookOAuth2Adapter
+    adapter_class = FacebookAdapter
 
 
 class GoogleLogin(SocialLoginView):
     permission_classes = (AllowAny,)
-    adapter_class = GoogleOAuth2Adapter
+    adapter_class = GoogleAdapter
     client_class = OAuth2Client
+    serializer_class = CustomAppleSocialLoginSerializer
 
 
 class AppleLogin(SocialLoginView):
-    adapter_class = AppleOAuth2Adapter
+    adapter_class = AppleAdapter
     client_class = AppleOAuth2Client
     serializer_class = CustomAppleSocialLoginSerializer
-    callback_url = f"https://{APP_DOMAIN}/accounts/apple/login/callback/"
+
+    @property
+    def callback_url(self):
+        return get_app_domain() + APPLE_CALLBACK_PATH
 
 
 class FacebookConnect(SocialConnectView):
     permission_classes = (AllowAny,)
-    adapter_class = FacebookOAuth2Adapter
+    adapter_class = FacebookAdapter
 
 
 class GoogleConnect(SocialConnectView):
     permission_classes = (AllowAny,)
-    adapter_class = GoogleOAuth2Adapter
+    adapter_class = GoogleAdapter
     client_class = OAuth2Client
+    serializer_class = CustomAppleConnectSerializer
 
 
 class AppleConnect(SocialConnectView):
-    adapter_class = AppleOAuth2Adapter
+    adapter_class = AppleAdapter
     client_class = AppleOAuth2Client
     serializer_class = CustomAppleConnectSerializer
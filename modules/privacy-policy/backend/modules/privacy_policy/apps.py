@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PrivacyPolicyConfig(AppConfig):
     name = "modules.privacy_policy"
     verbose_name = "Privacy Policy"
+
+    def ready(self):
+        from . import signals  # noqa: F401
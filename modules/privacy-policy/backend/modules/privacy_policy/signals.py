@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate
+from .models import PrivacyPolicy
+
+
+@receiver(post_save, sender=PrivacyPolicy, dispatch_uid="privacy_policy_invalidate_save")
+@receiver(post_delete, sender=PrivacyPolicy, dispatch_uid="privacy_policy_invalidate_delete")
+def invalidate_current(sender, **kwargs):
+    # Wait for the commit, or a concurrent request could cache the old policy.
+    transaction.on_commit(invalidate)
@@ -0,0 +1,68 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase
+
+from .. import cache as current_cache
+from ..models import PrivacyPolicy
+
+
+# Saves really commit here, so the invalidation waiting for the commit runs.
+class CurrentCacheTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.author = get_user_model().objects.create_user("author")
+
+    def create(self, body):
+        return PrivacyPolicy.objects.create(body=body, author=self.author)
+
+    def current_body(self):
+        return json.loads(current_cache.get_current()["content"])[0]["body"]
+
+    def test_served_from_the_cache(self):
+        self.create("First")
+        self.assertEqual(self.current_body(), "First")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.current_body(), "First")
+
+    def test_invalidated_on_save(self):
+        document = self.create("First")
+        self.current_body()
+        document.body = "Changed"
+        document.save()
+        self.assertEqual(self.current_body(), "Changed")
+
+    def test_invalidated_on_delete(self):
+        document = self.create("First")
+        self.current_body()
+        document.delete()
+        self.assertEqual(json.loads(current_cache.get_current()["content"]), [])
+
+    def test_read_before_a_change_is_not_cached_as_current(self):
+        document = self.create("First")
+        queryset = current_cache.get_current_queryset
+
+        def change_after_reading():
+            stale = list(queryset())
+            document.body = "Changed"
+            document.save()
+            return stale
+
+        # The policy changes between the query and the cache write of a request.
+        with mock.patch.object(
+            current_cache, "get_current_queryset", change_after_reading
+        ):
+            self.assertEqual(self.current_body(), "First")
+        self.assertEqual(self.current_body(), "Changed")
+
+    def test_entries_expire(self):
+        self.create("First")
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            self.current_body()
+        cache_set.assert_called_once_with(
+            mock.ANY, mock.ANY, current_cache.CACHE_TIMEOUT
+        )
+        self.assertIsNotNone(current_cache.CACHE_TIMEOUT)
@@ -1,5 +1,9 @@
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import authentication, permissions
 from .models import PrivacyPolicy
+from .cache import HTTP_MAX_AGE, get_current
 from .serializers import PrivacyPolicySerializer
 from rest_framework import viewsets
 
@@ -18,3 +22,33 @@ class PrivacyPolicyViewSet(viewsets.ModelViewSet):
     # This is sliced because of the issues previously encountered with
     # querysets while using .first()
     queryset = PrivacyPolicy.objects.filter(is_active=True).order_by('-updated_at')[0:1]
+
+    def perform_authentication(self, request):
+        # The list is public and served from the cache; authenticating would
+        # cost a session or token query on every app launch.
+        if self.action != "list":
+            super().perform_authentication(request)
+
+    def get_queryset(self):
+        # The sliced queryset above can't be filtered by pk, so the detail
+        # looks the id up among the active policies in a single query.
+        if self.action == "retrieve":
+            return PrivacyPolicy.objects.filter(is_active=True)
+        return super().get_queryset()
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return super().list(request, *args, **kwargs)
+        current = get_current()
+        # Answers If-None-Match / If-Modified-Since with a 304 when the client
+        # already has the current policy.
+        response = get_conditional_response(
+            request, etag=current["etag"], last_modified=current["last_modified"]
+        )
+        if response is None:
+            response = HttpResponse(current["content"], content_type="application/json")
+        response["ETag"] = current["etag"]
+        if current["last_modified"] is not None:
+            response["Last-Modified"] = http_date(current["last_modified"])
+        patch_cache_control(response, public=True, max_age=HTTP_MAX_AGE)
+        return response
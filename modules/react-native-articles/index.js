@@ -8,7 +8,7 @@ import {
   SafeAreaView
 } from "react-native"
 import { styles } from "./styles"
-import { slice, article_list } from "./store"
+import { slice, article_sync } from "./store"
 import { useSelector, useDispatch } from "react-redux"
 import { createStackNavigator } from "@react-navigation/stack"
 import Article from "./article"
@@ -21,7 +21,7 @@ const ArticlesList = ({ route, navigation }) => {
   const dispatch = useDispatch()
 
   useEffect(async () => {
-    dispatch(article_list()).catch(e => console.log(e.message))
+    dispatch(article_sync()).catch(e => console.log(e.message))
   }, [detail])
 
   const renderItem = ({ item }) => (
@@ -30,7 +30,10 @@ const ArticlesList = ({ route, navigation }) => {
         navigation.navigate(detail, { id: item.id })
       }}
     >
-      <ImageBackground source={{ uri: item.image }} style={styles.image}>
+      <ImageBackground
+        source={{ uri: item.image_variants?.small || item.image }}
+        style={styles.image}
+      >
         <View style={styles.card}>
           <Text style={styles.text}>{item.title}</Text>
           <Text style={styles.author}>{item.author}</Text>
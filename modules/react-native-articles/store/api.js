@@ -16,7 +16,12 @@ export function article_read(id) {
   return articlesAPI.get(`/article/${id}/`)
 }
 
+export function article_sync(since) {
+  return articlesAPI.get(`/article/sync/`, { params: since ? { since } : {} })
+}
+
 export const api = {
   article_list,
-  article_read
+  article_read,
+  article_sync
 }
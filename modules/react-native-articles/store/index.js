@@ -17,7 +17,44 @@ export const article_list = createAsyncThunk(
   }
 )
 
-const initialState = { articles: {}, api: { loading: "idle", error: null } }
+export const article_sync = createAsyncThunk(
+  "articles/article_sync",
+  async (_, { getState }) => {
+    let watermark = getState().Articles.watermark
+    let articles = []
+    let deleted = []
+    let full_resync = watermark === null
+    let has_more = true
+    while (has_more) {
+      let response
+      try {
+        response = await api.article_sync(watermark)
+      } catch (error) {
+        // 410 full_resync_required: the watermark expired, start over.
+        const status = error.response && error.response.status
+        if (watermark === null || status !== 410) {
+          throw error
+        }
+        watermark = null
+        articles = []
+        deleted = []
+        full_resync = true
+        continue
+      }
+      articles = articles.concat(response.data.articles)
+      deleted = deleted.concat(response.data.deleted)
+      watermark = response.data.watermark
+      has_more = response.data.has_more
+    }
+    return { articles, deleted, watermark, full_resync }
+  }
+)
+
+const initialState = {
+  articles: {},
+  watermark: null,
+  api: { loading: "idle", error: null }
+}
 
 export const slice = createSlice({
   name: "articles",
@@ -32,7 +69,8 @@ export const slice = createSlice({
     },
     [article_list.fulfilled]: (state, action) => {
       if (state.api.loading === "pending") {
-        action.payload.map(article => {
+        const articles = action.payload.results || action.payload
+        articles.map(article => {
           state.articles[article.id] = article
         })
         state.api.loading = "idle"
@@ -44,6 +82,33 @@ export const slice = createSlice({
         state.api.loading = "idle"
       }
     },
+    [article_sync.pending]: state => {
+      if (state.api.loading === "idle") {
+        state.api.loading = "pending"
+        state.api.error = null
+      }
+    },
+    [article_sync.fulfilled]: (state, action) => {
+      if (state.api.loading === "pending") {
+        if (action.payload.full_resync) {
+          state.articles = {}
+        }
+        action.payload.articles.map(article => {
+          state.articles[article.id] = article
+        })
+        action.payload.deleted.map(id => {
+          delete state.articles[id]
+        })
+        state.watermark = action.payload.watermark
+        state.api.loading = "idle"
+      }
+    },
+    [article_sync.rejected]: (state, action) => {
+      if (state.api.loading === "pending") {
+        state.api.error = action.error
+        state.api.loading = "idle"
+      }
+    },
     [article_read.pending]: state => {
       if (state.api.loading === "idle") {
         state.api.loading = "pending"
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TermsAndConditionsConfig(AppConfig):
     name = "modules.terms_and_conditions"
     verbose_name = "Terms and Conditions"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,86 @@
+import threading
+import uuid
+from calendar import timegm
+
+from django.core.cache import cache
+from django.utils.http import quote_etag
+from rest_framework.renderers import JSONRenderer
+
+from .models import TermAndCondition
+from .serializers import TermAndConditionSerializer
+
+CACHE_KEY = "terms_and_conditions:current"
+# Bumped whenever the terms change. Entries are cached under the version read
+# before querying, so a request that read the old row can't cache it as
+# current.
+VERSION_KEY = "terms_and_conditions:version"
+# Bounds how long changes that skip the signals, like QuerySet.update(), take
+# to show.
+CACHE_TIMEOUT = 10 * 60
+# How long clients and CDNs may reuse a response without revalidating it.
+HTTP_MAX_AGE = 5 * 60
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(VERSION_KEY, version, None):
+            # Another process set it first.
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def get_current_queryset():
+    # This query will only return a single (if it exists) T&C string, and that will be
+    # the most recently updated one that *also* has an active flag.
+    return TermAndCondition.objects.filter(is_active=True).order_by("-updated_at")[0:1]
+
+
+def get_current():
+    """
+    Returns the list response for the current terms, already rendered to
+    JSON bytes, with its ETag and Last-Modified timestamp. Only the first
+    request after a change, or after ``CACHE_TIMEOUT``, touches the database.
+    """
+    key = "%s:%s" % (CACHE_KEY, _version())
+    current = cache.get(key)
+    if current is not None:
+        _count("hits")
+        return current
+    _count("misses")
+    terms = list(get_current_queryset())
+    data = TermAndConditionSerializer(terms, many=True).data
+    current = {
+        "content": JSONRenderer().render(data),
+        "etag": quote_etag("none"),
+        "last_modified": None,
+    }
+    if terms:
+        document = terms[0]
+        current["last_modified"] = timegm(document.updated_at.utctimetuple())
+        current["etag"] = quote_etag(
+            "%s-%s" % (document.pk, document.updated_at.timestamp())
+        )
+    cache.set(key, current, CACHE_TIMEOUT)
+    return current
+
+
+def invalidate():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def cache_stats():
+    """
+    Hit and miss counts of this process since it started.
+    """
+    with _stats_lock:
+        return dict(_stats)
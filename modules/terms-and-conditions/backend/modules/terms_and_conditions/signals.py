@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate
+from .models import TermAndCondition
+
+
+@receiver(post_save, sender=TermAndCondition, dispatch_uid="terms_and_conditions_invalidate_save")
+@receiver(post_delete, sender=TermAndCondition, dispatch_uid="terms_and_conditions_invalidate_delete")
+def invalidate_current(sender, **kwargs):
+    # Wait for the commit, or a concurrent request could cache the old terms.
+    transaction.on_commit(invalidate)
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from .. import cache as current_cache
+from ..models import TermAndCondition
+
+
+# Saves really commit here, so the invalidation waiting for the commit runs.
+@override_settings(ROOT_URLCONF="modules.terms_and_conditions.urls")
+class CurrentTermsTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.author = get_user_model().objects.create_user("author")
+        self.client = APIClient()
+
+    def create(self, body):
+        return TermAndCondition.objects.create(body=body, author=self.author)
+
+    def get(self, **headers):
+        return self.client.get("/", format="json", **headers)
+
+    def test_served_from_the_cache(self):
+        self.create("First")
+        first = self.get()
+        with self.assertNumQueries(0):
+            second = self.get()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.json()[0]["body"], "First")
+        self.assertIn(
+            "max-age=%d" % current_cache.HTTP_MAX_AGE, second["Cache-Control"]
+        )
+
+    def test_not_modified(self):
+        self.create("First")
+        response = self.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.get(HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304
+            )
+            self.assertEqual(
+                self.get(
+                    HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+                ).status_code,
+                304,
+            )
+
+    def test_changes_show_at_once(self):
+        document = self.create("First")
+        etag = self.get()["ETag"]
+        document.body = "Changed"
+        document.save()
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["body"], "Changed")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_deactivated_terms_are_not_served(self):
+        document = self.create("First")
+        self.get()
+        document.is_active = False
+        document.save()
+        response = self.get()
+        self.assertEqual(response.json(), [])
+        self.assertNotIn("Last-Modified", response)
+
+    def test_deleted_terms_are_not_served(self):
+        older = self.create("Older")
+        newer = self.create("Newer")
+        self.assertEqual(self.get().json()[0]["body"], "Newer")
+        newer.delete()
+        self.assertEqual(self.get().json()[0]["body"], "Older")
+        older.delete()
+        self.assertEqual(self.get().json(), [])
+
+    def test_read_before_a_change_is_not_cached_as_current(self):
+        document = self.create("First")
+        queryset = current_cache.get_current_queryset
+
+        def change_after_reading():
+            stale = list(queryset())
+            document.body = "Changed"
+            document.save()
+            return stale
+
+        # The terms change between the query and the cache write of a request.
+        with mock.patch.object(
+            current_cache, "get_current_queryset", change_after_reading
+        ):
+            self.assertEqual(self.get().json()[0]["body"], "First")
+        self.assertEqual(self.get().json()[0]["body"], "Changed")
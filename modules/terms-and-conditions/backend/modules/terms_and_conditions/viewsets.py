@@ -1,6 +1,10 @@
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import authentication
 from rest_framework.permissions import BasePermission, SAFE_METHODS, IsAdminUser
 from .models import TermAndCondition
+from .cache import HTTP_MAX_AGE, get_current
 from .serializers import TermAndConditionSerializer
 from rest_framework import viewsets
 
@@ -11,7 +15,8 @@ class ReadOnly(BasePermission):
 
 class TermAndConditionViewSet(viewsets.ModelViewSet):
     serializer_class = TermAndConditionSerializer
-    permission_classes = [IsAdminUser|ReadOnly] #Makes it Read-only unless admin
+    # ReadOnly goes first so that reads never need to look up the user.
+    permission_classes = [ReadOnly|IsAdminUser] #Makes it Read-only unless admin
     authentication_classes = (
         authentication.SessionAuthentication,
         authentication.TokenAuthentication,
@@ -21,3 +26,33 @@ class TermAndConditionViewSet(viewsets.ModelViewSet):
     # the most recently updated one that *also* has an active flag. You must set at least
     # one T&C object to active for this to work.
     queryset = TermAndCondition.objects.filter(is_active=True).order_by('-updated_at')[0:1]
+
+    def perform_authentication(self, request):
+        # The list is public and served from the cache; authenticating would
+        # cost a session or token query on every app launch.
+        if self.action != "list":
+            super().perform_authentication(request)
+
+    def get_queryset(self):
+        # The sliced queryset above can't be filtered by pk, so the detail
+        # looks the id up among the active terms in a single query.
+        if self.action == "retrieve":
+            return TermAndCondition.objects.filter(is_active=True)
+        return super().get_queryset()
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return super().list(request, *args, **kwargs)
+        current = get_current()
+        # Answers If-None-Match / If-Modified-Since with a 304 when the client
+        # already has the current terms.
+        response = get_conditional_response(
+            request, etag=current["etag"], last_modified=current["last_modified"]
+        )
+        if response is None:
+            response = HttpResponse(current["content"], content_type="application/json")
+        response["ETag"] = current["etag"]
+        if current["last_modified"] is not None:
+            response["Last-Modified"] = http_date(current["last_modified"])
+        patch_cache_control(response, public=True, max_age=HTTP_MAX_AGE)
+        return response
@@ -0,0 +1,118 @@
+"""
+Runs the tests of the Django modules in the reference project of
+startup_profile.py:
+
+    python scripts/run_tests.py
+    python scripts/run_tests.py articles camera
+    python scripts/run_tests.py modules.articles.tests.test_sync -v 2
+
+A module's tests live in its package, in a ``tests`` module or package, so
+they also run in a generated project with ``python manage.py test
+modules.<name>``. Without labels, every module with tests runs; modules whose
+dependencies this interpreter doesn't have are reported and skipped. Run it
+with an interpreter that has the modules' dependencies, like
+startup_profile.py.
+"""
+import argparse
+import importlib
+import sys
+import tempfile
+from pathlib import Path
+
+from startup_profile import (
+    backend_packages,
+    build_project,
+    installed_apps,
+    reference_settings,
+)
+
+
+def default_labels(project, packages):
+    labels = []
+    for name in packages:
+        package = Path(project) / "modules" / name
+        if not ((package / "tests.py").exists() or (package / "tests").is_dir()):
+            continue
+        label = "modules.%s.tests" % name
+        modules = [label] + [
+            "%s.%s" % (label, path.stem)
+            for path in sorted((package / "tests").glob("test*.py"))
+        ]
+        try:
+            for module in modules:
+                importlib.import_module(module)
+        except ImportError as e:
+            if e.name and e.name.split(".")[0] == "modules":
+                raise
+            print("Skipping %s: %s" % (name, e), file=sys.stderr)
+            continue
+        labels.append(label)
+    return labels
+
+
+def test_settings(project, packages):
+    """
+    The reference settings, completed like a generated project's.
+    """
+    test_settings = reference_settings(installed_apps(project, packages))
+    test_settings["TEMPLATES"][0]["OPTIONS"]["context_processors"] = [
+        "django.template.context_processors.request",
+        "django.contrib.auth.context_processors.auth",
+        "django.contrib.messages.context_processors.messages",
+    ]
+    test_settings.update(
+        MIDDLEWARE=[
+            "django.middleware.security.SecurityMiddleware",
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.middleware.common.CommonMiddleware",
+            "django.middleware.csrf.CsrfViewMiddleware",
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "django.contrib.messages.middleware.MessageMiddleware",
+        ],
+        MEDIA_ROOT=str(Path(project) / "media"),
+        MEDIA_URL="/media/",
+        FILE_UPLOAD_TEMP_DIR=project,
+        ROOT_URLCONF=__name__,
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    )
+    return test_settings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "labels",
+        nargs="*",
+        help="Module package names or test labels; every module by default",
+    )
+    parser.add_argument("-v", "--verbosity", type=int, default=1)
+    parser.add_argument("--failfast", action="store_true")
+    options = parser.parse_args()
+
+    packages = backend_packages()
+    with tempfile.TemporaryDirectory() as project:
+        build_project(packages, project)
+        sys.path.insert(0, project)
+        import django
+        from django.conf import settings
+        from django.test.utils import get_runner
+
+        settings.configure(**test_settings(project, packages))
+        django.setup()
+        labels = [
+            label if "." in label else "modules.%s" % label
+            for label in options.labels
+        ] or default_labels(project, packages)
+        runner = get_runner(settings)(
+            verbosity=options.verbosity, failfast=options.failfast
+        )
+        failures = runner.run_tests(labels)
+    sys.exit(1 if failures else 0)
+
+
+urlpatterns = []
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Startup cost of the Django modules. Assembles a reference project from the
+backend modules (laid out in `modules/` according to their meta.json root), then,
+for each module, starts a fresh interpreter that loads it the way a worker
+does, and reports:
+
+- app load: extra time `django.setup()` takes with the module installed
+- urls: time to import the module's URLconf
+- queries: database queries run while loading, which a worker can't afford
+- imports: third-party packages the module pulls in at load time
+
+    python scripts/startup_profile.py
+    python scripts/startup_profile.py --modules articles,social_auth --max-queries 0
+
+Run it with an interpreter that has the modules' dependencies (Django, Django
+REST Framework, django-allauth, django-rest-auth, Pillow). Modules whose
+dependencies are missing are reported as failed. With --max-queries, the exit
+status is 1 if any module runs more queries than that while loading.
+"""
+import argparse
+import importlib
+import importlib.util
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+BASE_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.sites",
+]
+# Installed when available, as in the projects the modules are added to.
+THIRD_PARTY_APPS = [
+    "rest_framework",
+    "rest_framework.authtoken",
+    "rest_auth",
+    "rest_auth.registration",
+    "allauth",
+    "allauth.account",
+    "allauth.socialaccount",
+    "allauth.socialaccount.providers.google",
+    "allauth.socialaccount.providers.facebook",
+    "allauth.socialaccount.providers.apple",
+]
+
+
+def backend_packages():
+    """
+    Maps each backend module's package name in the project (`modules.<name>`)
+    to its source directory, following the modules' meta.json roots.
+    """
+    packages = {}
+    for meta_path in sorted((REPO / "modules").glob("*/meta.json")):
+        module_dir = meta_path.parent
+        root = json.loads(meta_path.read_text())["root"].strip("/")
+        if root == "":
+            base = module_dir / "backend" / "modules"
+            candidates = list(base.iterdir()) if base.is_dir() else []
+        elif root == "backend/modules":
+            candidates = list(module_dir.iterdir())
+        elif root.startswith("backend/modules/"):
+            # Installed under its root's name, made importable.
+            name = root.split("/")[2].replace("-", "_")
+            packages[name] = module_dir
+            continue
+        else:
+            continue
+        for path in candidates:
+            if (path / "__init__.py").exists():
+                packages[path.name] = path
+    return packages
+
+
+def build_project(packages, directory):
+    modules = Path(directory) / "modules"
+    modules.mkdir()
+    (modules / "__init__.py").touch()
+    for name, source in packages.items():
+        shutil.copytree(
+            source,
+            modules / name,
+            ignore=shutil.ignore_patterns("__pycache__", "meta.json", "*.md", "*.png"),
+        )
+        # Migrations kept next to the package, as the articles module does,
+        # go in it so that the project can apply them.
+        migrations = source.parent / "migrations"
+        target = modules / name / "migrations"
+        if migrations.is_dir() and not target.exists():
+            shutil.copytree(
+                migrations, target, ignore=shutil.ignore_patterns("__pycache__")
+            )
+            (target / "__init__.py").touch()
+
+
+def installed_apps(project, packages):
+    apps = list(BASE_APPS)
+    apps += [app for app in THIRD_PARTY_APPS if _available(app)]
+    for name in packages:
+        package = Path(project) / "modules" / name
+        if (package / "apps.py").exists() or (package / "models.py").exists():
+            apps.append("modules.%s" % name)
+    return apps
+
+
+def _available(module):
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ImportError:
+        return False
+
+
+def reference_settings(apps):
+    return dict(
+        SECRET_KEY="startup-profile",
+        ALLOWED_HOSTS=["*"],
+        INSTALLED_APPS=apps,
+        DATABASES={
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        },
+        SITE_ID=1,
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        MIDDLEWARE=[],
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "APP_DIRS": True,
+                "OPTIONS": {},
+            }
+        ],
+        REST_FRAMEWORK={
+            "DEFAULT_AUTHENTICATION_CLASSES": (
+                "rest_framework.authentication.TokenAuthentication",
+                "rest_framework.authentication.SessionAuthentication",
+            ),
+        },
+    )
+
+
+def profile(project, apps, package):
+    """
+    Loads the project with ``apps`` and, if given, imports ``package``'s
+    URLconf. Runs in a fresh interpreter (see --child).
+    """
+    sys.path.insert(0, project)
+    import django
+    from django.conf import settings
+
+    settings.configure(**reference_settings(apps))
+    from django.db import connection
+
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    loaded = set(sys.modules)
+    with connection.execute_wrapper(record):
+        started = time.perf_counter()
+        django.setup()
+        setup = time.perf_counter() - started
+        urls = 0.0
+        urlconf = "modules.%s.urls" % package if package else None
+        if urlconf and importlib.util.find_spec(urlconf):
+            started = time.perf_counter()
+            importlib.import_module(urlconf)
+            urls = time.perf_counter() - started
+    imported = {name.split(".")[0] for name in set(sys.modules) - loaded}
+    return {
+        "setup": setup,
+        "urls": urls,
+        "queries": queries,
+        "imports": sorted(imported - set(sys.stdlib_module_names) - {"modules"}),
+    }
+
+
+def run_child(project, apps, package, repeat):
+    """
+    Best of ``repeat`` fresh interpreters, or the error that stopped them.
+    """
+    best = None
+    for _ in range(repeat):
+        command = [
+            sys.executable,
+            __file__,
+            "--child",
+            json.dumps({"project": project, "apps": apps, "package": package}),
+        ]
+        process = subprocess.run(command, capture_output=True, text=True)
+        if process.returncode:
+            lines = process.stderr.strip().splitlines()
+            return {"error": lines[-1] if lines else "exit %d" % process.returncode}
+        result = json.loads(process.stdout.splitlines()[-1])
+        if best is None or result["setup"] + result["urls"] < best["setup"] + best["urls"]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--modules", help="Comma-separated package names to profile")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Interpreters started per module"
+    )
+    parser.add_argument("--max-queries", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.child:
+        child = json.loads(options.child)
+        result = profile(child["project"], child["apps"], child["package"])
+        print(json.dumps(result))
+        return
+
+    packages = backend_packages()
+    selected = options.modules.split(",") if options.modules else sorted(packages)
+    with tempfile.TemporaryDirectory() as project:
+        build_project(packages, project)
+        apps = installed_apps(project, packages)
+        module_apps = {"modules.%s" % name for name in packages}
+        base_apps = [app for app in apps if app not in module_apps]
+        baseline = run_child(project, base_apps, None, options.repeat)
+        if "error" in baseline:
+            sys.exit("The reference project doesn't load: %s" % baseline["error"])
+        results = {}
+        for name in selected:
+            # The module's app and the module apps it imports from.
+            sources = "".join(
+                path.read_text()
+                for path in (Path(project) / "modules" / name).rglob("*.py")
+            )
+            module_apps_used = [
+                app
+                for app in apps
+                if app in module_apps
+                and (app == "modules.%s" % name or app + "." in sources)
+            ]
+            results[name] = run_child(
+                project, base_apps + module_apps_used, name, options.repeat
+            )
+
+    if options.json:
+        print(json.dumps({"baseline": baseline, "modules": results}, indent=2))
+    else:
+        print("baseline django.setup(): %.1f ms" % (baseline["setup"] * 1000))
+        print(
+            "%-22s %12s %9s %8s  %s"
+            % ("module", "app load ms", "urls ms", "queries", "imports")
+        )
+        for name, result in results.items():
+            if "error" in result:
+                print("%-22s failed: %s" % (name, result["error"]))
+                continue
+            imports = sorted(set(result["imports"]) - set(baseline["imports"]))
+            print(
+                "%-22s %12.1f %9.1f %8d  %s"
+                % (
+                    name,
+                    (result["setup"] - baseline["setup"]) * 1000,
+                    result["urls"] * 1000,
+                    len(result["queries"]),
+                    ", ".join(imports) or "-",
+                )
+            )
+            for sql in result["queries"]:
+                print("%22s   %s" % ("", sql))
+    if options.max_queries is not None and any(
+        len(result.get("queries", [])) > options.max_queries
+        for result in results.values()
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()